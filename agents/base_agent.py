@@ -1,20 +1,33 @@
 import os
 import json
-from typing import List, Dict
+import time
+from typing import Dict, Iterator, List, Optional
 
-import requests
 from dotenv import load_dotenv
 
+from .http_client import get_http_client
+from .llm_cache import get_llm_cache
+from .memory import DEFAULT_MEMBER, AgentMemory, memory_for
+from .model_pool import get_model_pool
+from .prompting import PROMPT_STATS, render_context
+from .rate_limiter import estimate_tokens, get_rate_limiter
+
 
 load_dotenv()
 
 
 class BaseAgent:
+    # Seconds a completion stays in the shared response cache; 0 opts out. None caches only
+    # deterministic (temperature 0) requests, for ELYX_LLM_CACHE_TTL
+    cache_ttl: Optional[float] = None
+    # Context token budget and prompt stats bucket (see agents/prompting.py)
+    prompt_role: str = "agent"
+
     def __init__(self, name: str, role: str, system_prompt: str):
         self.name = name
         self.role = role
         self.system_prompt = system_prompt
-        self.conversation_history: List[Dict] = []
+        self._memory: Optional[AgentMemory] = None
 
     def _should_use_mock(self) -> bool:
         use_mock = os.getenv("USE_MOCK_RESPONSES", "0").strip() in {"1", "true", "True"}
@@ -24,11 +37,8 @@ class BaseAgent:
         last_user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
         return f"[{self.name} - {self.role}] Acknowledged: {last_user[:160]}"
 
-    def call_openrouter(self, messages: List[Dict], model: str | None = None) -> str:  # type: ignore[valid-type]
-        if self._should_use_mock():
-            return self._mock_response(messages)
-
-        headers = {
+    def _request_headers(self) -> Dict[str, str]:
+        return {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
             # Optional but recommended by OpenRouter
@@ -36,45 +46,243 @@ class BaseAgent:
             "X-Title": os.getenv("OPENROUTER_APP_TITLE", "Elyx Simulation"),
         }
 
+    def _request_body(self, messages: List[Dict], model: str | None = None) -> Dict:  # type: ignore[valid-type]
         selected_model = model or os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-20b:free")
-        data = {
+        PROMPT_STATS.record_prompt(self.prompt_role, messages)
+        return {
             "model": selected_model,
             "messages": messages,
             "temperature": float(os.getenv("OPENROUTER_TEMPERATURE", "0.7")),
         }
 
-        url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions")
+    def _url(self) -> str:
+        return os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions")
 
-        # Simple retry/backoff for 429s
-        backoffs = [1, 2, 4]
-        for attempt, delay in enumerate([0] + backoffs):
-            if delay:
-                try:
-                    import time
-                    time.sleep(delay)
-                except Exception:
-                    pass
-            response = requests.post(url, headers=headers, json=data, timeout=60)
+    # Attempts per call; waits between them come from the shared rate-limit scheduler
+    _max_attempts = 4
+
+    def _post(self, data: Dict, stream: bool = False):
+        client = get_http_client()
+        limiter = get_rate_limiter()
+        model = data.get("model")
+        tags = {"agent": self.name, "model": model}
+        tokens = estimate_tokens(data.get("messages", []))
+        for attempt in range(self._max_attempts):
+            limiter.acquire(model, tokens)
+            response = client.post(self._url(), self._request_headers(), data, stream=stream, tags=tags)
+            throttled = limiter.observe(model, response.status_code, response.headers)
             if response.status_code == 200:
-                body = response.json()
-                return body["choices"][0]["message"]["content"]
-            # On 429 keep retrying; otherwise break
-            if response.status_code != 429:
+                return response
+            # On 429 queue up again behind the scheduler; otherwise break
+            if not throttled or attempt == self._max_attempts - 1:
                 break
+            response.close()
 
         # No mock fallback; propagate final error
         raise RuntimeError(f"OpenRouter API Error: {response.status_code} - {response.text[:200]}")
 
-    def respond(self, user_message: str, context: Dict | None = None) -> str:  # type: ignore[valid-type]
-        messages: List[Dict[str, str]] = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": user_message},
-        ]
+    async def _apost(self, data: Dict):
+        client = get_http_client()
+        limiter = get_rate_limiter()
+        model = data.get("model")
+        tags = {"agent": self.name, "model": model}
+        tokens = estimate_tokens(data.get("messages", []))
+        for attempt in range(self._max_attempts):
+            await limiter.aacquire(model, tokens)
+            response = await client.apost(self._url(), self._request_headers(), data, tags=tags)
+            throttled = limiter.observe(model, response.status_code, response.headers)
+            if response.status_code == 200:
+                return response
+            if not throttled or attempt == self._max_attempts - 1:
+                break
+        raise RuntimeError(f"OpenRouter API Error: {response.status_code} - {response.text[:200]}")
+
+    def _cache_lookup(self, data: Dict, use_cache: bool, cache_ttl: Optional[float]):
+        """Return ``(cache_key, cached_text)``; the key is None when this call bypasses the cache."""
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        if not use_cache or ttl == 0 or (ttl is None and data.get("temperature") != 0):
+            return None, None
+        key = get_llm_cache().key(data["model"], data.get("temperature"), data["messages"])
+        return key, get_llm_cache().get(key)
+
+    def _cache_store(
+        self, key: Optional[str], data: Dict, text: str, cache_ttl: Optional[float], model: Optional[str] = None
+    ):
+        """``model`` is the one that actually answered; a fallback's reply is stored under its own
+        key, never under the requested model's."""
+        if key is None:
+            return
+        model = model or data["model"]
+        if model != data["model"]:
+            key = get_llm_cache().key(model, data.get("temperature"), data["messages"])
+        get_llm_cache().put(key, text, self.cache_ttl if cache_ttl is None else cache_ttl, model)
+
+    def _complete(self, data: Dict) -> str:
+        return self._post(data).json()["choices"][0]["message"]["content"]
+
+    async def _acomplete(self, data: Dict) -> str:
+        response = await self._apost(data)
+        return response.json()["choices"][0]["message"]["content"]
+
+    def call_openrouter(
+        self,
+        messages: List[Dict],
+        model: str | None = None,  # type: ignore[valid-type]
+        use_cache: bool = True,
+        cache_ttl: Optional[float] = None,
+    ) -> str:
+        """Chat completion text. Identical requests are served from the shared response cache
+        unless ``use_cache`` is False; ``cache_ttl`` overrides the agent's TTL for this call."""
+        if self._should_use_mock():
+            return self._mock_response(messages)
+
+        data = self._request_body(messages, model)
+        key, cached = self._cache_lookup(data, use_cache, cache_ttl)
+        if cached is not None:
+            return cached
+        used = data["model"]
+        if model is None:
+            # Default model: hedge/fail over across the model pool
+            used, text = get_model_pool().call(lambda m: (m, self._complete({**data, "model": m})))
+        else:
+            text = self._complete(data)
+        self._cache_store(key, data, text, cache_ttl, used)
+        return text
+
+    async def acall_openrouter(
+        self,
+        messages: List[Dict],
+        model: str | None = None,  # type: ignore[valid-type]
+        use_cache: bool = True,
+        cache_ttl: Optional[float] = None,
+    ) -> str:
+        """Async twin of call_openrouter on the shared pooled client."""
+        if self._should_use_mock():
+            return self._mock_response(messages)
+
+        data = self._request_body(messages, model)
+        key, cached = self._cache_lookup(data, use_cache, cache_ttl)
+        if cached is not None:
+            return cached
+        used = data["model"]
+        if model is None:
+            async def complete(m: str):
+                return m, await self._acomplete({**data, "model": m})
+
+            used, text = await get_model_pool().acall(complete)
+        else:
+            text = await self._acomplete(data)
+        self._cache_store(key, data, text, cache_ttl, used)
+        return text
+
+    def stream_openrouter(
+        self,
+        messages: List[Dict],
+        model: str | None = None,  # type: ignore[valid-type]
+        use_cache: bool = True,
+        cache_ttl: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Yield completion text deltas as OpenRouter streams them (``stream: true``).
+
+        A cache hit is yielded as a single delta; a completed stream is cached like call_openrouter.
+        """
+        if self._should_use_mock():
+            words = self._mock_response(messages).split(" ")
+            for i, word in enumerate(words):
+                yield word if i == len(words) - 1 else word + " "
+            return
+
+        data = self._request_body(messages, model)
+        key, cached = self._cache_lookup(data, use_cache, cache_ttl)
+        if cached is not None:
+            yield cached
+            return
+        parts: List[str] = []
+        done = False
+        # A stream cannot be hedged; take the pool's best model and report how it went
+        pool = get_model_pool() if model is None else None
+        stream_data = {**data, "stream": True}
+        if pool is not None:
+            stream_data["model"] = pool.pick()
+        start = time.perf_counter()
+        try:
+            response = self._post(stream_data, stream=True)
+        except Exception:
+            if pool is not None:
+                pool.record(stream_data["model"], (time.perf_counter() - start) * 1000, False)
+            raise
+        failed = False
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                # Blank keep-alives and ": OPENROUTER PROCESSING" comments carry no data
+                if not line or not line.startswith("data:"):
+                    continue
+                chunk = line[len("data:"):].strip()
+                if chunk == "[DONE]":
+                    done = True
+                    break
+                try:
+                    choice = json.loads(chunk)["choices"][0]
+                except (ValueError, KeyError, IndexError):
+                    continue
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception:
+            failed = True
+            raise
+        finally:
+            response.close()
+            # A consumer that stops early (client disconnect) is not the model's fault
+            if pool is not None:
+                pool.record(stream_data["model"], (time.perf_counter() - start) * 1000, not failed)
+        # Only a stream that reached [DONE] is a complete answer worth caching
+        if done:
+            self._cache_store(key, data, "".join(parts), cache_ttl, stream_data["model"])
+
+    @property
+    def memory(self) -> AgentMemory:
+        """Bounded per-member memory (recent turns + rolling summary), replayed by respond()."""
+        if self._memory is None:
+            self._memory = memory_for(self.name)
+        return self._memory
+
+    @staticmethod
+    def _member_of(context: Dict | None) -> Optional[str]:  # type: ignore[valid-type]
+        return (context or {}).get("member_id") or (context or {}).get("user_id")
 
+    def _build_messages(
+        self, user_message: str, context: Dict | None = None, member: Optional[str] = None  # type: ignore[valid-type]
+    ) -> List[Dict[str, str]]:
+        """System prompt, context, then (when ``member`` is given) its summary and recent turns."""
+        messages: List[Dict[str, str]] = [{"role": "system", "content": self.system_prompt}]
         if context:
-            messages.insert(1, {"role": "system", "content": f"Context: {json.dumps(context)}"})
+            # After the fixed system prompt, so that prefix stays identical across requests
+            messages.append({"role": "system", "content": f"Context: {render_context(context, self.prompt_role)}"})
+        if member is not None:
+            summary, turns = self.memory.recall(member)
+            if summary:
+                messages.append({"role": "system", "content": f"Earlier in this conversation:\n{summary}"})
+            for user, reply in turns:
+                messages.append({"role": "user", "content": user})
+                messages.append({"role": "assistant", "content": reply})
+        messages.append({"role": "user", "content": user_message})
+        return messages
 
-        response = self.call_openrouter(messages)
-        self.conversation_history.append({"user": user_message, "assistant": response})
+    def respond(self, user_message: str, context: Dict | None = None, member_id: Optional[str] = None) -> str:  # type: ignore[valid-type]
+        member = member_id or self._member_of(context) or DEFAULT_MEMBER
+        response = self.call_openrouter(self._build_messages(user_message, context, member))
+        self.memory.add(member, user_message, response)
         return response
 
+    def respond_stream(
+        self, user_message: str, context: Dict | None = None, member_id: Optional[str] = None  # type: ignore[valid-type]
+    ) -> Iterator[str]:
+        """Streaming variant of respond(); records the full reply once the stream ends."""
+        member = member_id or self._member_of(context) or DEFAULT_MEMBER
+        parts: List[str] = []
+        for delta in self.stream_openrouter(self._build_messages(user_message, context, member)):
+            parts.append(delta)
+            yield delta
+        self.memory.add(member, user_message, "".join(parts))
@@ -1,14 +1,37 @@
+import logging
 import os
-from typing import Dict, Optional
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-try:
-    from crewai import Agent, Task, Crew
-    from langchain_openai import ChatOpenAI
-except Exception:  # noqa: BLE001
-    Agent = None  # type: ignore[assignment]
-    Task = None  # type: ignore[assignment]
-    Crew = None  # type: ignore[assignment]
-    ChatOpenAI = None  # type: ignore[assignment]
+from .base_agent import BaseAgent
+from .model_pool import get_model_pool
+
+# Bound by load_crewai(); importing crewai/langchain takes seconds, so it waits for the first crew
+Agent = None
+Task = None
+Crew = None
+ChatOpenAI = None
+_crewai_lock = threading.Lock()
+_crewai_loaded = False
+
+
+def load_crewai() -> bool:
+    """Import crewai and langchain_openai once; True when both are available."""
+    global Agent, Task, Crew, ChatOpenAI, _crewai_loaded
+    if not _crewai_loaded:
+        with _crewai_lock:
+            if not _crewai_loaded:
+                try:
+                    from crewai import Agent, Task, Crew
+                except Exception:  # noqa: BLE001
+                    pass
+                try:
+                    from langchain_openai import ChatOpenAI
+                except Exception:  # noqa: BLE001
+                    pass
+                _crewai_loaded = True
+    return Crew is not None and ChatOpenAI is not None
 
 
 ROLE_TO_PROMPT: Dict[str, str] = {
@@ -39,6 +62,97 @@ ROLE_TO_PROMPT: Dict[str, str] = {
 }
 
 
+EXPECTED_OUTPUT = "A precise, helpful, role-aligned response to the member. Keep it under 150 words."
+# Task description of a pooled crew; kickoff interpolates the member's request into it
+TASK_TEMPLATE = "{request}"
+
+# Crews kept per (agent, model); also the number of concurrent kickoffs one role can run
+CREW_POOL_SIZE = int(os.getenv("ELYX_CREW_POOL_SIZE", "4"))
+
+
+class CrewPool:
+    """Warm single-task crews per (agent, model), each lent to one request at a time.
+
+    A crew is built once with a ``{request}`` placeholder as its task description, so a turn skips
+    building the LLM client, Agent, Task and Crew. CrewAI objects keep per-run state, so a crew is
+    never shared between threads: callers ``borrow`` it and hand it back. When every crew of a key
+    is busy another is built, up to ``size``; past that callers wait. A crew whose kickoff raised
+    is dropped rather than reused.
+    """
+
+    def __init__(self, factory: Callable[[str, Optional[str]], object], size: int = CREW_POOL_SIZE):
+        self._factory = factory
+        self.size = max(1, size)
+        self._idle: Dict[Tuple[str, Optional[str]], List[object]] = {}
+        self._built: Dict[Tuple[str, Optional[str]], int] = {}
+        self._cond = threading.Condition()
+        self._stats = {"built": 0, "reused": 0, "waited": 0, "dropped": 0}
+
+    def warm(self, names: Iterable[str], model: Optional[str] = None):
+        """Build one idle crew for every name that has none yet."""
+        for name in names:
+            key = (name, model)
+            with self._cond:
+                if self._built.get(key, 0):
+                    continue
+                self._built[key] = 1
+            self._release(key, self._build(key))
+
+    def _build(self, key: Tuple[str, Optional[str]]):
+        try:
+            crew = self._factory(*key)
+        except Exception:
+            with self._cond:
+                self._built[key] -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["built"] += 1
+        return crew
+
+    def _release(self, key: Tuple[str, Optional[str]], crew):
+        with self._cond:
+            self._idle.setdefault(key, []).append(crew)
+            self._cond.notify()
+
+    @contextmanager
+    def borrow(self, name: str, model: Optional[str] = None) -> Iterator[object]:
+        key = (name, model)
+        crew = None
+        with self._cond:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    crew = idle.pop()
+                    self._stats["reused"] += 1
+                    break
+                if self._built.get(key, 0) < self.size:
+                    self._built[key] = self._built.get(key, 0) + 1
+                    break
+                self._stats["waited"] += 1
+                self._cond.wait()
+        if crew is None:
+            crew = self._build(key)
+        try:
+            yield crew
+        except BaseException:
+            with self._cond:
+                self._built[key] -= 1
+                self._stats["dropped"] += 1
+                self._cond.notify()
+            raise
+        self._release(key, crew)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self.size,
+                "crews": {f"{name}|{model or 'default'}": n for (name, model), n in self._built.items()},
+                "idle": sum(len(v) for v in self._idle.values()),
+            }
+
+
 class CrewOrchestrator:
     """Lightweight wrapper around CrewAI to get single-agent responses.
 
@@ -46,49 +160,104 @@ class CrewOrchestrator:
     - OPENAI_API_KEY = your OpenRouter key
     - OPENAI_API_BASE = https://openrouter.ai/api/v1
     - model = os.getenv("OPENROUTER_MODEL", "google/gemini-2.0-flash-exp:free")
+
+    Crews come from a ``CrewPool`` (warmed for every role and pool model unless ELYX_CREW_WARM=0)
+    and are kicked off as they are. Before a crew goes back to the pool its task's output and
+    interpolated description are reset, so nothing carries over from one member's turn to the
+    next. With
+    ELYX_CREW_DIRECT=1, or ``ask(..., direct=True)``, the same persona is sent straight to
+    OpenRouter through BaseAgent instead; these crews use no tools or delegation, so nothing
+    CrewAI-specific is lost.
     """
 
     def __init__(self):
+        load_crewai()
         if ChatOpenAI is None:
             raise RuntimeError("langchain_openai not installed or failed to import")
         # CrewAI/LiteLLM use OpenAI-compatible config; we set base to OpenRouter via env
         # Model stays as configured (e.g., "openai/gpt-oss-20b:free")
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENROUTER_MODEL", "openai/gpt-3.5-turbo"),
+        self.llm = self._make_llm(os.getenv("OPENROUTER_MODEL", "openai/gpt-3.5-turbo"))
+        self._llms: Dict[str, object] = {}
+        self._llms_lock = threading.Lock()
+        self._direct_agents: Dict[str, BaseAgent] = {}
+        self.direct = os.getenv("ELYX_CREW_DIRECT", "0").strip() in {"1", "true", "True"}
+        self.crews = CrewPool(self._build_crew)
+        if Crew is not None and os.getenv("ELYX_CREW_WARM", "1").strip() in {"1", "true", "True"}:
+            try:
+                # The keys ask() borrows: one per model the pool may call
+                for model in get_model_pool().models():
+                    self.crews.warm(ROLE_TO_PROMPT, model)
+            except Exception as exc:  # noqa: BLE001
+                # Crews are built on first use instead
+                logging.warning("crew warm-up failed: %s", exc)
+
+    @staticmethod
+    def _make_llm(model: str):
+        return ChatOpenAI(
+            model=model,
             api_key=os.getenv("OPENAI_API_KEY"),
             base_url=os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1"),
         )
-        self._agents: Dict[str, object] = {}
 
-    def _get_or_create_agent(self, name: str):
+    def _llm_for(self, model: Optional[str]):
+        if model is None:
+            return self.llm
+        with self._llms_lock:
+            llm = self._llms.get(model)
+            if llm is None:
+                llm = self._llms[model] = self._make_llm(model)
+        return llm
+
+    def _make_agent(self, name: str, model: Optional[str] = None):
         if Agent is None:
             raise RuntimeError("crewai not installed or failed to import")
-        if name in self._agents:
-            return self._agents[name]
         system_prompt = ROLE_TO_PROMPT.get(name, f"You are {name}, an Elyx agent.")
-        agent = Agent(
+        return Agent(
             role=name,
             goal=f"Provide {name} expertise to the member in a concise, empathetic way.",
             backstory=system_prompt,
             allow_delegation=False,
             verbose=False,
-            llm=self.llm,
+            llm=self._llm_for(model),
         )
-        self._agents[name] = agent
-        return agent
 
-    def ask(self, agent_name: str, message: str, context: Optional[Dict] = None) -> str:
+    def _build_crew(self, name: str, model: Optional[str] = None):
+        """One agent, one task; the request is interpolated into ``{request}`` at kickoff."""
         if Task is None or Crew is None:
             raise RuntimeError("crewai not installed or failed to import")
-        agent = self._get_or_create_agent(agent_name)
-        desc = message if not context else f"Context: {context}\n\nMessage: {message}"
-        task = Task(
-            description=desc,
-            agent=agent,
-            expected_output="A precise, helpful, role-aligned response to the member. Keep it under 150 words.",
-        )
-        crew = Crew(agents=[agent], tasks=[task])
-        result = crew.kickoff()
-        return str(result)
+        agent = self._make_agent(name, model)
+        task = Task(description=TASK_TEMPLATE, agent=agent, expected_output=EXPECTED_OUTPUT)
+        return Crew(agents=[agent], tasks=[task])
+
+    @staticmethod
+    def _reset_crew(crew):
+        """Undo what a kickoff leaves on the task: its output and the interpolated description."""
+        for task in crew.tasks:
+            task.output = None
+            task.description = TASK_TEMPLATE
 
+    def _kickoff(self, agent_name: str, desc: str, model: Optional[str] = None) -> str:
+        with self.crews.borrow(agent_name, model) as crew:
+            reply = str(crew.kickoff(inputs={"request": desc}))
+            self._reset_crew(crew)
+            return reply
+
+    def _direct_agent(self, name: str) -> BaseAgent:
+        agent = self._direct_agents.get(name)
+        if agent is None:
+            persona = ROLE_TO_PROMPT.get(name, f"You are {name}, an Elyx agent.")
+            agent = self._direct_agents[name] = BaseAgent(name, "crew-direct", f"{persona}\n\n{EXPECTED_OUTPUT}")
+            # A persona reply, like the crew's: not cached
+            agent.cache_ttl = 0
+        return agent
 
+    def ask(self, agent_name: str, message: str, context: Optional[Dict] = None, direct: Optional[bool] = None) -> str:
+        if direct if direct is not None else self.direct:
+            agent = self._direct_agent(agent_name)
+            # BaseAgent already hedges across the model pool; no history kept on the shared agent
+            return agent.call_openrouter(agent._build_messages(message, context))
+        if Task is None or Crew is None:
+            raise RuntimeError("crewai not installed or failed to import")
+        desc = message if not context else f"Context: {context}\n\nMessage: {message}"
+        # Hedge/fail over across the same model pool BaseAgent uses
+        return get_model_pool().call(lambda model: self._kickoff(agent_name, desc, model))
@@ -1,7 +1,10 @@
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Mapping, Optional, Type
 from dataclasses import dataclass
 from enum import Enum
+from data.keywords import KEYWORD_TABLES, classify, hit_categories
+
 from .base_agent import BaseAgent
 
 
@@ -68,7 +71,14 @@ AGENT_ROLES = {
 }
 
 
-class RubyAgent(BaseAgent):
+class PersonaAgent(BaseAgent):
+    """Replies in character at the configured sampling temperature; never served from the cache,
+    so a member repeating a message does not get a byte-identical answer."""
+
+    cache_ttl = 0
+
+
+class RubyAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Ruby",
@@ -93,7 +103,7 @@ PERSONALIZATION: Rohan Patel, 46, Regional Head of Sales, travels 1 week in 4, a
         )
 
 
-class DrWarrenAgent(BaseAgent):
+class DrWarrenAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Dr. Warren",
@@ -118,7 +128,7 @@ PERSONALIZATION: Align guidance to Rohan's metabolic health goals and frequent t
         )
 
 
-class AdvikAgent(BaseAgent):
+class AdvikAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Advik",
@@ -143,7 +153,7 @@ PERSONALIZATION: Rohan travels monthly; optimize for consistency despite travel
         )
 
 
-class CarlaAgent(BaseAgent):
+class CarlaAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Carla",
@@ -168,7 +178,7 @@ PERSONALIZATION: Rohan prioritizes metabolic health and efficiency; make adheren
         )
 
 
-class RachelAgent(BaseAgent):
+class RachelAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Rachel",
@@ -193,7 +203,7 @@ PERSONALIZATION: Rohan is time-pressed; emphasize efficient sessions and travel-
         )
 
 
-class NeelAgent(BaseAgent):
+class NeelAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Neel",
@@ -218,7 +228,7 @@ PERSONALIZATION: Tie outcomes to Rohan's long-term risk reduction and cognitive
         )
 
 
-class RohanAgent(BaseAgent):
+class RohanAgent(PersonaAgent):
     def __init__(self):
         super().__init__(
             name="Rohan",
@@ -235,33 +245,74 @@ STYLE: Analytical, concise requests; appreciates clear options and quick wins.
         )
 
 
+AGENT_CLASSES: Dict[str, Type[BaseAgent]] = {
+    "Ruby": RubyAgent,
+    "Dr. Warren": DrWarrenAgent,
+    "Advik": AdvikAgent,
+    "Carla": CarlaAgent,
+    "Rachel": RachelAgent,
+    "Neel": NeelAgent,
+}
+
+
+class AgentRegistry(Mapping[str, BaseAgent]):
+    """Team agents by name, each instantiated on first lookup and then shared by every consumer."""
+
+    def __init__(self, classes: Mapping[str, Type[BaseAgent]] = AGENT_CLASSES):
+        self._classes = dict(classes)
+        self._agents: Dict[str, BaseAgent] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> BaseAgent:
+        agent = self._agents.get(name)
+        if agent is None:
+            cls = self._classes[name]
+            with self._lock:
+                agent = self._agents.get(name)
+                if agent is None:
+                    agent = self._agents[name] = cls()
+        return agent
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._classes)
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    def built(self) -> List[str]:
+        return [name for name in self._classes if name in self._agents]
+
+
+_registry: Optional[AgentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_agent_registry() -> AgentRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AgentRegistry()
+    return _registry
+
+
 class UrgencyDetector:
     """Detect urgency level from message content"""
     
     URGENCY_KEYWORDS = {
-        UrgencyLevel.CRITICAL: [
-            "emergency", "urgent", "critical", "severe pain", "chest pain", 
-            "difficulty breathing", "can't breathe", "hospital", "911"
-        ],
-        UrgencyLevel.HIGH: [
-            "pain", "worried", "concerned", "problem", "issue", "help needed",
-            "not feeling well", "sick", "fever", "bleeding", "frustrated", "dissatisfied"
-        ],
-        UrgencyLevel.MEDIUM: [
-            "question", "confused", "unsure", "clarification", "when should",
-            "disappointed", "need help"
-        ]
+        UrgencyLevel.CRITICAL: KEYWORD_TABLES["urgency.critical"],
+        UrgencyLevel.HIGH: KEYWORD_TABLES["urgency.high"],
+        UrgencyLevel.MEDIUM: KEYWORD_TABLES["urgency.medium"],
     }
     
     @classmethod
     def detect_urgency(cls, message: str) -> UrgencyLevel:
         """Detect urgency level from message content"""
-        message_lower = message.lower()
+        hits = classify(message)
         
         # Check for critical keywords first
         for level in [UrgencyLevel.CRITICAL, UrgencyLevel.HIGH, UrgencyLevel.MEDIUM]:
-            keywords = cls.URGENCY_KEYWORDS.get(level, [])
-            if any(keyword in message_lower for keyword in keywords):
+            if f"urgency.{level.name.lower()}" in hits:
                 return level
         
         return UrgencyLevel.LOW
@@ -271,44 +322,13 @@ class AgentOrchestrator:
     """Simplified agent orchestration with SLA tracking"""
     
     def __init__(self):
-        self.agents = {
-            "Ruby": RubyAgent(),
-            "Dr. Warren": DrWarrenAgent(), 
-            "Advik": AdvikAgent(),
-            "Carla": CarlaAgent(),
-            "Rachel": RachelAgent(),
-            "Neel": NeelAgent(),
-        }
+        self.agents = get_agent_registry()
         self.active_assignments: Dict[str, Dict] = {}
     
     def route_message(self, message: str, context: Optional[Dict] = None) -> List[str]:
         """Route message to appropriate agents based on content"""
-        message_lower = message.lower()
-        agents = []
-        
-        # Always include Ruby for logistics unless clearly medical/technical
-        if any(word in message_lower for word in ["schedule", "appointment", "coordinate", "book", "confirm"]):
-            agents.append("Ruby")
-        
-        # Medical keywords -> Dr. Warren
-        if any(word in message_lower for word in ["lab", "blood", "test", "result", "medical", "doctor", "medication", "diagnosis"]):
-            agents.append("Dr. Warren")
-        
-        # Performance/wearable keywords -> Advik  
-        if any(word in message_lower for word in ["whoop", "oura", "hrv", "sleep", "recovery", "exercise", "workout", "performance"]):
-            agents.append("Advik")
-        
-        # Nutrition keywords -> Carla
-        if any(word in message_lower for word in ["food", "meal", "cgm", "glucose", "nutrition", "supplement", "diet", "eating"]):
-            agents.append("Carla")
-        
-        # Movement keywords -> Rachel
-        if any(word in message_lower for word in ["pain", "injury", "movement", "strength", "mobility", "physio", "exercise", "workout"]):
-            agents.append("Rachel")
-        
-        # Escalation keywords -> Neel
-        if any(word in message_lower for word in ["dissatisfied", "complaint", "frustrated", "escalate", "disappointed", "strategic", "goals"]):
-            agents.append("Neel")
+        # One keyword scan covers every route; "route.<Agent>" categories are in priority order
+        agents = hit_categories(message, "route.")
         
         # Default to Ruby if no specific routing
         if not agents:
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
+from data.keywords import classify
 
 
 class ExperimentStatus(Enum):
@@ -166,26 +167,26 @@ class ExperimentEngine:
     
     def _select_template(self, member_issue: str) -> Optional[ExperimentTemplate]:
         """Select appropriate experiment template based on issue"""
-        issue_lower = member_issue.lower()
+        hits = classify(member_issue)
         
         # Sleep-related issues
-        if any(word in issue_lower for word in ["sleep", "insomnia", "tired", "fatigue", "rest"]):
-            if "supplement" in issue_lower or "magnesium" in issue_lower:
+        if "experiment.sleep" in hits:
+            if "experiment.supplement" in hits:
                 return EXPERIMENT_TEMPLATES["SUPPLEMENT_TRIAL"]
             return EXPERIMENT_TEMPLATES["SLEEP_OPTIMIZATION"]
         
         # Nutrition/digestive issues
-        if any(word in issue_lower for word in ["bloating", "digestion", "stomach", "food", "meal"]):
-            if "glucose" in issue_lower or "cgm" in issue_lower or "blood sugar" in issue_lower:
+        if "experiment.digestion" in hits:
+            if "experiment.cgm" in hits:
                 return EXPERIMENT_TEMPLATES["CGM_MEAL_TEST"]
             return EXPERIMENT_TEMPLATES["NUTRITION_INTERVENTION"]
         
         # Exercise/performance issues
-        if any(word in issue_lower for word in ["exercise", "workout", "performance", "hrv", "recovery"]):
+        if "experiment.exercise" in hits:
             return EXPERIMENT_TEMPLATES["EXERCISE_PROTOCOL"]
         
         # Glucose/metabolic issues
-        if any(word in issue_lower for word in ["glucose", "blood sugar", "metabolic", "cgm"]):
+        if "experiment.metabolic" in hits:
             return EXPERIMENT_TEMPLATES["CGM_MEAL_TEST"]
         
         return None
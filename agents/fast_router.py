@@ -0,0 +1,150 @@
+"""Local statistical router that answers most routing questions without an LLM call.
+
+A multinomial logistic regression over hashed word unigrams and bigrams, scored sparsely in pure
+Python (tens of features per message, six classes), so a prediction takes microseconds. Training
+examples come from three places:
+
+- seed documents: each agent's responsibilities, voice and system prompt plus its routing keywords
+- ``episodes.xml`` messages that address an agent by name ("Carla, can you ...")
+- routing decisions the LLM router logged to the ``routing_log`` table
+
+LLMRouter consults it first and only pays for an LLM call below the confidence threshold.
+"""
+
+import logging
+import math
+import os
+import random
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from data.keywords import KEYWORD_TABLES
+
+from .crewai_orchestrator import ROLE_TO_PROMPT
+from .elyx_agents import AGENT_ROLES, get_agent_registry
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_ADDRESS_RE = re.compile(r"^\s*(Ruby|Dr\.? Warren|Advik|Carla|Rachel|Neel)\b", re.IGNORECASE)
+
+Example = Tuple[str, List[str]]
+
+# Newest LLM routing decisions used as training examples
+LOG_EXAMPLES = int(os.getenv("ELYX_FAST_ROUTER_LOG_EXAMPLES", "5000"))
+
+
+def features(text: str, buckets: int) -> List[int]:
+    """Hashed unigram + bigram ids (crc32, stable across processes)."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return sorted({zlib.crc32(g.encode()) % buckets for g in grams})
+
+
+def seed_examples() -> List[Example]:
+    """Role descriptions, system prompts and routing keywords, one short document per line/keyword."""
+    prompts = {name: agent.system_prompt for name, agent in get_agent_registry().items()}
+    examples: List[Example] = []
+    for name, role in AGENT_ROLES.items():
+        docs = [r.replace("_", " ") for r in role.responsibilities] + [role.response_style]
+        docs += [s for s in re.split(r"[\n.]", ROLE_TO_PROMPT.get(name, "") + "\n" + prompts.get(name, "")) if len(s) > 20]
+        docs += KEYWORD_TABLES.get(f"route.{name}", [])
+        examples += [(d, [name]) for d in docs]
+    return examples
+
+
+def episode_examples(path: str = "episodes.xml") -> List[Example]:
+    """Member messages from the episode script that open by addressing one agent."""
+    if not os.path.exists(path):
+        return []
+    examples: List[Example] = []
+    for message in ET.parse(path).getroot().iter("message"):
+        text = message.text or ""
+        m = _ADDRESS_RE.match(text)
+        if m:
+            name = "Dr. Warren" if "warren" in m.group(1).lower() else m.group(1).capitalize()
+            examples.append((text, [name]))
+    return examples
+
+
+def logged_examples(limit: int = LOG_EXAMPLES) -> List[Example]:
+    """Decisions previously made by the LLM router (the highest-quality labels we have)."""
+    from data.db import routing_log_list
+
+    try:
+        rows = routing_log_list(source="llm", limit=limit)
+    except sqlite3.Error:
+        return []
+    return [(r["message"], r["agents"]) for r in rows if r["agents"]]
+
+
+class FastRouter:
+    def __init__(self, agents: Optional[Sequence[str]] = None, buckets: int = 1 << 18):
+        self.agents = list(agents or AGENT_ROLES.keys())
+        self.buckets = buckets
+        self.weights: Dict[int, List[float]] = {}
+        self.bias = [0.0] * len(self.agents)
+        self.trained_on = 0
+
+    def _scores(self, feats: Iterable[int]) -> List[float]:
+        scores = list(self.bias)
+        for f in feats:
+            w = self.weights.get(f)
+            if w is not None:
+                for i, v in enumerate(w):
+                    scores[i] += v
+        top = max(scores)
+        exp = [math.exp(s - top) for s in scores]
+        total = sum(exp)
+        return [e / total for e in exp]
+
+    def train(self, examples: Sequence[Example], epochs: int = 25, lr: float = 0.3, l2: float = 1e-4, seed: int = 7):
+        """SGD on softmax cross-entropy; multi-agent labels split the target mass evenly."""
+        index = {a: i for i, a in enumerate(self.agents)}
+        data = []
+        for text, labels in examples:
+            ids = [index[a] for a in labels if a in index]
+            if ids:
+                data.append((features(text, self.buckets), ids))
+        rng = random.Random(seed)
+        n = len(self.agents)
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            step = lr / (1 + epoch * 0.2)
+            for feats, ids in data:
+                probs = self._scores(feats)
+                grad = list(probs)
+                for i in ids:
+                    grad[i] -= 1.0 / len(ids)
+                for f in feats:
+                    w = self.weights.setdefault(f, [0.0] * n)
+                    for i in range(n):
+                        w[i] -= step * (grad[i] + l2 * w[i])
+                for i in range(n):
+                    self.bias[i] -= step * grad[i]
+        self.trained_on = len(data)
+        return self
+
+    def predict(self, message: str) -> Dict[str, float]:
+        """Per-agent confidence (softmax probabilities summing to 1)."""
+        return dict(zip(self.agents, self._scores(features(message, self.buckets))))
+
+    def route(self, message: str, max_agents: int = 2, second_threshold: float = 0.3) -> Tuple[List[str], float]:
+        """Best agent(s) and the top confidence. A runner-up is added only when it is also likely."""
+        ranked = sorted(self.predict(message).items(), key=lambda kv: kv[1], reverse=True)
+        agents = [ranked[0][0]] + [a for a, p in ranked[1:max_agents] if p >= second_threshold]
+        return agents, ranked[0][1]
+
+    @classmethod
+    def from_sources(cls, episodes_path: str = "episodes.xml", include_log: bool = True) -> "FastRouter":
+        start = time.perf_counter()
+        examples = seed_examples() + episode_examples(episodes_path)
+        if include_log:
+            examples += logged_examples(limit=LOG_EXAMPLES)
+        router = cls().train(examples)
+        logging.info(
+            "fast_router trained examples=%s in %.0fms", router.trained_on, (time.perf_counter() - start) * 1000
+        )
+        return router
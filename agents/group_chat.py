@@ -1,20 +1,31 @@
 import os
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Mapping, Optional, Union
 
+from .base_agent import BaseAgent
 from .crewai_orchestrator import CrewOrchestrator
-from .elyx_agents import AgentOrchestrator
+from .elyx_agents import AGENT_ROLES, AgentOrchestrator, get_agent_registry
 from .llm_router import LLMRouter
 
 
 class GroupChatSystem:
-    def __init__(self, use_crewai: bool = True):
+    def __init__(
+        self,
+        use_crewai: bool = True,
+        router: Optional[LLMRouter] = None,
+        crew_orchestrator: Optional[CrewOrchestrator] = None,
+        agents: Optional[Mapping[str, BaseAgent]] = None,
+    ):
+        """``router`` and ``crew_orchestrator`` let many chats (e.g. a simulated cohort) share one
+        trained LLMRouter or warmed CrewOrchestrator. ``agents`` replaces the shared agent registry,
+        and so the agents' memory, for this chat only."""
         self.conversation_history: List[Dict] = []
         self.use_crewai = use_crewai
+        self.agents = agents if agents is not None else get_agent_registry()
         if use_crewai:
-            self.crew_orchestrator = CrewOrchestrator()
+            self.crew_orchestrator = crew_orchestrator or CrewOrchestrator()
             self.agent_router = AgentOrchestrator()
         else:
-            self.router = LLMRouter()
+            self.router = router or LLMRouter()
 
     def send_message(
         self,
@@ -24,7 +35,8 @@ class GroupChatSystem:
     ) -> Union[List[Dict], None]:
         print(f"\n💬 {sender}: {message}")
 
-        if sender == "Rohan":
+        # Messages from members (not from the care team) get an agent reply
+        if sender not in AGENT_ROLES:
             self.conversation_history.append({"sender": sender, "message": message})
 
             if self.use_crewai:
@@ -35,7 +47,11 @@ class GroupChatSystem:
                 response_text = self.crew_orchestrator.ask(agent_name, message, context)
                 response = {"agent": agent_name, "message": response_text}
             else:
-                response = self.router.route_message(message, context)
+                # LLM router (fast path first), then the routed agent's own reply
+                agent_name = (self.router.route(message, context, max_agents=1) or ["Ruby"])[0]
+                member = (context or {}).get("member_id") or sender.lower()
+                response_text = self.agents[agent_name].respond(message, context, member_id=member)
+                response = {"agent": agent_name, "message": response_text}
 
             if response:
                 self.conversation_history.append(
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+
+# requests/httpx are imported on first use: they are a large share of backend import time
+@lru_cache(maxsize=None)
+def _httpx():
+    try:
+        import httpx
+    except Exception:  # noqa: BLE001
+        return None
+    return httpx
+
+
+@lru_cache(maxsize=None)
+def _http2() -> bool:
+    try:
+        import h2  # noqa: F401  # enables HTTP/2 in httpx
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
+TimingHook = Callable[[Dict], None]
+
+
+class OpenRouterHttpClient:
+    """Process-wide, connection-pooled HTTP client shared by every BaseAgent.
+
+    Sync calls go through one keep-alive ``requests.Session``; async calls use a pooled
+    ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed), or fall back to the sync session on a
+    worker thread when httpx is unavailable. Every request reports its timing to registered hooks.
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.pool_connections = pool_connections or int(os.getenv("ELYX_HTTP_POOL_CONNECTIONS", "4"))
+        self.pool_maxsize = pool_maxsize or int(os.getenv("ELYX_HTTP_POOL_MAXSIZE", "32"))
+        self.timeout = timeout or float(os.getenv("ELYX_HTTP_TIMEOUT", "60"))
+        self._lock = threading.Lock()
+        self._session: Optional["requests.Session"] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._hooks: List[TimingHook] = []
+        self._stats = {"requests": 0, "errors": 0, "total_ms": 0.0}
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _async_client(self) -> "httpx.AsyncClient":
+        # httpx clients are bound to the event loop that created them
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # A closed loop's client can be neither used nor closed any more: just let it go
+            for dead in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[dead]
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                httpx = _httpx()
+                limits = httpx.Limits(
+                    max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize
+                )
+                client = httpx.AsyncClient(http2=_http2(), limits=limits, timeout=self.timeout)
+                self._async_clients[loop] = client
+        return client
+
+    def add_timing_hook(self, hook: TimingHook):
+        """Register ``hook(info)``; info has url, status, elapsed_ms, mode, stream and the caller's tags."""
+        self._hooks.append(hook)
+
+    def remove_timing_hook(self, hook: TimingHook):
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def _report(self, info: Dict):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["total_ms"] += info["elapsed_ms"]
+            if info["status"] is None or info["status"] >= 400:
+                self._stats["errors"] += 1
+        for hook in list(self._hooks):
+            try:
+                hook(info)
+            except Exception:  # noqa: BLE001
+                pass
+
+    def post(self, url: str, headers: Dict, json: Dict, stream: bool = False, tags: Optional[Dict] = None):
+        """Single POST on the shared session (no retries). Streaming responses must be closed by the caller."""
+        start = time.perf_counter()
+        status = None
+        try:
+            response = self.session.post(url, headers=headers, json=json, timeout=self.timeout, stream=stream)
+            status = response.status_code
+            return response
+        finally:
+            self._report(
+                {
+                    "url": url,
+                    "status": status,
+                    "elapsed_ms": (time.perf_counter() - start) * 1000,
+                    "mode": "sync",
+                    "stream": stream,
+                    **(tags or {}),
+                }
+            )
+
+    async def apost(self, url: str, headers: Dict, json: Dict, tags: Optional[Dict] = None):
+        """Async single POST. Returns an object with ``status_code``, ``json()`` and ``text``."""
+        if _httpx() is None:
+            return await asyncio.to_thread(self.post, url, headers, json, False, tags)
+        start = time.perf_counter()
+        status = None
+        try:
+            response = await self._async_client().post(url, headers=headers, json=json)
+            status = response.status_code
+            return response
+        finally:
+            self._report(
+                {
+                    "url": url,
+                    "status": status,
+                    "elapsed_ms": (time.perf_counter() - start) * 1000,
+                    "mode": "async",
+                    "stream": False,
+                    **(tags or {}),
+                }
+            )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_ms"] = round(stats["total_ms"] / stats["requests"], 1) if stats["requests"] else 0.0
+        stats.update(pool_maxsize=self.pool_maxsize, http2=bool(_httpx() is not None and _http2()))
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self):
+        """Close the async client bound to the running event loop."""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_client: Optional[OpenRouterHttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> OpenRouterHttpClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenRouterHttpClient()
+    return _client
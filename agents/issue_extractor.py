@@ -4,6 +4,7 @@ import json
 from typing import Dict, List, Optional
 
 from .base_agent import BaseAgent
+from .prompting import render_context
 
 
 class IssueExtractor:
@@ -32,13 +33,16 @@ Rules:
 """
             ),
         )
+        # Extraction depends only on the message text; repeated messages hit the cache
+        self.agent.cache_ttl = 30 * 24 * 3600
+        self.agent.prompt_role = "issue_extractor"
 
     def build_messages(self, message: str, context: Optional[Dict] = None) -> List[Dict[str, str]]:
         u = {
             "role": "user",
             "content": (
                 f"User message: {message}\n\n"
-                f"Context: {json.dumps(context) if context else '{}'}\n\n"
+                f"Context: {render_context(context, self.agent.prompt_role)}\n\n"
                 "Extract issues now."
             ),
         }
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from typing import Dict, Optional
 
+from data.keywords import classify
+
 from .base_agent import BaseAgent
+from .prompting import render_context
 
 
 class IssuePrioritizer:
@@ -28,12 +31,21 @@ Fallback to reasonable defaults if uncertain.
                 """
             ),
         )
+        # Triage is a pure function of title/details/context, so /issues/retriage can reuse it
+        self.agent.cache_ttl = 30 * 24 * 3600
+        self.agent.prompt_role = "issue_prioritizer"
 
     def prioritize(self, title: str, details: str, context: Optional[Dict] = None) -> Dict[str, str]:
         try:
             messages = [
                 {"role": "system", "content": self.agent.system_prompt},
-                {"role": "user", "content": f"Title: {title}\nDetails: {details}\nContext: {context or {}}\nReturn STRICT JSON only."},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Title: {title}\nDetails: {details}\n"
+                        f"Context: {render_context(context, self.agent.prompt_role)}\nReturn STRICT JSON only."
+                    ),
+                },
             ]
             raw = self.agent.call_openrouter(messages)
             import json, re
@@ -47,14 +59,14 @@ Fallback to reasonable defaults if uncertain.
             return {"priority": pr, "time_window": tw}
         except Exception:
             # Keyword fallback
-            lower = f"{title} {details}".lower()
-            if any(k in lower for k in ["fracture", "broken bone"]):
+            hits = classify(f"{title} {details}")
+            if "triage.fracture" in hits:
                 return {"priority": "high", "time_window": "3-6m"}
-            if any(k in lower for k in ["viral", "fever", "flu"]):
+            if "triage.viral" in hits:
                 return {"priority": "high", "time_window": "3-5d"}
-            if any(k in lower for k in ["headache", "migraine"]):
+            if "triage.headache" in hits:
                 return {"priority": "medium-high", "time_window": "6-24h"}
-            if any(k in lower for k in ["stomach", "abdominal", "ache"]):
+            if "triage.stomach" in hits:
                 return {"priority": "medium", "time_window": "12-24h"}
             # Default
             return {"priority": "medium", "time_window": "24-72h"}
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from data import db
+
+
+class LLMResponseCache:
+    """Content-addressed cache for OpenRouter completions, shared by every BaseAgent.
+
+    Two tiers: an in-process LRU (``memory_entries``) in front of the SQLite ``llm_cache`` table
+    (``disk_entries``, least-recently-used rows evicted). Keys hash model, temperature and the full
+    message list, so any prompt change is a miss. Entries carry the TTL of the caller that stored them.
+    Disk hits are not written back one by one: their last-use times are batched (``touch_batch``)
+    and flushed before each eviction pass.
+    """
+
+    def __init__(
+        self,
+        memory_entries: Optional[int] = None,
+        disk_entries: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        disk: bool = True,
+        touch_batch: int = 64,
+    ):
+        self.memory_entries = memory_entries if memory_entries is not None else int(
+            os.getenv("ELYX_LLM_CACHE_MEMORY_ENTRIES", "512")
+        )
+        self.disk_entries = disk_entries if disk_entries is not None else int(
+            os.getenv("ELYX_LLM_CACHE_DISK_ENTRIES", "20000")
+        )
+        self.default_ttl = default_ttl if default_ttl is not None else float(
+            os.getenv("ELYX_LLM_CACHE_TTL", str(7 * 24 * 3600))
+        )
+        if enabled is None:
+            enabled = os.getenv("ELYX_LLM_CACHE", "1").strip() not in {"0", "false", "False"}
+        self.enabled = enabled
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._disk_ready_for: Optional[str] = None
+        self._puts_since_evict = 0
+        self.touch_batch = max(1, touch_batch)
+        self._touches: Dict[str, float] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+            "touch_flushes": 0,
+        }
+
+    @staticmethod
+    def key(model: Optional[str], temperature: Optional[float], messages: List[Dict]) -> str:
+        raw = json.dumps(
+            {"model": model, "temperature": temperature, "messages": messages},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _disk_ok(self) -> bool:
+        if not self.disk:
+            return False
+        # The cache table comes from a migration; apply it once per database path
+        if self._disk_ready_for != db.DB_PATH:
+            try:
+                db.init_db()
+            except sqlite3.Error as exc:
+                logging.warning("llm cache disk tier unavailable: %s", exc)
+                self._count("disk_errors")
+                return False
+            self._disk_ready_for = db.DB_PATH
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return response
+                del self._memory[key]
+        if self._disk_ok():
+            try:
+                row = db.llm_cache_get(key, now)
+            except sqlite3.Error as exc:
+                logging.warning("llm cache read failed: %s", exc)
+                self._count("disk_errors")
+                row = None
+            if row is not None:
+                response, expires_at = row
+                self._remember(key, response, expires_at)
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                    self._touches[key] = now
+                    due = len(self._touches) >= self.touch_batch
+                if due:
+                    self.flush_touches()
+                return response
+        self._count("misses")
+        return None
+
+    def flush_touches(self):
+        """Write the batched last-use times of disk hits (one transaction)."""
+        with self._lock:
+            touches, self._touches = self._touches, {}
+        if not touches or not self._disk_ok():
+            return
+        try:
+            db.llm_cache_touch(touches)
+            self._count("touch_flushes")
+        except sqlite3.Error as exc:
+            logging.warning("llm cache touch failed: %s", exc)
+            self._count("disk_errors")
+
+    def _remember(self, key: str, response: str, expires_at: Optional[float]):
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (response, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+                self._stats["memory_evictions"] += 1
+
+    def put(self, key: str, response: str, ttl: Optional[float] = None, model: Optional[str] = None):
+        """Store ``response``; ``ttl`` seconds (default_ttl when None, no expiry when negative)."""
+        if not self.enabled:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl == 0:
+            return
+        now = time.time()
+        expires_at = None if ttl < 0 else now + ttl
+        self._remember(key, response, expires_at)
+        self._count("stores")
+        if not self._disk_ok():
+            return
+        try:
+            db.llm_cache_put(key, model, response, expires_at, now)
+            with self._lock:
+                self._puts_since_evict += 1
+                due = self._puts_since_evict >= 64
+                if due:
+                    self._puts_since_evict = 0
+            if due:
+                # Recency first, so eviction sees what was actually used
+                self.flush_touches()
+                self._count("disk_evictions", db.llm_cache_evict(self.disk_entries, now))
+        except sqlite3.Error as exc:
+            logging.warning("llm cache write failed: %s", exc)
+            self._count("disk_errors")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touches.clear()
+        if self._disk_ok():
+            db.llm_cache_clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        stats.update(enabled=self.enabled, memory_entries=self.memory_entries, disk_entries=self.disk_entries)
+        return stats
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
@@ -1,36 +1,33 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import re
-from typing import Dict, List, Optional, Tuple
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from data.db import routing_log_add
 
 from .base_agent import BaseAgent
-from .elyx_agents import (
-    RubyAgent,
-    DrWarrenAgent,
-    AdvikAgent,
-    CarlaAgent,
-    RachelAgent,
-    NeelAgent,
-)
+from .elyx_agents import get_agent_registry
+from .prompting import render_context
+
+if TYPE_CHECKING:
+    from .fast_router import FastRouter
 
 
 class LLMRouter:
     """LLM-based router that decides which agents should reply based on message meaning.
 
-    Returns a minimal set of relevant agents; avoids hard-coded keyword rules.
+    Returns a minimal set of relevant agents; avoids hard-coded keyword rules. A local FastRouter
+    answers first and the LLM is only asked when its confidence is below ``fast_threshold``
+    (``ELYX_FAST_ROUTER_THRESHOLD``; set ``ELYX_FAST_ROUTER=0`` to always ask the LLM).
     """
 
-    def __init__(self):
-        # Build registry with agent role/system prompts for routing context
-        self.agent_descriptions: Dict[str, str] = {
-            "Ruby": RubyAgent().system_prompt,
-            "Dr. Warren": DrWarrenAgent().system_prompt,
-            "Advik": AdvikAgent().system_prompt,
-            "Carla": CarlaAgent().system_prompt,
-            "Rachel": RachelAgent().system_prompt,
-            "Neel": NeelAgent().system_prompt,
-        }
+    def __init__(self, fast_router: Optional["FastRouter"] = None):
+        self._registry = get_agent_registry()
 
         self.router = BaseAgent(
             name="Router",
@@ -53,17 +50,54 @@ Output STRICT JSON only: {"agents": ["Name", ...]} with valid names from the lis
 """
             ),
         )
+        # Routing of an identical message/context is stable; cache it for a day
+        self.router.cache_ttl = 24 * 3600
+        self.router.prompt_role = "router"
+        self._system_prompt: Optional[str] = None
+        self.fast_threshold = float(os.getenv("ELYX_FAST_ROUTER_THRESHOLD", "0.6"))
+        self.use_fast = os.getenv("ELYX_FAST_ROUTER", "1").strip() not in {"0", "false", "False"}
+        self._fast = fast_router
+
+    @property
+    def agent_descriptions(self) -> Dict[str, str]:
+        """Agent system prompts for routing context (agents come from the shared registry)."""
+        return {name: agent.system_prompt for name, agent in self._registry.items()}
+
+    def warm(self) -> "LLMRouter":
+        """Train the fast router now rather than on the first message, e.g. before threads share it."""
+        if self._fast is None and self.use_fast:
+            from .fast_router import FastRouter
+
+            self._fast = FastRouter.from_sources()
+        return self
+
+    @property
+    def fast(self) -> Optional["FastRouter"]:
+        """Trained on first use (~0.1s) from seeds, episodes.xml and logged LLM decisions."""
+        return self.warm()._fast
+
+    def _log(self, message: str, agents: List[str], source: str, confidence: Optional[float], start: float):
+        try:
+            routing_log_add(message, agents, source, confidence, (time.perf_counter() - start) * 1000)
+        except sqlite3.Error as exc:
+            logging.debug("routing_log unavailable: %s", exc)
+
+    @property
+    def system_prompt(self) -> str:
+        """Routing instructions plus the agent roster; built once, so the prefix is byte-stable."""
+        if self._system_prompt is None:
+            descriptions = "\n".join([f"- {k}: {v}" for k, v in self.agent_descriptions.items()])
+            self._system_prompt = f"{self.router.system_prompt}\nAgents:\n{descriptions}\n"
+        return self._system_prompt
 
     def _build_route_prompt(self, message: str, context: Optional[Dict] = None) -> List[Dict[str, str]]:
-        descriptions = "\n".join([f"- {k}: {v}" for k, v in self.agent_descriptions.items()])
         route_instructions = (
-            f"Agents:\n{descriptions}\n\n"
             f"User Message: {message}\n"
-            f"Context: {json.dumps(context) if context else '{}'}\n\n"
+            f"Context: {render_context(context, self.router.prompt_role)}\n\n"
             "Return STRICT JSON only."
         )
         return [
-            {"role": "system", "content": self.router.system_prompt},
+            {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": route_instructions},
         ]
 
@@ -82,20 +116,24 @@ Output STRICT JSON only: {"agents": ["Name", ...]} with valid names from the lis
                 return {}
         return {}
 
-    _cache: Dict[Tuple[str, str], List[str]] = {}
-
     def route(self, message: str, context: Optional[Dict] = None, max_agents: int = 2) -> List[str]:
-        cache_key = (message.strip(), json.dumps(context or {}, sort_keys=True))
-        if cache_key in self._cache:
-            return self._cache[cache_key][:max_agents]
-
-        msgs = self._build_route_prompt(message, context)
+        fast = self.fast if self.use_fast else None
+        start = time.perf_counter()
+        confidence = None
+        if fast is not None:
+            agents, confidence = fast.route(message, max_agents)
+            if confidence >= self.fast_threshold:
+                self._log(message, agents, "fast", confidence, start)
+                return agents
+
+        # Repeated messages are answered by the shared LLM response cache in call_openrouter
+        msgs = self._build_route_prompt(message.strip(), context)
         raw = self.router.call_openrouter(msgs)
         data = self._extract_json(raw)
         agents = data.get("agents") if isinstance(data, dict) else None
         result: List[str]
         if isinstance(agents, list):
-            valid = [a for a in agents if a in self.agent_descriptions]
+            valid = [a for a in agents if a in self._registry]
             seen = set()
             ordered: List[str] = []
             for a in valid:
@@ -106,11 +144,9 @@ Output STRICT JSON only: {"agents": ["Name", ...]} with valid names from the lis
         else:
             # Conservative fallback: no agent selected; let Ruby route only if explicitly logistics
             result = []
-
-        # Tiny LRU: cap cache size to 128 entries
-        if len(self._cache) > 128:
-            self._cache.pop(next(iter(self._cache)))
-        self._cache[cache_key] = result
+        # Mock replies carry no routing signal; real decisions become FastRouter training data
+        if not self.router._should_use_mock():
+            self._log(message, result, "llm", confidence, start)
         return result
 
 
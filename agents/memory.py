@@ -0,0 +1,194 @@
+"""Bounded per-member conversation memory for agents.
+
+Each agent keeps, per member, the last few turns verbatim plus a rolling summary of everything
+older. When the buffer reaches ``turns + compact_every`` turns, the oldest ones are folded into the
+summary, so memory per member and the prompt space it takes are both fixed. Members themselves are
+kept in LRU order and capped.
+
+Summaries are extractive by default: one short line per exchange, and when the summary outgrows its
+token budget the oldest line without a symptom/urgency keyword goes first. With
+``ELYX_MEMORY_SUMMARIZER=llm`` a cheap model (``ELYX_MEMORY_SUMMARY_MODEL``) rewrites the summary
+instead, falling back to the extractive form if the call fails.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data.keywords import classify
+
+from .prompting import clip_text, count_tokens
+
+Turn = Tuple[str, str]  # (member message, agent reply)
+Summarizer = Callable[[str, List[Turn]], str]
+
+DEFAULT_MEMBER = "default"
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# Keyword categories that make a summary line worth keeping longer
+_SALIENT = ("urgency.", "issue.category.", "issue.improvement")
+
+
+def _first_sentence(text: str, max_words: int = 25) -> str:
+    sentence = _SENTENCE_RE.split(" ".join((text or "").split()), maxsplit=1)[0]
+    words = sentence.split()
+    return " ".join(words[:max_words]) + ("…" if len(words) > max_words else "")
+
+
+def _salient(line: str) -> bool:
+    return any(c.startswith(_SALIENT) for c in classify(line.lower()))
+
+
+def extractive_summary(summary: str, turns: List[Turn], max_tokens: int, agent: str = "Agent") -> str:
+    """Append one line per turn, then drop lines (oldest non-salient first) to fit ``max_tokens``."""
+    lines = [line for line in summary.split("\n") if line]
+    lines += [f"- Member: {_first_sentence(user)} | {agent}: {_first_sentence(reply)}" for user, reply in turns]
+    while len(lines) > 1 and count_tokens("\n".join(lines)) > max_tokens:
+        drop = next((i for i, line in enumerate(lines) if not _salient(line)), 0)
+        del lines[drop]
+    return clip_text("\n".join(lines), max_tokens)
+
+
+class AgentMemory:
+    """Per-member ring buffer of recent turns plus a rolling summary (thread-safe)."""
+
+    def __init__(
+        self,
+        agent: str = "Agent",
+        turns: Optional[int] = None,
+        compact_every: Optional[int] = None,
+        summary_tokens: Optional[int] = None,
+        turn_tokens: Optional[int] = None,
+        max_members: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.agent = agent
+        self.turns = turns if turns is not None else int(os.getenv("ELYX_MEMORY_TURNS", "6"))
+        self.compact_every = max(1, compact_every or self.turns or 1)
+        self.summary_tokens = summary_tokens or int(os.getenv("ELYX_MEMORY_SUMMARY_TOKENS", "300"))
+        self.turn_tokens = turn_tokens or int(os.getenv("ELYX_MEMORY_TURN_TOKENS", "250"))
+        self.max_members = max_members or int(os.getenv("ELYX_MEMORY_MAX_MEMBERS", "500"))
+        self.summarizer = summarizer
+        self._members: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+
+    def _member(self, member: str) -> Dict:
+        state = self._members.get(member)
+        if state is None:
+            state = self._members[member] = {"summary": "", "turns": [], "compacted": 0}
+            while len(self._members) > self.max_members:
+                self._members.popitem(last=False)
+        self._members.move_to_end(member)
+        return state
+
+    def add(self, member: Optional[str], user_message: str, reply: str):
+        member = member or DEFAULT_MEMBER
+        with self._lock:
+            state = self._member(member)
+            state["turns"].append((user_message, reply))
+            if len(state["turns"]) < self.turns + self.compact_every:
+                return
+            old = state["turns"][: len(state["turns"]) - self.turns]
+            del state["turns"][: len(old)]
+        # Summarize outside the buffer lock (an LLM summarizer takes a network round trip);
+        # compactions are serialized so none overwrites another's summary
+        with self._compact_lock:
+            summary = self._summarize(state["summary"], old)
+            with self._lock:
+                state["summary"] = summary
+                state["compacted"] += len(old)
+
+    def _summarize(self, summary: str, turns: List[Turn]) -> str:
+        if self.summarizer is not None:
+            try:
+                return clip_text(self.summarizer(summary, turns).strip(), self.summary_tokens)
+            except Exception:  # noqa: BLE001
+                pass
+        return extractive_summary(summary, turns, self.summary_tokens, self.agent)
+
+    def recall(self, member: Optional[str]) -> Tuple[str, List[Turn]]:
+        """Rolling summary and the last ``turns`` turns (each clipped to ``turn_tokens``)."""
+        with self._lock:
+            state = self._members.get(member or DEFAULT_MEMBER)
+            if state is None:
+                return "", []
+            recent = state["turns"][-self.turns:] if self.turns else []
+            summary = state["summary"]
+        return summary, [(clip_text(u, self.turn_tokens), clip_text(r, self.turn_tokens)) for u, r in recent]
+
+    def export(self, member: Optional[str]) -> Optional[Dict]:
+        """A member's summary and buffered turns as plain JSON data, or None if there are none."""
+        with self._lock:
+            state = self._members.get(member or DEFAULT_MEMBER)
+            if state is None:
+                return None
+            return {
+                "summary": state["summary"],
+                "turns": [list(turn) for turn in state["turns"]],
+                "compacted": state["compacted"],
+            }
+
+    def load(self, member: Optional[str], data: Dict):
+        """Replace a member's state with an ``export()``."""
+        with self._lock:
+            state = self._member(member or DEFAULT_MEMBER)
+            state["summary"] = data["summary"]
+            state["turns"] = [tuple(turn) for turn in data["turns"]]
+            state["compacted"] = data["compacted"]
+
+    def forget(self, member: Optional[str] = None):
+        with self._lock:
+            if member is None:
+                self._members.clear()
+            else:
+                self._members.pop(member, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "members": len(self._members),
+                "turns": sum(len(s["turns"]) for s in self._members.values()),
+                "compacted": sum(s["compacted"] for s in self._members.values()),
+                "summary_tokens": sum(count_tokens(s["summary"]) for s in self._members.values()),
+            }
+
+
+def llm_summarizer(agent_name: str) -> Summarizer:
+    """Summarizer that asks a cheap model to fold turns into the running summary."""
+    from .base_agent import BaseAgent
+
+    agent = BaseAgent(
+        name="MemorySummarizer",
+        role="Summarizer",
+        system_prompt=(
+            "You maintain a running summary of a health coaching conversation between a member and "
+            f"{agent_name}. Merge the new exchanges into the summary. Keep symptoms, decisions, plans, "
+            "commitments and open questions; drop pleasantries. Reply with at most 8 short bullet lines."
+        ),
+    )
+    agent.prompt_role = "memory"
+    agent.cache_ttl = 0
+    model = os.getenv("ELYX_MEMORY_SUMMARY_MODEL") or None
+
+    def summarize(summary: str, turns: List[Turn]) -> str:
+        if agent._should_use_mock():
+            raise RuntimeError("no LLM configured")  # AgentMemory falls back to extractive
+        exchanges = "\n".join(f"Member: {u}\n{agent_name}: {r}" for u, r in turns)
+        return agent.call_openrouter(
+            [
+                {"role": "system", "content": agent.system_prompt},
+                {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\nNew exchanges:\n{exchanges}"},
+            ],
+            model=model,
+        )
+
+    return summarize
+
+
+def memory_for(agent_name: str) -> AgentMemory:
+    """Memory configured from the environment (ELYX_MEMORY_*)."""
+    use_llm = os.getenv("ELYX_MEMORY_SUMMARIZER", "extractive").strip().lower() == "llm"
+    return AgentMemory(agent_name, summarizer=llm_summarizer(agent_name) if use_llm else None)
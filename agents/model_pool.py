@@ -0,0 +1,334 @@
+import asyncio
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000]
+
+
+class ModelHealth:
+    """Rolling outcome window for one model plus its circuit breaker.
+
+    The breaker opens when the window's error rate or p95 latency crosses its threshold, stays open
+    for ``cooldown`` seconds, then lets a single probe through (half-open) before closing again.
+    """
+
+    def __init__(self, window: int, min_calls: int, max_error_rate: float, max_p95_ms: float, cooldown: float):
+        self.window: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.min_calls = min_calls
+        self.max_error_rate = max_error_rate
+        self.max_p95_ms = max_p95_ms
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.calls = 0
+        self.errors = 0
+
+    def error_rate(self) -> float:
+        if not self.window:
+            return 0.0
+        return sum(1 for _, ok in self.window if not ok) / len(self.window)
+
+    def percentile(self, q: float) -> Optional[float]:
+        latencies = sorted(ms for ms, ok in self.window if ok)
+        if len(latencies) < self.min_calls:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def available(self, now: float) -> bool:
+        if self.state == "open" and now - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+            self.probe_in_flight = False
+        if self.state == "half_open":
+            return not self.probe_in_flight
+        return self.state == "closed"
+
+    def record(self, latency_ms: float, ok: bool, now: float):
+        self.calls += 1
+        self.errors += 0 if ok else 1
+        self.window.append((latency_ms, ok))
+        if ok:
+            self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        if self.state == "half_open":
+            self.probe_in_flight = False
+            if ok:
+                self.state = "closed"
+                self.window.clear()
+            else:
+                self.state, self.opened_at = "open", now
+            return
+        if self.state == "closed" and len(self.window) >= self.min_calls:
+            p95 = self.percentile(0.95)
+            if self.error_rate() >= self.max_error_rate or (p95 is not None and p95 > self.max_p95_ms):
+                self.state, self.opened_at = "open", now
+
+    def score(self) -> float:
+        """Expected cost of picking this model: median latency inflated by its error rate."""
+        p50 = self.percentile(0.5)
+        if p50 is None:
+            return float("inf")
+        return p50 * (1 + 4 * self.error_rate())
+
+
+class ModelPool:
+    """Primary model plus fallbacks behind BaseAgent and CrewOrchestrator.
+
+    ``call(fn)`` runs ``fn(model)`` on the best available model and, if it has not answered within
+    the hedge delay (the model's p95 latency, clamped to ``[hedge_min_ms, hedge_max_ms]``), races a
+    second call on the next model; the first success wins. Failures fall through to the remaining
+    models. The primary is ``OPENROUTER_MODEL`` (read on each call, so ``POST /model`` still works) and
+    fallbacks come from ``OPENROUTER_FALLBACK_MODELS``; with no fallbacks this is a plain call.
+    """
+
+    def __init__(
+        self,
+        fallbacks: Optional[List[str]] = None,
+        hedge: Optional[bool] = None,
+        hedge_min_ms: Optional[float] = None,
+        hedge_max_ms: Optional[float] = None,
+        window: int = 100,
+        min_calls: int = 5,
+        max_error_rate: float = 0.5,
+        max_p95_ms: Optional[float] = None,
+        cooldown: Optional[float] = None,
+        workers: Optional[int] = None,
+    ):
+        if fallbacks is None:
+            fallbacks = [m.strip() for m in os.getenv("OPENROUTER_FALLBACK_MODELS", "").split(",") if m.strip()]
+        self.fallbacks = fallbacks
+        if hedge is None:
+            hedge = os.getenv("ELYX_HEDGE_REQUESTS", "1").strip() not in {"0", "false", "False"}
+        self.hedge = hedge
+        self.hedge_min_ms = hedge_min_ms if hedge_min_ms is not None else float(os.getenv("ELYX_HEDGE_MIN_MS", "1500"))
+        self.hedge_max_ms = hedge_max_ms if hedge_max_ms is not None else float(os.getenv("ELYX_HEDGE_MAX_MS", "15000"))
+        self._health_args = (
+            window,
+            min_calls,
+            max_error_rate,
+            max_p95_ms if max_p95_ms is not None else float(os.getenv("ELYX_MODEL_MAX_P95_MS", "45000")),
+            cooldown if cooldown is not None else float(os.getenv("ELYX_MODEL_COOLDOWN_S", "30")),
+        )
+        self._lock = threading.Lock()
+        self._health: Dict[str, ModelHealth] = {}
+        self._workers = workers or int(os.getenv("ELYX_MODEL_POOL_WORKERS", "16"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "fallbacks": 0, "failures": 0}
+
+    @staticmethod
+    def primary() -> str:
+        return os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-20b:free")
+
+    def models(self) -> List[str]:
+        primary = self.primary()
+        return [primary] + [m for m in self.fallbacks if m != primary]
+
+    def _get(self, model: str) -> ModelHealth:
+        health = self._health.get(model)
+        if health is None:
+            health = self._health[model] = ModelHealth(*self._health_args)
+        return health
+
+    def candidates(self) -> List[str]:
+        """Available models, best first. Models without enough samples keep their configured order."""
+        now = time.monotonic()
+        with self._lock:
+            models = self.models()
+            ranked = [(m, self._get(m)) for m in models if self._get(m).available(now)]
+            if not ranked:
+                # Everything is open: try the configured order rather than failing outright
+                return models
+            order = {m: i for i, m in enumerate(models)}
+            primary_score = self._get(models[0]).score()
+            # Keep the primary first until measurements show another model is faster
+            ranked.sort(key=lambda mh: (mh[1].score() if primary_score != float("inf") else 0, order[mh[0]]))
+            return [m for m, _ in ranked]
+
+    def pick(self) -> str:
+        """Best available model for a call that cannot be hedged (e.g. a stream); record() its outcome."""
+        model = self.candidates()[0]
+        self._claim(model)
+        return model
+
+    def _claim(self, model: str):
+        with self._lock:
+            health = self._get(model)
+            if health.state == "half_open":
+                health.probe_in_flight = True
+
+    def record(self, model: str, latency_ms: float, ok: bool):
+        with self._lock:
+            self._get(model).record(latency_ms, ok, time.monotonic())
+
+    def hedge_delay(self, model: str) -> float:
+        """Seconds to wait on ``model`` before racing a backup."""
+        with self._lock:
+            p95 = self._get(model).percentile(0.95)
+        ms = self.hedge_max_ms if p95 is None else p95
+        return min(self.hedge_max_ms, max(self.hedge_min_ms, ms)) / 1000.0
+
+    def _timed(self, fn: Callable[[str], T], model: str) -> T:
+        self._claim(model)
+        start = time.perf_counter()
+        try:
+            result = fn(model)
+        except Exception:
+            self.record(model, (time.perf_counter() - start) * 1000, False)
+            raise
+        self.record(model, (time.perf_counter() - start) * 1000, True)
+        return result
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="model-pool")
+        return self._executor
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def call(self, fn: Callable[[str], T]) -> T:
+        """Run ``fn(model)`` with hedging and fallback; raises the last error if every model fails."""
+        self._count("calls")
+        queue = self.candidates()
+        if len(queue) == 1 or not self.hedge:
+            last_exc: Optional[Exception] = None
+            for n, model in enumerate(queue):
+                try:
+                    result = self._timed(fn, model)
+                except Exception as exc:  # noqa: BLE001
+                    last_exc = exc
+                    continue
+                if n:
+                    self._count("fallbacks")
+                return result
+            self._count("failures")
+            raise last_exc  # type: ignore[misc]
+
+        primary = queue[0]
+        pending: Dict[Future, str] = {}
+        last_exc = None
+        hedged = False
+
+        def launch(model: str):
+            pending[self._pool().submit(self._timed, fn, model)] = model
+
+        launch(queue.pop(0))
+        while pending:
+            timeout = self.hedge_delay(primary) if len(pending) == 1 and queue else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is slower than its p95: race the next model
+                self._count("hedged")
+                hedged = True
+                launch(queue.pop(0))
+                continue
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    last_exc = exc
+                    continue
+                if model != primary:
+                    self._count("hedge_wins" if hedged else "fallbacks")
+                return result
+            if not pending and queue:
+                launch(queue.pop(0))
+        self._count("failures")
+        raise last_exc  # type: ignore[misc]
+
+    async def acall(self, fn: Callable[[str], Awaitable[T]]) -> T:
+        """Async ``call``: hedges with tasks on the running loop instead of threads."""
+        self._count("calls")
+        queue = self.candidates()
+        primary = queue[0]
+        hedging = self.hedge and len(queue) > 1
+        last_exc: Optional[Exception] = None
+        hedged = False
+
+        async def timed(model: str) -> T:
+            self._claim(model)
+            start = time.perf_counter()
+            try:
+                result = await fn(model)
+            except Exception:
+                self.record(model, (time.perf_counter() - start) * 1000, False)
+                raise
+            self.record(model, (time.perf_counter() - start) * 1000, True)
+            return result
+
+        pending: Dict[asyncio.Task, str] = {}
+        pending[asyncio.ensure_future(timed(queue.pop(0)))] = primary
+        try:
+            while pending:
+                timeout = self.hedge_delay(primary) if hedging and len(pending) == 1 and queue else None
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self._count("hedged")
+                    hedged = True
+                    model = queue.pop(0)
+                    pending[asyncio.ensure_future(timed(model))] = model
+                    continue
+                for task in done:
+                    model = pending.pop(task)
+                    if task.exception() is not None:
+                        last_exc = task.exception()
+                        continue
+                    if model != primary:
+                        self._count("hedge_wins" if hedged else "fallbacks")
+                    return task.result()
+                if not pending and queue:
+                    model = queue.pop(0)
+                    pending[asyncio.ensure_future(timed(model))] = model
+        finally:
+            for task in pending:
+                task.cancel()
+        self._count("failures")
+        raise last_exc  # type: ignore[misc]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            models = {}
+            for model in self.models():
+                health = self._get(model)
+                models[model] = {
+                    "state": health.state,
+                    "calls": health.calls,
+                    "errors": health.errors,
+                    "error_rate": round(health.error_rate(), 3),
+                    "p50_ms": health.percentile(0.5),
+                    "p95_ms": health.percentile(0.95),
+                    "histogram": dict(
+                        zip([f"<={b}" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"], health.histogram)
+                    ),
+                }
+            return {**self._stats, "hedge": self.hedge, "models": models}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_pool: Optional[ModelPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ModelPool()
+    return _pool
@@ -4,6 +4,7 @@ import json
 from typing import Dict, List, Optional
 
 from .base_agent import BaseAgent
+from .prompting import render_context
 
 
 class PlanExtractor:
@@ -29,13 +30,16 @@ Rules:
 """
             ),
         )
+        # Extraction depends only on the reply text; re-simulated replies hit the cache
+        self.agent.cache_ttl = 30 * 24 * 3600
+        self.agent.prompt_role = "plan_extractor"
 
     def build_messages(self, agent_name: str, reply: str, context: Optional[Dict] = None) -> List[Dict[str, str]]:
         u = {
             "role": "user",
             "content": (
                 f"Agent: {agent_name}\nReply: {reply}\n\n"
-                f"Context: {json.dumps(context) if context else '{}'}\n\n"
+                f"Context: {render_context(context, self.agent.prompt_role)}\n\n"
                 "Extract suggestions now."
             ),
         }
@@ -0,0 +1,229 @@
+"""Token-budgeted prompt assembly shared by every LLM caller.
+
+Context dicts (events, profile, evidence, ...) can be arbitrarily large, and prompt size drives
+latency and cost. ``render_context`` serializes a context deterministically and trims it to the
+token budget of the calling role:
+
+- fields are kept in ``FIELD_PRIORITY`` order (unlisted keys after, alphabetically)
+- a field that does not fit is shrunk into at most half of the remaining budget: lists keep their
+  newest (last) items, strings are cut, dicts are trimmed field by field; whatever still does not
+  fit is dropped and listed in ``"_omitted"`` so the model knows it is missing
+
+Tokens are counted with tiktoken when it is installed, else with a local approximation (~4
+characters per word piece, one per punctuation mark). System prompts are never templated with
+per-request data, so the leading system message of every role stays byte-identical across calls
+and provider-side prefix caching can reuse it.
+"""
+
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except Exception:  # noqa: BLE001
+    tiktoken = None  # type: ignore[assignment]
+
+
+# Context tokens each role may spend; override with ELYX_PROMPT_BUDGETS="agent=2000,router=300"
+DEFAULT_BUDGETS: Dict[str, int] = {
+    "agent": 1500,
+    "router": 300,
+    "issue_extractor": 500,
+    "plan_extractor": 500,
+    "issue_prioritizer": 300,
+}
+
+# Context fields in the order they are kept when the budget is tight
+FIELD_PRIORITY = (
+    "member_id", "user_id", "week", "urgency", "goal", "profile", "plan", "events", "evidence", "history",
+)
+
+OMITTED_KEY = "_omitted"
+
+_WORD_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(os.getenv("ELYX_TOKENIZER", "cl100k_base"))
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return sum((len(piece) + 3) // 4 for piece in _WORD_PIECE_RE.findall(text))
+
+
+def message_tokens(messages: List[Dict]) -> int:
+    """Prompt size of a chat request, including the per-message framing chat formats add."""
+    return sum(count_tokens(str(m.get("content") or "")) + 4 for m in messages) + 2
+
+
+def stable_json(value: Any) -> str:
+    """Compact, key-sorted JSON, so equal contexts always render to the same bytes."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _budgets() -> Dict[str, int]:
+    budgets = dict(DEFAULT_BUDGETS)
+    for part in os.getenv("ELYX_PROMPT_BUDGETS", "").split(","):
+        role, _, value = part.partition("=")
+        if role.strip() and value.strip().isdigit():
+            budgets[role.strip()] = int(value)
+    return budgets
+
+
+def budget_for(role: str) -> int:
+    budgets = _budgets()
+    return budgets.get(role, budgets["agent"])
+
+
+def _fit(value: Any, budget: int) -> Optional[Any]:
+    """``value`` shrunk to at most ``budget`` tokens of JSON, or None when nothing useful fits."""
+    if budget <= 0:
+        return None
+    if count_tokens(stable_json(value)) <= budget:
+        return value
+    if isinstance(value, str):
+        lo, hi = 0, len(value)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if count_tokens(stable_json(value[:mid] + "…")) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        return value[:lo] + "…" if lo else None
+    if isinstance(value, list):
+        # Newest entries last (events, history): keep the tail
+        kept: List[Any] = []
+        used = count_tokens(stable_json([f"{len(value)} earlier items omitted"]))
+        for item in reversed(value):
+            cost = count_tokens(stable_json(item)) + 1
+            if used + cost > budget:
+                break
+            kept.append(item)
+            used += cost
+        if not kept:
+            return None
+        return [f"{len(value) - len(kept)} earlier items omitted"] + kept[::-1]
+    if isinstance(value, dict):
+        trimmed, _ = _trim_fields(value, budget)
+        return trimmed or None
+    return None
+
+
+def clip_text(text: str, max_tokens: int) -> str:
+    """``text`` cut (with an ellipsis) to at most ``max_tokens`` tokens."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) + 1 <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + "…"
+
+
+def _ordered_keys(context: Dict) -> List[str]:
+    rank = {k: i for i, k in enumerate(FIELD_PRIORITY)}
+    return sorted(context, key=lambda k: (rank.get(k, len(rank)), str(k)))
+
+
+def _trim_fields(context: Dict, budget: int) -> Tuple[Dict, List[str]]:
+    kept: Dict = {}
+    omitted: List[str] = []
+    remaining = budget - 2
+    keys = _ordered_keys(context)
+    for n, key in enumerate(keys):
+        value = context[key]
+        key_cost = count_tokens(stable_json(str(key))) + 1
+        cost = key_cost + count_tokens(stable_json(value)) + 1
+        if cost <= remaining:
+            kept[key] = value
+            remaining -= cost
+            continue
+        # An oversized field gets at most half of what is left (so later fields are not starved),
+        # minus room for the omitted-key marker
+        share = remaining if n == len(keys) - 1 else remaining // 2
+        reserve = count_tokens(stable_json({OMITTED_KEY: omitted + [str(key)]}))
+        fitted = _fit(value, share - key_cost - reserve)
+        if fitted is None:
+            omitted.append(str(key))
+            continue
+        kept[key] = fitted
+        remaining -= key_cost + count_tokens(stable_json(fitted)) + 1
+    if omitted:
+        kept[OMITTED_KEY] = omitted
+    return kept, omitted
+
+
+class PromptStats:
+    """Per-role counters: calls, prompt tokens sent and context tokens saved by trimming."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._roles: Dict[str, Dict[str, int]] = {}
+
+    def _role(self, role: str) -> Dict[str, int]:
+        counters = ("prompts", "prompt_tokens", "contexts", "trimmed", "context_tokens_in", "context_tokens_out")
+        return self._roles.setdefault(role, dict.fromkeys(counters, 0))
+
+    def record_context(self, role: str, tokens_in: int, tokens_out: int):
+        with self._lock:
+            r = self._role(role)
+            r["contexts"] += 1
+            r["trimmed"] += tokens_out < tokens_in
+            r["context_tokens_in"] += tokens_in
+            r["context_tokens_out"] += tokens_out
+
+    def record_prompt(self, role: str, messages: List[Dict]):
+        tokens = message_tokens(messages)
+        with self._lock:
+            r = self._role(role)
+            r["prompts"] += 1
+            r["prompt_tokens"] += tokens
+
+    def stats(self) -> Dict:
+        with self._lock:
+            roles = {k: dict(v) for k, v in self._roles.items()}
+        for r in roles.values():
+            r["avg_prompt_tokens"] = round(r["prompt_tokens"] / r["prompts"], 1) if r["prompts"] else 0.0
+        return {"tokenizer": "tiktoken" if _encoding() is not None else "approx", "budgets": _budgets(), "roles": roles}
+
+
+PROMPT_STATS = PromptStats()
+
+
+def trim_context(context: Optional[Dict], role: str = "agent", budget: Optional[int] = None) -> Dict:
+    """``context`` trimmed to the role's token budget (see module docstring)."""
+    if not context:
+        return {}
+    budget = budget_for(role) if budget is None else budget
+    full = count_tokens(stable_json(context))
+    if full <= budget:
+        trimmed = context
+    else:
+        trimmed, _ = _trim_fields(context, budget)
+    PROMPT_STATS.record_context(role, full, full if trimmed is context else count_tokens(stable_json(trimmed)))
+    return trimmed
+
+
+def render_context(context: Optional[Dict], role: str = "agent", budget: Optional[int] = None) -> str:
+    """Budgeted, deterministic JSON for embedding a context in a prompt (``"{}"`` when empty)."""
+    return stable_json(trim_context(context, role, budget))
+
+
+def prompt_stats() -> Dict:
+    return PROMPT_STATS.stats()
@@ -0,0 +1,257 @@
+import asyncio
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Mapping, Optional
+
+from .prompting import message_tokens
+
+
+class TokenBucket:
+    """Classic token bucket: ``capacity`` tokens, refilled continuously at ``rate`` per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 when they already are)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def drain(self, remaining: float, now: float):
+        """Align with the provider's view of what is left in the current window."""
+        self._refill(now)
+        self.tokens = min(self.tokens, remaining)
+
+
+class _ModelState:
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm / 60.0, max(rpm, 1.0)) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm / 60.0, tpm) if tpm > 0 else None
+        self.queue: Deque[int] = deque()
+        self.blocked_until = 0.0
+        self.throttle_streak = 0
+
+
+class RateLimitScheduler:
+    """Process-wide admission control in front of OpenRouter.
+
+    Each model gets request-per-minute and token-per-minute buckets and a FIFO queue, so concurrent
+    callers are admitted in arrival order at the provider's rate instead of retrying on their own.
+    ``observe()`` feeds response status and ``Retry-After`` / ``x-ratelimit-*`` headers back in: a
+    429 pauses the whole model until the provider says it is safe, with exponential backoff when it
+    does not say.
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.rpm = rpm if rpm is not None else float(os.getenv("ELYX_LLM_RPM", "60"))
+        self.tpm = tpm if tpm is not None else float(os.getenv("ELYX_LLM_TPM", "0"))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("ELYX_LLM_MAX_QUEUE_WAIT", "120"))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._models: Dict[str, _ModelState] = {}
+        self._tickets = itertools.count()
+        self._stats = {"admitted": 0, "waited": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "throttled": 0, "timeouts": 0}
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = self._models[model] = _ModelState(self.rpm, self.tpm)
+        return state
+
+    def _delay(self, state: _ModelState, ticket: int, tokens: float, now: float) -> float:
+        """Seconds ``ticket`` must still wait; 0 means it was admitted (and left the queue)."""
+        if state.queue[0] != ticket:
+            return 0.05
+        wall = time.time()
+        if state.blocked_until > wall:
+            return state.blocked_until - wall
+        delay = 0.0
+        if state.requests is not None:
+            delay = max(delay, state.requests.wait_time(1, now))
+        if state.tokens is not None:
+            delay = max(delay, state.tokens.wait_time(tokens, now))
+        if delay > 0:
+            return delay
+        if state.requests is not None:
+            state.requests.take(1)
+        if state.tokens is not None:
+            state.tokens.take(tokens)
+        state.queue.popleft()
+        return 0.0
+
+    def _enter(self, model: str) -> int:
+        ticket = next(self._tickets)
+        self._state(model).queue.append(ticket)
+        return ticket
+
+    def _leave(self, model: str, ticket: int, started: float, admitted: bool):
+        state = self._state(model)
+        if not admitted:
+            try:
+                state.queue.remove(ticket)
+            except ValueError:
+                pass
+            self._stats["timeouts"] += 1
+        else:
+            self._stats["admitted"] += 1
+            waited_ms = (time.monotonic() - started) * 1000
+            if waited_ms >= 1:
+                self._stats["waited"] += 1
+                self._stats["wait_ms_total"] += waited_ms
+                self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], waited_ms)
+        self._cond.notify_all()
+
+    def acquire(self, model: str, tokens: float = 0):
+        """Block until a request for ``model`` estimated at ``tokens`` tokens may be sent."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._cond:
+            ticket = self._enter(model)
+            admitted = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._delay(self._state(model), ticket, tokens, now)
+                    if delay <= 0:
+                        admitted = True
+                        return
+                    if now + delay > deadline:
+                        raise RuntimeError(f"OpenRouter rate limit: no capacity for {model} within {self.max_wait:.0f}s")
+                    self._cond.wait(delay)
+            finally:
+                self._leave(model, ticket, started, admitted)
+
+    async def aacquire(self, model: str, tokens: float = 0):
+        """Async acquire: same queue, but waits with asyncio.sleep instead of holding a thread."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._lock:
+            ticket = self._enter(model)
+        admitted = False
+        try:
+            while True:
+                now = time.monotonic()
+                with self._lock:
+                    delay = self._delay(self._state(model), ticket, tokens, now)
+                if delay <= 0:
+                    admitted = True
+                    return
+                if now + delay > deadline:
+                    raise RuntimeError(f"OpenRouter rate limit: no capacity for {model} within {self.max_wait:.0f}s")
+                await asyncio.sleep(min(delay, 0.25))
+        finally:
+            with self._cond:
+                self._leave(model, ticket, started, admitted)
+
+    @staticmethod
+    def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        """Seconds to wait per ``Retry-After`` (delta or HTTP date) or ``x-ratelimit-reset``."""
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        reset = headers.get("x-ratelimit-reset")
+        if reset:
+            try:
+                reset_at = float(reset)
+            except ValueError:
+                return None
+            # OpenRouter sends epoch milliseconds; tolerate epoch seconds and plain deltas too
+            if reset_at > 1e12:
+                reset_at /= 1000.0
+            return max(0.0, reset_at - time.time()) if reset_at > 1e9 else reset_at
+        return None
+
+    def observe(self, model: str, status: Optional[int], headers: Optional[Mapping[str, str]] = None):
+        """Feed a response back. Returns True when the caller should retry (a 429)."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = time.monotonic()
+        with self._cond:
+            state = self._state(model)
+            remaining = headers.get("x-ratelimit-remaining")
+            if remaining is not None and state.requests is not None:
+                try:
+                    state.requests.drain(float(remaining), now)
+                except ValueError:
+                    pass
+            if status != 429:
+                state.throttle_streak = 0
+                if remaining == "0":
+                    wait = self._retry_after(headers)
+                    if wait:
+                        state.blocked_until = max(state.blocked_until, time.time() + wait)
+                return False
+            self._stats["throttled"] += 1
+            state.throttle_streak += 1
+            wait = self._retry_after(headers)
+            if wait is None:
+                wait = min(self.max_backoff, self.base_backoff * 2 ** (state.throttle_streak - 1))
+            state.blocked_until = max(state.blocked_until, time.time() + wait)
+            self._cond.notify_all()
+            return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            wall = time.time()
+            stats["models"] = {
+                model: {
+                    "queue_depth": len(state.queue),
+                    "blocked_for_s": round(max(0.0, state.blocked_until - wall), 2),
+                    "throttle_streak": state.throttle_streak,
+                }
+                for model, state in self._models.items()
+            }
+        stats["queue_depth"] = sum(m["queue_depth"] for m in stats["models"].values())
+        stats["wait_ms_avg"] = round(stats["wait_ms_total"] / stats["waited"], 1) if stats["waited"] else 0.0
+        stats.update(rpm=self.rpm, tpm=self.tpm)
+        return stats
+
+
+def estimate_tokens(messages) -> int:
+    """Prompt size for the token bucket (same tokenizer as prompt assembly)."""
+    return message_tokens(messages)
+
+
+_scheduler: Optional[RateLimitScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimitScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RateLimitScheduler()
+    return _scheduler
@@ -0,0 +1,263 @@
+"""Background enrichment for /chat.
+
+Plan extraction, issue extraction and issue triage each cost an LLM round trip. /chat enqueues
+them as jobs in the SQLite ``jobs`` table and returns as soon as the agent replies are stored;
+worker threads drain the queue, retry failures with backoff and record each job's status so the
+dashboard can tell when suggestions/issues for a given message have landed.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from data.db import (
+    issues_add_many,
+    issues_update_priority_time,
+    jobs_claim,
+    jobs_complete,
+    jobs_enqueue,
+    jobs_fail,
+    suggestions_add_many,
+)
+from data.keywords import classify
+
+
+def _stable_id(*parts) -> str:
+    """Deterministic row id so a retried job re-inserts the same rows (INSERT OR IGNORE)."""
+    return hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:16]
+
+
+def _message_ref(payload: Dict) -> tuple:
+    """What a job's rows are derived from: the stable message id, else (conversation, index).
+
+    Message indexes restart when a conversation is reset, so ids derived from them could collide
+    with rows extracted from an earlier message at the same index.
+    """
+    if payload.get("message_id"):
+        return (payload["message_id"],)
+    return (payload["conversation_id"], payload["message_index"])
+
+
+class EnrichmentQueue:
+    """SQLite-backed job queue with a small pool of worker threads.
+
+    With ``workers=0`` jobs run inline at enqueue time, which keeps scripts and tests deterministic.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_attempts: int = 3,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300,
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, Callable[[Dict, bool], None]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def register(self, kind: str, handler: Callable[[Dict, bool], None]):
+        """Register ``handler(payload, final_attempt)`` for a job kind."""
+        self.handlers[kind] = handler
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict,
+        conversation_id: Optional[str] = None,
+        message_index: Optional[int] = None,
+    ) -> str:
+        job_id = jobs_enqueue(
+            {
+                "id": os.urandom(8).hex(),
+                "kind": kind,
+                "payload": payload,
+                "max_attempts": self.max_attempts,
+                "conversation_id": conversation_id,
+                "message_index": message_index,
+            }
+        )
+        if self.workers > 0:
+            self._wake.set()
+        else:
+            self.run_pending()
+        return job_id
+
+    def run_one(self) -> bool:
+        """Claim and run a single job. Returns False when nothing was runnable."""
+        job = jobs_claim(self.lease_seconds)
+        if job is None:
+            return False
+        handler = self.handlers.get(job["kind"])
+        final = job["attempts"] >= job["max_attempts"]
+        try:
+            if handler is None:
+                raise RuntimeError(f"no handler for job kind {job['kind']!r}")
+            handler(job["payload"] or {}, final)
+        except Exception as exc:  # noqa: BLE001
+            retry_in = None if final else float(2 ** job["attempts"])
+            logging.warning("job %s kind=%s attempt=%s failed: %s", job["id"], job["kind"], job["attempts"], exc)
+            jobs_fail(job["id"], str(exc), retry_in)
+        else:
+            jobs_complete(job["id"])
+        return True
+
+    def run_pending(self, max_jobs: Optional[int] = None) -> int:
+        """Drain runnable jobs on the calling thread (chained jobs included)."""
+        ran = 0
+        while max_jobs is None or ran < max_jobs:
+            if not self.run_one():
+                break
+            ran += 1
+        return ran
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_one():
+                    continue
+            except Exception as exc:  # noqa: BLE001
+                logging.warning("enrichment worker error: %s", exc)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._threads or self.workers <= 0:
+            return
+        self._stop.clear()
+        for n in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"enrichment-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+
+def fallback_issues(message: str) -> List[Dict]:
+    """Keyword heuristic used when the extractor returns nothing (e.g. running without an LLM key)."""
+    hits = classify(message)
+
+    # Skip issue extraction if message contains improvement/resolution markers
+    if "issue.improvement" in hits:
+        return []
+
+    category = "other"
+    # Later categories win, as with the original chain of checks
+    for name in ("performance", "medical", "nutrition", "physio"):
+        if f"issue.category.{name}" in hits:
+            category = name
+    severity = "high" if "issue.severity.high" in hits else "medium"
+    return [
+        {
+            "title": (message[:80] + ("…" if len(message) > 80 else "")),
+            "details": message[:500],
+            "category": category,
+            "severity": severity,
+        }
+    ]
+
+
+def register_enrichment_handlers(queue: EnrichmentQueue, plan_extractor, issue_extractor, issue_prioritizer):
+    """Wire the three /chat enrichment stages onto ``queue``.
+
+    Job kinds:
+    - ``plan_extraction``: suggestions from one agent reply
+    - ``issue_extraction``: issues from one member message; enqueues ``issue_triage`` per new issue
+    - ``issue_triage``: priority/time window for one issue
+    """
+
+    def plan_extraction(payload: Dict, final: bool):
+        extracted = plan_extractor.extract(payload["agent"], payload["reply"], payload.get("context"))
+        now_iso = datetime.now().isoformat()
+        suggestions_add_many(
+            [
+                {
+                    "id": _stable_id(*_message_ref(payload), n),
+                    "user_id": payload["user_id"],
+                    "agent": payload["agent"],
+                    "title": e.get("title"),
+                    "details": e.get("details"),
+                    "category": e.get("category"),
+                    "status": "proposed",
+                    "created_at": now_iso,
+                    "conversation_id": payload["conversation_id"],
+                    "message_index": payload["message_index"],
+                    "message_timestamp": payload.get("message_timestamp"),
+                    "message_id": payload.get("message_id"),
+                    "source": "llm",
+                    "origin": "agent_reply",
+                    "source_message": payload["reply"],
+                    "context_json": None,
+                }
+                for n, e in enumerate(extracted)
+            ]
+        )
+
+    def issue_extraction(payload: Dict, final: bool):
+        try:
+            issues = issue_extractor.extract(payload["message"], payload.get("context"))
+        except Exception as exc:  # noqa: BLE001
+            if not final:
+                raise
+            logging.warning("issue_extractor failed: %s", exc)
+            issues = []
+        if not issues and payload["message"]:
+            issues = fallback_issues(payload["message"])
+        if not issues:
+            return
+        now_iso = datetime.now().isoformat()
+        items = [
+            {
+                "id": _stable_id(*_message_ref(payload), n),
+                "user_id": payload["user_id"],
+                "title": it.get("title"),
+                "details": it.get("details"),
+                "category": it.get("category"),
+                "severity": it.get("severity") or "medium",
+                "status": "open",
+                "progress_percent": 0,
+                "last_reviewed_at": now_iso,
+                "conversation_id": payload["conversation_id"],
+                "message_index": payload["message_index"],
+                "message_timestamp": payload.get("message_timestamp"),
+                "message_id": payload.get("message_id"),
+                "created_at": now_iso,
+            }
+            for n, it in enumerate(issues)
+        ]
+        stored = issues_add_many(items)
+        # Repeat mentions were folded into an existing issue, which is already triaged
+        for it, stored_id in zip(items, stored):
+            if stored_id != it["id"]:
+                continue
+            queue.enqueue(
+                "issue_triage",
+                {"issue_id": it["id"], "title": it["title"] or "", "details": it["details"] or "", "context": payload.get("context")},
+                conversation_id=payload["conversation_id"],
+                message_index=payload["message_index"],
+            )
+
+    def issue_triage(payload: Dict, final: bool):
+        try:
+            triage = issue_prioritizer.prioritize(payload["title"], payload["details"], payload.get("context"))
+        except Exception:
+            if not final:
+                raise
+            triage = {"priority": "medium", "time_window": "24-72h"}
+        issues_update_priority_time(payload["issue_id"], triage.get("priority"), triage.get("time_window"))
+
+    queue.register("plan_extraction", plan_extraction)
+    queue.register("issue_extraction", issue_extraction)
+    queue.register("issue_triage", issue_triage)
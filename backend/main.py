@@ -1,20 +1,31 @@
+import json
 import os
-from typing import Dict, Optional, List
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Tuple
 
-from fastapi import FastAPI
+_IMPORT_START = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 import logging
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
-from agents.elyx_agents import AgentOrchestrator, UrgencyDetector, AGENT_ROLES
+from agents.elyx_agents import AgentOrchestrator, UrgencyDetector, AGENT_ROLES, get_agent_registry
 from agents.llm_router import LLMRouter
 from agents.experiment_engine import ExperimentEngine
+from agents.http_client import get_http_client
+from agents.llm_cache import get_llm_cache
+from agents.model_pool import get_model_pool
+from agents.prompting import prompt_stats
+from agents.rate_limiter import get_rate_limiter
 from data.suggestions import SuggestionsStore
-try:
-    from agents.crewai_orchestrator import CrewOrchestrator
-except Exception:
-    CrewOrchestrator = None  # type: ignore[assignment]
-from data.persistence import PersistenceManager
+from data.persistence import DEFAULT_CONVERSATION_ID, PersistenceManager
 from data.db import (
     init_db,
     suggestions_add_many,
@@ -32,6 +43,7 @@ from data.db import (
     episode_add_intervention,
     episode_list_interventions,
     decisions_add,
+    routing_log_list,
     decisions_list,
     decisions_get_with_why,
     experiments_add,
@@ -40,10 +52,18 @@ from data.db import (
     experiments_results,
     user_profile_get,
     user_profile_set,
+    pool_stats,
+    next_cursor,
+    jobs_list,
+    message_get,
+    MessageConflict,
 )
 from agents.issue_extractor import IssueExtractor
 from agents.plan_extractor import PlanExtractor
 from agents.issue_prioritizer import IssuePrioritizer
+from backend.enrichment import EnrichmentQueue, register_enrichment_handlers
+from backend.startup import Lazy, import_profile
+from backend.tenancy import KeyedLocks, default_conversation, resolve_member
 
 
 # Map OpenRouter -> OpenAI env for CrewAI/litellm compatibility
@@ -59,19 +79,52 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
-agent_orchestrator = AgentOrchestrator()
-persistence = PersistenceManager()
-crewai_orchestrator = CrewOrchestrator() if CrewOrchestrator else None
-router = LLMRouter()
-experiment_engine = ExperimentEngine()
-issue_extractor = IssueExtractor()
-plan_extractor = PlanExtractor()
-issue_prioritizer = IssuePrioritizer()
-init_db()
+def _make_crew_orchestrator():
+    # crewai/langchain are only imported here, on the first CrewAI reply
+    try:
+        from agents.crewai_orchestrator import CrewOrchestrator
+
+        return CrewOrchestrator()
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("CrewAI unavailable, agents reply directly: %s", exc)
+        return None
+
+
+# Built on first use so importing the app (and every reload/worker) stays cheap
+agent_orchestrator = Lazy("agent_orchestrator", AgentOrchestrator)
+persistence = Lazy("persistence", PersistenceManager)
+crewai_orchestrator = Lazy("crewai_orchestrator", _make_crew_orchestrator)
+router = Lazy("router", LLMRouter)
+experiment_engine = Lazy("experiment_engine", ExperimentEngine)
+issue_extractor = Lazy("issue_extractor", IssueExtractor)
+plan_extractor = Lazy("plan_extractor", PlanExtractor)
+issue_prioritizer = Lazy("issue_prioritizer", IssuePrioritizer)
+COMPONENTS = [
+    persistence, agent_orchestrator, crewai_orchestrator, router,
+    experiment_engine, issue_extractor, plan_extractor, issue_prioritizer,
+]
 suggestions = SuggestionsStore()
+enrichment = EnrichmentQueue(workers=int(os.getenv("ELYX_ENRICHMENT_WORKERS", "2")))
+register_enrichment_handlers(enrichment, plan_extractor, issue_extractor, issue_prioritizer)
+
+
+@app.on_event("startup")
+def _start_enrichment():
+    init_db()
+    persistence.get()  # imports legacy conversation history once
+    enrichment.start()
+    if os.getenv("ELYX_WARM_COMPONENTS", "0").strip() in {"1", "true", "True"}:
+        # Build everything off the request path so the first /chat is not the one paying
+        threading.Thread(target=lambda: [c.get() for c in COMPONENTS], name="warm-components", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def _stop_enrichment():
+    enrichment.stop()
 
 # Logging setup
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -82,6 +135,11 @@ class ChatRequest(BaseModel):
     message: str
     context: Optional[Dict] = None
     use_crewai: bool = True
+    # Member and conversation; default to the sender and that member's default conversation
+    user_id: Optional[str] = None
+    conversation_id: Optional[str] = None
+    # Optimistic concurrency: the message index the client expects this message to get (409 if stale)
+    expected_index: Optional[int] = None
 
 
 class SuggestionIn(BaseModel):
@@ -177,16 +235,75 @@ class ExperimentMeasurementIn(BaseModel):
 
 class SimulationRequest(BaseModel):
     xml_content: str
+    # Episodes simulated concurrently (default ELYX_SIM_WORKERS); same seed, same results
+    workers: Optional[int] = Field(None, ge=1, le=32)
+    mode: Optional[str] = None  # thread|process
+    seed: Optional[int] = None
+
+
+def _run_journey(source, workers: Optional[int], mode: Optional[str], seed: Optional[int]) -> Dict:
+    from xml.etree.ElementTree import ParseError
+    from simulation.complete_journey import SIM_MODES, CompleteJourney
+    from simulation.xml_parser import XMLEpisodeParser
+
+    if mode is not None and mode not in SIM_MODES:
+        raise HTTPException(status_code=400, detail=f"unknown simulation mode: {mode!r}")
+    # Checked in one streaming pass first, so a malformed file is a 400 before anything is
+    # simulated; errors raised while simulating are server errors, not bad requests
+    try:
+        XMLEpisodeParser(source).count_episodes()
+    except ParseError as exc:
+        raise HTTPException(status_code=400, detail=f"malformed journey XML: {exc}")
+    return CompleteJourney(xml_content=source, seed=seed).run(workers=workers, mode=mode)
+
 
 @app.post("/simulation/run")
 def run_simulation(req: SimulationRequest):
-    from simulation.complete_journey import CompleteJourney
+    # Bytes, so the parser never reads the content as a file path
+    return _run_journey(req.xml_content.encode("utf-8"), req.workers, req.mode, req.seed)
+
+
+# Uploaded journey files spill from memory to disk past this size
+SIM_UPLOAD_SPOOL_BYTES = int(os.getenv("ELYX_SIM_UPLOAD_SPOOL_BYTES", str(1 << 20)))
 
-    # Initialize and run the simulation
-    journey = CompleteJourney(xml_content=req.xml_content)
-    results = journey.run()
 
-    return results
+@app.post("/simulation/run/file")
+async def run_simulation_file(
+    request: Request,
+    workers: Optional[int] = Query(None, ge=1, le=32),
+    mode: Optional[str] = None,
+    seed: Optional[int] = None,
+):
+    """Runs the simulation on a journey XML file sent as the raw request body, e.g.
+    ``curl --data-binary @episodes.xml -H 'Content-Type: application/xml' .../simulation/run/file``.
+
+    The body is streamed to a spooled temp file rather than buffered as one string, and the
+    episodes are then parsed from it incrementally.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SIM_UPLOAD_SPOOL_BYTES) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        if not upload.tell():
+            raise HTTPException(status_code=400, detail="empty journey file")
+        upload.seek(0)
+        return await run_in_threadpool(_run_journey, upload, workers, mode, seed)
+
+
+# List endpoints return newest-first pages; the cursor for the next page is in X-Next-Cursor
+DEFAULT_PAGE_SIZE = int(os.getenv("ELYX_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = 500
+
+
+def _paged(response: Response, fetch, limit: int, order_col: str = "created_at", **kwargs) -> List[Dict]:
+    try:
+        items = fetch(limit=limit, **kwargs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    cursor = next_cursor(items, limit, order_col)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return items
+
 
 @app.get("/health")
 def health():
@@ -202,24 +319,135 @@ def debug_config():
     }
 
 
+@app.get("/debug/db")
+def debug_db():
+    return pool_stats()
+
+
+@app.get("/debug/http")
+def debug_http():
+    return get_http_client().stats()
+
+
+@app.get("/debug/llm_cache")
+def debug_llm_cache():
+    return get_llm_cache().stats()
+
+
+@app.get("/debug/rate_limits")
+def debug_rate_limits():
+    return get_rate_limiter().stats()
+
+
+@app.get("/debug/models")
+def debug_models():
+    return get_model_pool().stats()
+
+
+@app.get("/debug/memory")
+def debug_memory():
+    registry = get_agent_registry()
+    return {name: registry[name].memory.stats() for name in registry.built()}
+
+
+@app.get("/debug/prompts")
+def debug_prompts():
+    return prompt_stats()
+
+
+@app.get("/debug/crews")
+def debug_crews():
+    crew = crewai_orchestrator.get()
+    if crew is None:
+        return {"enabled": False}
+    return {"enabled": True, "direct": crew.direct, **crew.crews.stats()}
+
+
+@app.get("/debug/startup")
+def debug_startup(profile: bool = False, top: int = Query(15, ge=1, le=100)):
+    """Module import time, which lazy components/agents are built, and optionally a fresh
+    ``-X importtime`` profile of ``backend.main`` (runs a subprocess, ~1s)."""
+    return {
+        "import_ms": IMPORT_MS,
+        "components": {c.name: c.build_ms for c in COMPONENTS},
+        "agents_built": get_agent_registry().built(),
+        "profile": import_profile(top=top) if profile else None,
+    }
+
+
+@app.get("/debug/routing")
+def debug_routing(limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)):
+    rows = routing_log_list(limit=limit)
+    by_source: Dict[str, List[float]] = {}
+    for r in rows:
+        by_source.setdefault(r["source"], []).append(r["latency_ms"] or 0.0)
+    return {
+        "mode": ROUTER_MODE,
+        "threshold": router.fast_threshold,
+        "sources": {k: {"count": len(v), "avg_ms": round(sum(v) / len(v), 3)} for k, v in by_source.items()},
+        "recent": rows,
+    }
+
+
+def _caller_conversation(conversation_id: Optional[str], user_id: Optional[str]) -> str:
+    """The requested conversation, else the caller's default one (the legacy log without ``user_id``);
+    403 if ``user_id`` does not own the requested conversation."""
+    if conversation_id is None:
+        return default_conversation(user_id) if user_id else DEFAULT_CONVERSATION_ID
+    if user_id and persistence.conversation_owner(conversation_id) not in (None, user_id):
+        raise HTTPException(status_code=403, detail="Conversation belongs to another member")
+    return conversation_id
+
+
 @app.get("/history")
-def get_history():
-    return persistence.load_conversation_history()
+def get_history(
+    limit: Optional[int] = Query(None, ge=1),
+    conversation_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """A conversation's messages (by default the member's default conversation)."""
+    conversation_id = _caller_conversation(conversation_id, user_id)
+    if limit:
+        return persistence.tail_conversation_history(limit, conversation_id)
+    return persistence.load_conversation_history(conversation_id)
+
+
+@app.get("/conversations")
+def get_conversations(
+    response: Response,
+    user_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """A member's conversations, most recently active first (``X-Next-Cursor`` pages)."""
+    return _paged(response, persistence.list_conversations, limit, "updated_at", user_id=user_id, cursor=cursor)
+
+
+def _forget_agent_memory(member: Optional[str] = None):
+    registry = get_agent_registry()
+    for name in registry.built():
+        registry[name].memory.forget(member)
 
 
 @app.post("/reset")
-def reset_history():
-    persistence.save_conversation_history([])
-    group_chat.conversation_history = []
+def reset_history(user_id: Optional[str] = None):
+    """Clear a member's default conversation, agent memory, issues and suggestions.
+
+    Without ``user_id`` this is the legacy demo reset: the ``default`` log, every member's agent
+    memory and all issues and suggestions.
+    """
+    persistence.save_conversation_history([], _caller_conversation(None, user_id), user_id)
+    _forget_agent_memory(user_id)
     # also clear sqlite tables for suggestions and issues
     try:
-        import sqlite3
-        from data.db import DB_PATH
+        from data.db import DB_PATH, _conn
         if os.path.exists(DB_PATH):
-            with sqlite3.connect(DB_PATH) as con:
+            member_sql, member_args = (" WHERE user_id=?", (user_id,)) if user_id else ("", ())
+            with _conn() as con:
                 cur = con.cursor()
-                cur.execute("DELETE FROM suggestions")
-                cur.execute("DELETE FROM issues")
+                cur.execute(f"DELETE FROM suggestions{member_sql}", member_args)
+                cur.execute(f"DELETE FROM issues{member_sql}", member_args)
+                cur.execute(f"DELETE FROM near_dup_bands{member_sql}", member_args)
                 con.commit()
     except Exception as exc:  # noqa: BLE001
         logging.warning("db reset failed: %s", exc)
@@ -229,14 +457,15 @@ def reset_history():
 @app.post("/reset-soft")
 def api_reset_soft():
     """Reset all operational data except user profiles."""
-    import sqlite3 as _sqlite
     from fastapi import HTTPException
+    from data.db import _conn
     try:
-        con = _sqlite.connect(os.getenv("ELYX_DB_PATH", os.path.join("data", "elyx.db")))
+        con = _conn()
         cur = con.cursor()
         for table in [
             "suggestions",
             "issues",
+            "near_dup_bands",
             "episodes",
             "episode_friction",
             "episode_interventions",
@@ -248,12 +477,12 @@ def api_reset_soft():
         ]:
             cur.execute(f"DELETE FROM {table}")
         con.commit()
-        con.close()
         # Also clear conversation history file but keep profiles
         try:
             from data.persistence import PersistenceManager
             pm = PersistenceManager()
             pm.save_conversation_history([])
+            _forget_agent_memory()
         except Exception:
             pass
         return {"ok": True}
@@ -261,259 +490,336 @@ def api_reset_soft():
         raise HTTPException(status_code=500, detail=str(exc))
 
 
-@app.post("/chat")
-def chat(req: ChatRequest):
-    model_cfg = os.getenv("OPENROUTER_MODEL")
-    logging.info("/chat start use_crewai=%s model=%s msg=%s", req.use_crewai, model_cfg, req.message)
-    
-    # Load conversation history
-    conversation_history = persistence.load_conversation_history()
-    
-    # Append user message
-    conversation_history.append({
+# "keywords": AgentOrchestrator rules; "learned": FastRouter with LLM fallback below its threshold
+ROUTER_MODE = os.getenv("ELYX_ROUTER", "keywords")
+
+
+def _route(message: str, context: Optional[Dict]) -> List[str]:
+    if ROUTER_MODE == "learned":
+        agents = router.route(message, context)
+        if agents:
+            return agents
+    return agent_orchestrator.route_message(message, context)
+
+
+# Concurrent agent replies for /chat
+agent_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ELYX_AGENT_WORKERS", "8")), thread_name_prefix="agent"
+)
+
+
+def _agent_reply(agent: str, message: str, context: Optional[Dict], use_crew: bool, member: Optional[str] = None) -> str:
+    if use_crew:
+        try:
+            logging.info("crew_call agent=%s model=%s", agent, getattr(crewai_orchestrator, "model", None))
+            return crewai_orchestrator.ask(agent, message, context)
+        except Exception as exc:  # noqa: BLE001
+            # Fallback to internal BaseAgent for this specific agent
+            logging.warning("crew_failed agent=%s err=%s; falling back to direct", agent, exc)
+    else:
+        logging.info("direct_call agent=%s model=%s", agent, os.getenv("OPENROUTER_MODEL"))
+    try:
+        return agent_orchestrator.agents[agent].respond(message, context, member_id=member)
+    except Exception as exc:  # noqa: BLE001
+        return f"Error: {exc}"
+
+
+# Turns of one member run one at a time; turns of different members never wait on each other
+member_locks = KeyedLocks()
+
+
+def _tenant(req: ChatRequest) -> Tuple[str, str]:
+    """(member, conversation_id) of a chat turn; 403 if the conversation belongs to another member."""
+    member = resolve_member(req.sender, req.user_id, req.context, AGENT_ROLES)
+    conversation_id = req.conversation_id or default_conversation(member)
+    owner = persistence.conversation_owner(conversation_id)
+    if owner is not None and owner != member:
+        raise HTTPException(status_code=403, detail="Conversation belongs to another member")
+    return member, conversation_id
+
+
+def _record_member_message(req: ChatRequest, member: str, conversation_id: str):
+    """Append the incoming message and auto-close the member's issues it reports as resolved.
+
+    Returns (user_entry, user_idx, closed_count).
+    """
+    # Append user message to the conversation log
+    user_entry = {
         "sender": req.sender,
         "message": req.message,
         "timestamp": __import__("datetime").datetime.now().isoformat(),
         "context": req.context,
-    })
+    }
+    user_idx = persistence.append_conversation_message(user_entry, conversation_id, member, req.expected_index)
 
     # If user reports resolution/relief, auto-close matching open issues
     closed_count = 0
     try:
-        if req.sender.lower() == "rohan":
+        if req.sender not in AGENT_ROLES:
             # Build a compact reference to this message without duplicating content elsewhere.
-            ref = f"conv_msg_index:{len(conversation_history)-1} ts:{conversation_history[-1]['timestamp']}"
-            closed_count = issues_close_by_text(req.message, reference=ref, triggered_by="user")
+            ref = f"conv_msg_index:{user_idx} ts:{user_entry['timestamp']}"
+            closed_count = issues_close_by_text(req.message, reference=ref, triggered_by="user", user_id=member)
             if closed_count:
                 logging.info("auto-closed %s issues from user resolution message", closed_count)
     except Exception as exc:  # noqa: BLE001
         logging.warning("auto-close issues failed: %s", exc)
+    return user_entry, user_idx, closed_count
+
+
+def _enqueue_enrichment(
+    req: ChatRequest,
+    member: str,
+    conversation_id: str,
+    user_entry: Dict,
+    user_idx: int,
+    closed_count: int,
+    entries: List[Dict],
+    indexes: List[int],
+):
+    # Plan extraction happens in the background, one job per reply
+    for entry, msg_idx in zip(entries, indexes):
+        if entry["message"].startswith("Error: "):
+            continue
+        enrichment.enqueue(
+            "plan_extraction",
+            {
+                "agent": entry["sender"],
+                "reply": entry["message"],
+                "context": req.context,
+                "user_id": member,
+                "conversation_id": conversation_id,
+                "message_index": msg_idx,
+                "message_id": entry["id"],
+                "message_timestamp": entry["timestamp"],
+            },
+            conversation_id=conversation_id,
+            message_index=msg_idx,
+        )
 
-    # Route to appropriate agents
-    if req.sender == "Rohan":
-        # Use simplified orchestrator for routing
-        responding_agents = agent_orchestrator.route_message(req.message, req.context)
-        logging.info("orchestrator selected agents=%s", responding_agents)
-        if req.use_crewai and crewai_orchestrator is not None:
-            for agent in responding_agents:
-                try:
-                    logging.info("crew_call agent=%s model=%s", agent, getattr(crewai_orchestrator, "model", None))
-                    response = crewai_orchestrator.ask(agent, req.message, req.context)
-                    conversation_history.append({
-                        "sender": agent, 
-                        "message": response, 
-                        "timestamp": __import__("datetime").datetime.now().isoformat(), 
-                        "context": req.context
-                    })
-                    # Extract plans from agent response
-                    try:
-                        extracted = plan_extractor.extract(agent, response, req.context)
-                        if extracted:
-                            payload = []
-                            msg_idx = len(conversation_history) - 1
-                            msg_ts = conversation_history[-1].get("timestamp")
-                            for e in extracted:
-                                payload.append(
-                                    {
-                                        "id": os.urandom(8).hex(),
-                                        "user_id": "rohan",
-                                        "agent": agent,
-                                        "title": e.get("title"),
-                                        "details": e.get("details"),
-                                        "category": e.get("category"),
-                                        "status": "proposed",
-                                        "created_at": __import__("datetime").datetime.now().isoformat(),
-                                        "conversation_id": "default",
-                                        "message_index": msg_idx,
-                                        "message_timestamp": msg_ts,
-                                        "source": "llm",
-                                        "origin": "agent_reply",
-                                        "source_message": response,
-                                        "context_json": None,
-                                    }
-                                )
-                            suggestions_add_many(payload)
-                    except Exception as exc:  # noqa: BLE001
-                        logging.warning("plan_extractor failed: %s", exc)
-                except Exception as exc:  # noqa: BLE001
-                    # Fallback to internal BaseAgent for this specific agent
-                    try:
-                        logging.warning("crew_failed agent=%s err=%s; falling back to direct", agent, exc)
-                        fallback_response = agent_orchestrator.agents[agent].respond(req.message, req.context)
-                        conversation_history.append({
-                            "sender": agent, 
-                            "message": fallback_response, 
-                            "timestamp": __import__("datetime").datetime.now().isoformat(), 
-                            "context": req.context
-                        })
-                        try:
-                            extracted = plan_extractor.extract(agent, fallback_response, req.context)
-                            if extracted:
-                                payload = []
-                                msg_idx = len(conversation_history) - 1
-                                msg_ts = conversation_history[-1].get("timestamp")
-                                for e in extracted:
-                                    payload.append(
-                                        {
-                                            "id": os.urandom(8).hex(),
-                                            "user_id": "rohan",
-                                            "agent": agent,
-                                            "title": e.get("title"),
-                                            "details": e.get("details"),
-                                            "category": e.get("category"),
-                                            "status": "proposed",
-                                            "created_at": __import__("datetime").datetime.now().isoformat(),
-                                            "conversation_id": "default",
-                                            "message_index": msg_idx,
-                                            "message_timestamp": msg_ts,
-                                            "source": "llm",
-                                            "origin": "agent_reply",
-                                            "source_message": fallback_response,
-                                            "context_json": None,
-                                        }
-                                    )
-                                suggestions_add_many(payload)
-                        except Exception as exc2:  # noqa: BLE001
-                            logging.warning("plan_extractor failed (fallback): %s", exc2)
-                    except Exception as inner_exc:  # noqa: BLE001
-                        conversation_history.append({
-                            "sender": agent, 
-                            "message": f"Error: {inner_exc}", 
-                            "timestamp": __import__("datetime").datetime.now().isoformat(), 
-                            "context": req.context
-                        })
-        else:
-            # Use internal agent responses only for routed agents
-            for agent_name in responding_agents:
-                try:
-                    logging.info("direct_call agent=%s model=%s", agent_name, os.getenv("OPENROUTER_MODEL"))
-                    response = agent_orchestrator.agents[agent_name].respond(req.message, req.context)
-                except Exception as exc:  # noqa: BLE001
-                    response = f"Error: {exc}"
-                conversation_history.append({
-                    "sender": agent_name, 
-                    "message": response, 
-                    "timestamp": __import__("datetime").datetime.now().isoformat(), 
-                    "context": req.context
-                })
-                # Extract plans from direct path
-                try:
-                    extracted = plan_extractor.extract(agent_name, response, req.context)
-                    if extracted:
-                        payload = []
-                        msg_idx = len(conversation_history) - 1
-                        msg_ts = conversation_history[-1].get("timestamp")
-                        for e in extracted:
-                            payload.append(
-                                {
-                                    "id": os.urandom(8).hex(),
-                                    "user_id": "rohan",
-                                    "agent": agent_name,
-                                    "title": e.get("title"),
-                                    "details": e.get("details"),
-                                    "category": e.get("category"),
-                                    "status": "proposed",
-                                    "created_at": __import__("datetime").datetime.now().isoformat(),
-                                    "conversation_id": "default",
-                                    "message_index": msg_idx,
-                                    "message_timestamp": msg_ts,
-                                    "source": "llm",
-                                    "origin": "agent_reply",
-                                    "source_message": response,
-                                    "context_json": None,
-                                }
-                            )
-                        suggestions_add_many(payload)
-                except Exception as exc:  # noqa: BLE001
-                    logging.warning("plan_extractor failed (direct): %s", exc)
-
-    # Extract issues from user's message and persist with reference
-    issues = []
+    # Extract issues from user's message in the background (triage is chained behind it).
     # Skip extraction entirely if we just closed issues from a resolution/improvement message
     if closed_count == 0:
-        try:
-            issues = issue_extractor.extract(req.message, req.context)
-        except Exception as exc:  # noqa: BLE001
-            logging.warning("issue_extractor failed: %s", exc)
-            issues = []
+        enrichment.enqueue(
+            "issue_extraction",
+            {
+                "message": req.message,
+                "context": req.context,
+                "user_id": member,
+                "conversation_id": conversation_id,
+                "message_index": user_idx,
+                "message_id": user_entry["id"],
+                "message_timestamp": user_entry["timestamp"],
+            },
+            conversation_id=conversation_id,
+            message_index=user_idx,
+        )
 
-        # Fallback heuristic if extractor returns nothing (when running without LLM key)
-        if not issues and req.message:
-            msg_lower = req.message.lower()
-            
-            # Skip issue extraction if message contains improvement/resolution markers
-            improvement_markers = [
-                "feels fine", "feel fine", "feels alright", "feel alright", "feels okay", "feel okay",
-                "feels good", "feel good", "feels better", "feel better", "no more", "no longer",
-                "resolved", "better now", "getting better", "improved", "improving", "okay now",
-                "alright now", "good now", "back to normal", "gone", "pain reduced", "less pain",
-                "subsided", "cleared up", "all good", "much better"
+
+@app.post("/chat")
+def chat(req: ChatRequest):
+    model_cfg = os.getenv("OPENROUTER_MODEL")
+    logging.info("/chat start use_crewai=%s model=%s msg=%s", req.use_crewai, model_cfg, req.message)
+
+    member, conversation_id = _tenant(req)
+    with member_locks.hold(member):
+        try:
+            user_entry, user_idx, closed_count = _record_member_message(req, member, conversation_id)
+        except MessageConflict as exc:
+            raise HTTPException(status_code=409, detail={"error": str(exc), "message_index": exc.actual})
+
+        entries: List[Dict] = []
+        indexes: List[int] = []
+        # Route member messages to the appropriate agents
+        if req.sender not in AGENT_ROLES:
+            # Use simplified orchestrator for routing
+            responding_agents = _route(req.message, req.context)
+            logging.info("orchestrator selected agents=%s", responding_agents)
+            use_crew = req.use_crewai and crewai_orchestrator.get() is not None
+            # Fan out: agent replies run concurrently on the pool
+            futures = [
+                agent_pool.submit(_agent_reply, agent, req.message, req.context, use_crew, member)
+                for agent in responding_agents
             ]
-            
-            if not any(marker in msg_lower for marker in improvement_markers):
-                category = "other"
-                if any(k in msg_lower for k in ["sleep", "hrv", "recovery", "whoop", "oura", "tired", "fatigue"]):
-                    category = "performance"
-                if any(k in msg_lower for k in ["glucose", "cgm", "sugar", "insulin", "bp", "blood pressure"]):
-                    category = "medical"
-                if any(k in msg_lower for k in ["food", "diet", "meal", "protein", "carb", "nutrition"]):
-                    category = "nutrition"
-                if any(k in msg_lower for k in ["pain", "injury", "mobility", "shoulder", "back", "knee"]):
-                    category = "physio"
-                severity = "medium"
-                if any(k in msg_lower for k in ["severe", "cannot", "can't", "emergency", "chest", "bleeding"]):
-                    severity = "high"
-                issues = [
-                    {
-                        "title": (req.message[:80] + ("…" if len(req.message) > 80 else "")),
-                        "details": req.message[:500],
-                        "category": category,
-                        "severity": severity,
-                    }
-                ]
-
-    if issues:
-        payload = []
-        msg_idx = len(conversation_history) - 1
-        msg_ts = conversation_history[-1].get("timestamp") if conversation_history else None
-        now_iso = __import__("datetime").datetime.now().isoformat()
-        for it in issues:
-            # prioritize
-            try:
-                triage = issue_prioritizer.prioritize(it.get("title", ""), it.get("details", ""), req.context)
-            except Exception:
-                triage = {"priority": "medium", "time_window": "24-72h"}
-            payload.append(
+            replies = [f.result() for f in futures]
+            # Merge back in routing order so message indexes are deterministic
+            entries = [
                 {
-                    "id": os.urandom(8).hex(),
-                    "user_id": "rohan",
-                    "title": it.get("title"),
-                    "details": it.get("details"),
-                    "category": it.get("category"),
-                    "severity": it.get("severity") or "medium",
-                    "status": "open",
-                    "progress_percent": 0,
-                    "last_reviewed_at": now_iso,
-                    "priority": triage.get("priority"),
-                    "time_window": triage.get("time_window"),
-                    "conversation_id": "default",
-                    "message_index": msg_idx,
-                    "message_timestamp": msg_ts,
-                    "created_at": now_iso,
+                    "sender": agent,
+                    "message": response,
+                    "timestamp": __import__("datetime").datetime.now().isoformat(),
+                    "context": req.context,
                 }
+                for agent, response in zip(responding_agents, replies)
+            ]
+            indexes = persistence.append_conversation_messages(entries, conversation_id, member)
+
+        _enqueue_enrichment(req, member, conversation_id, user_entry, user_idx, closed_count, entries, indexes)
+    return persistence.tail_conversation_history(10, conversation_id)
+
+
+# How long /chat/stream waits for enrichment jobs before sending its final event
+STREAM_ENRICHMENT_WAIT = float(os.getenv("ELYX_STREAM_ENRICHMENT_WAIT", "30"))
+
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/chat/stream")
+def chat_stream(req: ChatRequest):
+    """Server-Sent Events variant of /chat.
+
+    Routed agents stream concurrently (direct OpenRouter streaming; CrewAI has no token stream).
+    Events:
+    - ``message``: the stored member message, with its ``message_index``
+    - ``token``: ``{"agent", "reply_to", "delta"}`` as tokens arrive
+    - ``agent_done``: ``{"agent", "message_index", "message"}`` once that reply is stored
+    - ``done``: persistence and enrichment finished; carries the last messages and job states
+    - ``error``: the turn failed unexpectedly
+    """
+    logging.info("/chat/stream start model=%s msg=%s", os.getenv("OPENROUTER_MODEL"), req.message)
+
+    member, conversation_id = _tenant(req)
+
+    def run_turn(emit):
+        # The member's turn lock covers persistence and enqueueing, not the enrichment wait below.
+        # It is held by this thread, never across a yield to the client: a slow reader only grows
+        # the event queue and cannot hold up the member's next turn.
+        with member_locks.hold(member):
+            try:
+                user_entry, user_idx, closed_count = _record_member_message(req, member, conversation_id)
+            except MessageConflict as exc:
+                emit(_sse("conflict", {"error": str(exc), "message_index": exc.actual}))
+                return
+            emit(_sse("message", {**user_entry, "message_index": user_idx}))
+
+            responding_agents: List[str] = []
+            if req.sender not in AGENT_ROLES:
+                responding_agents = _route(req.message, req.context)
+            outbox = queue.Queue()
+
+            def produce(position: int, agent: str):
+                parts: List[str] = []
+                try:
+                    agent_obj = agent_orchestrator.agents[agent]
+                    for delta in agent_obj.respond_stream(req.message, req.context, member_id=member):
+                        parts.append(delta)
+                        outbox.put(("token", position, delta))
+                    reply = "".join(parts)
+                except Exception as exc:  # noqa: BLE001
+                    reply = f"Error: {exc}"
+                outbox.put(("end", position, reply))
+
+            for position, agent in enumerate(responding_agents):
+                agent_pool.submit(produce, position, agent)
+
+            # By routing position, so an agent routed twice keeps both replies
+            replies: List[Optional[Dict]] = [None] * len(responding_agents)
+            pending = len(responding_agents)
+            while pending:
+                kind, position, text = outbox.get()
+                agent = responding_agents[position]
+                if kind == "token":
+                    emit(_sse("token", {"agent": agent, "reply_to": user_idx, "delta": text}))
+                    continue
+                pending -= 1
+                entry = {
+                    "sender": agent,
+                    "message": text,
+                    "timestamp": __import__("datetime").datetime.now().isoformat(),
+                    "context": req.context,
+                }
+                msg_idx = persistence.append_conversation_message(entry, conversation_id, member)
+                replies[position] = {"entry": entry, "index": msg_idx}
+                emit(
+                    _sse(
+                        "agent_done",
+                        {"agent": agent, "message_index": msg_idx, "message_id": entry["id"], "message": text},
+                    )
+                )
+
+            entries = [r["entry"] for r in replies]
+            indexes = [r["index"] for r in replies]
+            _enqueue_enrichment(req, member, conversation_id, user_entry, user_idx, closed_count, entries, indexes)
+
+        # Hold the final event until this turn's enrichment jobs have landed (bounded wait)
+        watched = [user_idx] + indexes
+        deadline = time.monotonic() + STREAM_ENRICHMENT_WAIT
+        while True:
+            jobs = [j for idx in watched for j in jobs_list(conversation_id, idx)]
+            if all(j["status"] not in ("queued", "running") for j in jobs) or time.monotonic() > deadline:
+                break
+            time.sleep(0.25)
+        emit(
+            _sse(
+                "done",
+                {
+                    "messages": persistence.tail_conversation_history(10, conversation_id),
+                    "jobs": [
+                        {"kind": j["kind"], "status": j["status"], "message_index": j["message_index"]} for j in jobs
+                    ],
+                },
             )
-        try:
-            issues_add_many(payload)
-        except Exception as exc:  # noqa: BLE001
-            logging.warning("issues_add_many failed: %s", exc)
+        )
 
-    persistence.save_conversation_history(conversation_history)
-    return conversation_history[-10:]
+    def events():
+        # The turn runs to completion on its own thread even if the client stops reading
+        out: queue.Queue = queue.Queue()
+
+        def worker():
+            try:
+                run_turn(out.put)
+            except Exception as exc:  # noqa: BLE001
+                logging.exception("/chat/stream turn failed")
+                out.put(_sse("error", {"error": str(exc)}))
+            finally:
+                out.put(None)
+
+        threading.Thread(target=worker, name="chat-stream", daemon=True).start()
+        while True:
+            event = out.get()
+            if event is None:
+                return
+            yield event
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/jobs")
+def get_jobs(
+    conversation_id: Optional[str] = None,
+    message_index: Optional[int] = None,
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """Enrichment jobs (plan/issue extraction, triage) of a conversation (by default the member's
+    default conversation); ``pending`` is 0 once results have landed."""
+    jobs = jobs_list(_caller_conversation(conversation_id, user_id), message_index, status)
+    return {
+        "jobs": [
+            {k: j.get(k) for k in ("id", "kind", "status", "attempts", "last_error", "message_index", "updated_at")}
+            for j in jobs
+        ],
+        "pending": sum(1 for j in jobs if j["status"] in ("queued", "running")),
+    }
 
 
 @app.get("/suggestions")
-def get_suggestions():
-    return suggestions_list()
+def get_suggestions(
+    response: Response,
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return _paged(
+        response, suggestions_list, limit, user_id=user_id, status=status, category=category, cursor=cursor
+    )
 
 
 class StatusUpdate(BaseModel):
@@ -580,8 +886,25 @@ def set_suggestion_status(item_id: str, status: str):
 
 
 @app.get("/issues")
-def get_issues():
-    return issues_list()
+def get_issues(
+    response: Response,
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return _paged(
+        response,
+        issues_list,
+        limit,
+        user_id=user_id,
+        status=status,
+        category=category,
+        priority=priority,
+        cursor=cursor,
+    )
 
 
 class IssuePriorityIn(BaseModel):
@@ -670,15 +993,26 @@ def set_model(req: ModelSetRequest):
     provider = os.getenv("OPENROUTER_PROVIDER", "")
     os.environ["OPENROUTER_MODEL"] = req.model
     os.environ["OPENAI_MODEL_NAME"] = req.model
-    if crewai_orchestrator is not None:
-        crewai_orchestrator.model = req.model
+    # An unbuilt CrewOrchestrator picks the model up from the environment when it is created
+    crew = crewai_orchestrator.get() if crewai_orchestrator.built else None
+    if crew is not None:
+        crew.model = req.model
     return {"ok": True, "model": req.model, "provider": provider or None}
 
 
 # Episodes API
 @app.get("/episodes")
-def api_episodes_list():
-    return episodes_list()
+def api_episodes_list(
+    response: Response,
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return _paged(
+        response, episodes_list, limit, user_id=user_id, status=status, priority=priority, cursor=cursor
+    )
 
 
 @app.post("/episodes")
@@ -728,8 +1062,12 @@ def api_episodes_list_interventions(episode_id: str):
 
 # Decisions API
 @app.get("/decisions")
-def api_decisions_list():
-    return decisions_list()
+def api_decisions_list(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return _paged(response, decisions_list, limit, order_col="timestamp", cursor=cursor)
 
 
 @app.post("/decisions")
@@ -754,16 +1092,23 @@ def api_decisions_create(dec: DecisionIn):
         }
         for ev in (dec.evidence or [])
     ]
-    messages_payload = [
-        {
+    messages_payload = []
+    for m in dec.messages or []:
+        link = {
             "id": os.urandom(8).hex(),
             "decision_id": decision_id,
             "message_id": m.message_id,
             "message_index": m.message_index,
             "message_timestamp": m.message_timestamp,
         }
-        for m in (dec.messages or [])
-    ]
+        if m.message_id:
+            # Stable ids outlive index reuse; index/timestamp are filled in from the message itself
+            msg = message_get(m.message_id)
+            if msg is None:
+                raise HTTPException(status_code=400, detail=f"Unknown message_id {m.message_id}")
+            link["message_index"] = msg["message_index"]
+            link["message_timestamp"] = msg["timestamp"]
+        messages_payload.append(link)
     decisions_add(dec_payload, evidence_payload, messages_payload)
     return {"ok": True, "id": decision_id}
 
@@ -775,8 +1120,14 @@ def api_decisions_why(decision_id: str):
 
 # Experiments API
 @app.get("/experiments")
-def api_experiments_list():
-    return experiments_list()
+def api_experiments_list(
+    response: Response,
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return _paged(response, experiments_list, limit, user_id=user_id, status=status, cursor=cursor)
 
 
 @app.post("/experiments")
@@ -950,15 +1301,15 @@ def api_generate_mock_data():
             )
             
         # Add messages to conversation history
-        conversation_history = persistence.load_conversation_history()
-        for msg in mock_messages:
-            conversation_history.append({
+        persistence.append_conversation_messages([
+            {
                 "sender": msg["sender"],
                 "message": msg["message"], 
                 "timestamp": msg["timestamp"],
                 "context": None
-            })
-        persistence.save_conversation_history(conversation_history)
+            }
+            for msg in mock_messages
+        ])
         
         # Add some mock suggestions
         mock_suggestions = [
@@ -1021,3 +1372,5 @@ def api_generate_mock_data():
         logging.error(f"Error generating mock data: {e}")
         return {"success": False, "error": str(e)}
 
+
+IMPORT_MS = round((time.perf_counter() - _IMPORT_START) * 1000, 1)
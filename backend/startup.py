@@ -0,0 +1,96 @@
+"""Deferred construction of backend components and an import-time profile for startup tracking.
+
+``backend.main`` wraps its heavyweight singletons (agents, router, extractors, CrewAI) in ``Lazy``
+so importing the app, a ``--reload`` cycle or a new uvicorn worker only pays for what a request
+actually touches. ``import_profile`` runs ``python -X importtime`` in a subprocess and summarizes
+where import time goes; ``/debug/startup`` and ``benchmarks/bench_import_time.py`` report it.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class Lazy(Generic[T]):
+    """Builds ``factory()`` on first attribute access (thread-safe) and forwards attributes to it."""
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+        self.build_ms: Optional[float] = None
+
+    @property
+    def built(self) -> bool:
+        return self.build_ms is not None
+
+    def get(self) -> T:
+        if self.build_ms is None:
+            with self._lock:
+                if self.build_ms is None:
+                    start = time.perf_counter()
+                    self._value = self._factory()
+                    self.build_ms = round((time.perf_counter() - start) * 1000, 2)
+        return self._value  # type: ignore[return-value]
+
+    def __getattr__(self, attr: str):
+        return getattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        return f"Lazy({self.name}, built={self.built})"
+
+
+def import_profile(module: str = "backend.main", top: int = 15, cwd: Optional[str] = None) -> Dict:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns the total import time, the ``top`` slowest modules by cumulative time (microseconds,
+    as reported by CPython) and the slowest top-level packages by self time.
+    """
+    root = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    rows: List[Dict] = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            rows.append(
+                {
+                    "module": m.group(4),
+                    "self_us": int(m.group(1)),
+                    "cumulative_us": int(m.group(2)),
+                    "depth": (len(m.group(3)) - 1) // 2,
+                }
+            )
+    packages: Dict[str, int] = {}
+    for r in rows:
+        top_level = r["module"].split(".")[0]
+        packages[top_level] = packages.get(top_level, 0) + r["self_us"]
+    target = next((r for r in rows if r["module"] == module), None)
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "error": None if proc.returncode == 0 else proc.stderr.strip().splitlines()[-1:],
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(target["cumulative_us"] / 1000, 1) if target else None,
+        "modules": len(rows),
+        "slowest": sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top],
+        "packages": sorted(
+            ({"package": k, "self_us": v} for k, v in packages.items()), key=lambda p: p["self_us"], reverse=True
+        )[:top],
+    }
@@ -0,0 +1,56 @@
+"""Member and conversation resolution for chat requests, and per-member turn locks.
+
+Every chat turn belongs to one member (``user_id``) and one conversation owned by that member.
+Turns of the same member are serialized so their message indexes, agent memory and issue updates
+never interleave; turns of different members take different locks and never wait on each other.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from data.db import LEGACY_USER_ID
+from data.persistence import default_conversation  # noqa: F401  # re-exported for backend.main
+
+
+class KeyedLocks:
+    """One lock per key, created on demand and dropped once nobody holds or waits for it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks: Dict[str, list] = {}  # key -> [lock, holders + waiters]
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._locks)
+
+
+def resolve_member(
+    sender: str, user_id: Optional[str], context: Optional[Dict], agent_names=()
+) -> str:
+    """The member a turn belongs to: explicit ``user_id``, then the context, then the sender.
+
+    Messages sent by an agent without any member hint belong to the legacy demo member.
+    """
+    context = context or {}
+    member = user_id or context.get("member_id") or context.get("user_id")
+    if member:
+        return str(member)
+    if sender in agent_names:
+        return LEGACY_USER_ID
+    return sender.strip().lower() or LEGACY_USER_ID
@@ -0,0 +1,82 @@
+"""Load test: a synthetic cohort of members simulated through their weekly journeys concurrently.
+
+By default every LLM call goes over HTTP to a local stub (``simulation.llm_stub``) that answers
+after ``--stub-latency-ms``, so the connection pool, rate limiter and model pool are exercised
+without a provider; ``--mock`` uses the in-process mock replies instead (no HTTP, 0 LLM calls).
+The response cache and the request rate limit are disabled so every turn reaches the model.
+Writes go to a throwaway database unless ``--db`` is given.
+
+Usage:
+    python -m benchmarks.bench_cohort [--members 100] [--weeks 34] [--workers 16] [--stub-latency-ms 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=100)
+    parser.add_argument("--weeks", type=int, default=34)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub-latency-ms", type=float, default=50.0)
+    parser.add_argument("--mock", action="store_true", help="in-process mock replies instead of the HTTP stub")
+    parser.add_argument("--no-persist", action="store_true", help="skip writing conversations to the database")
+    parser.add_argument("--db", default=None, help="database path (default: a temporary file)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the simulation's per-message output")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["ELYX_DB_PATH"] = args.db or os.path.join(tmp.name, "elyx.db")
+    os.environ["ELYX_LLM_CACHE"] = "0"
+    os.environ["ELYX_LLM_RPM"] = "0"
+
+    from data.db import init_db
+    from simulation.cohort import generate_members, run_cohort
+    from simulation.llm_stub import LLMStub
+
+    init_db()
+    members = generate_members(args.members, args.seed)
+    quiet = StringIO() if not args.verbose else sys.stdout
+    run = dict(weeks=args.weeks, workers=args.workers, seed=args.seed, persist=not args.no_persist)
+
+    def measure():
+        with redirect_stdout(quiet):
+            # One throwaway member-week first, so router training and agent construction are not timed
+            run_cohort(generate_members(1, args.seed + 1), weeks=1, workers=1, persist=False)
+            return run_cohort(members, **run)
+
+    if args.mock:
+        os.environ["USE_MOCK_RESPONSES"] = "1"
+        report = measure()
+        report["llm"] = "mock"
+    else:
+        os.environ["USE_MOCK_RESPONSES"] = "0"
+        os.environ.setdefault("OPENROUTER_API_KEY", "stub")
+        with LLMStub(latency_ms=args.stub_latency_ms) as stub:
+            os.environ["OPENROUTER_BASE_URL"] = stub.url
+            report = measure()
+        report["llm"] = f"stub ({args.stub_latency_ms:g} ms)"
+    tmp.cleanup()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['members']} members x {report['weeks']} weeks on {report['workers']} workers, llm: {report['llm']}")
+    print(f"wall {report['wall_s']} s, {report['member_weeks']} member-weeks, {report['messages']} messages, "
+          f"{report['errors']} failed weeks")
+    print(f"members/s     {report['members_per_s']:>10}")
+    print(f"LLM calls/s   {report['llm_calls_per_s']:>10}   ({report['llm_calls']} calls)")
+    print(f"DB writes/s   {report['db_writes_per_s']:>10}   ({report['db_writes']} rows)")
+    print(f"week latency  p50 {report['week_p50_ms']} ms   p99 {report['week_p99_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
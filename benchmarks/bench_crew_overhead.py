@@ -0,0 +1,78 @@
+"""Per-call overhead of CrewAI crews (fresh vs pooled) against the direct BaseAgent path.
+
+Offline (default) it times only what happens around the model call: building an Agent/Task/Crew
+per message versus borrowing a warm crew from the pool and resetting it afterwards. ``--live``
+also sends the same prompt through a fresh crew, a pooled crew and the direct path (needs OPENROUTER_API_KEY and the
+OpenAI-compatible env the orchestrator uses; the response cache is bypassed) so the difference
+between the crew and direct timings is CrewAI's share of a turn.
+
+Usage:
+    python -m benchmarks.bench_crew_overhead [--iterations 50] [--agent Carla] [--live]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+
+def _time(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--agent", default="Carla")
+    parser.add_argument("--message", default="My glucose spikes after dinner, what should I change?")
+    parser.add_argument("--live", action="store_true", help="include real model calls")
+    args = parser.parse_args()
+
+    from agents import crewai_orchestrator as co
+
+    if not co.load_crewai():
+        print("crewai / langchain_openai not installed; nothing to compare")
+        return
+    orch = co.CrewOrchestrator()
+    model = co.get_model_pool().primary()
+
+    def borrow():
+        # What a pooled turn pays around kickoff: the borrow plus the task reset
+        with orch.crews.borrow(args.agent, model) as crew:
+            orch._reset_crew(crew)
+
+    rows = {
+        "crew setup (fresh)": _time(lambda: orch._build_crew(args.agent, model), args.iterations),
+        "crew setup (pooled)": _time(borrow, args.iterations),
+    }
+    if args.live:
+        def fresh_call():
+            crew = orch._build_crew(args.agent, model)
+            return crew.kickoff(inputs={"request": args.message})
+
+        agent = orch._direct_agent(args.agent)
+        messages = agent._build_messages(args.message)
+        live = max(1, min(args.iterations, 5))
+        rows["crew call (fresh)"] = _time(fresh_call, live)
+        rows["crew call (pooled)"] = _time(lambda: orch._kickoff(args.agent, args.message, model), live)
+        rows["direct call"] = _time(lambda: agent.call_openrouter(messages, use_cache=False), live)
+
+    for name, row in rows.items():
+        print(f"{name:<22} p50 {row['p50_ms']:>10.3f} ms   p95 {row['p95_ms']:>10.3f} ms")
+    if args.live:
+        overhead = rows["crew call (pooled)"]["p50_ms"] - rows["direct call"]["p50_ms"]
+        print(f"crew overhead vs direct (pooled, p50): {overhead:.1f} ms per call")
+    print(f"pool: {orch.crews.stats()}")
+
+
+if __name__ == "__main__":
+    main()
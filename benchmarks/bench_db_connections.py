@@ -0,0 +1,71 @@
+"""Compare the pooled connection manager in data/db.py against opening a connection per call.
+
+Usage:
+    python -m benchmarks.bench_db_connections [--iterations 2000]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+
+def _open_per_call(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return sqlite3.connect(path)
+
+
+def _workload(get_conn, iterations: int) -> float:
+    """A /chat-shaped mix: one insert, one list read and one point update per iteration."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        item_id = f"bench-{i}"
+        with get_conn() as con:
+            con.execute(
+                "INSERT OR IGNORE INTO issues (id, user_id, title, details, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (item_id, "rohan", f"issue {i}", "knee pain after run", "open", datetime.now().isoformat()),
+            )
+            con.commit()
+        with get_conn() as con:
+            con.execute("SELECT id, title FROM issues WHERE status!='resolved' LIMIT 20").fetchall()
+        with get_conn() as con:
+            con.execute("UPDATE issues SET progress_percent=? WHERE id=?", (i % 100, item_id))
+            con.commit()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from data import db
+
+        # Open-per-call baseline on its own file so WAL mode does not leak into it
+        db.DB_PATH = os.path.join(tmp, "baseline", "elyx.db")
+        db.init_db()
+        db.close_connections()
+        baseline_path = db.DB_PATH
+        with sqlite3.connect(baseline_path) as con:
+            con.execute("PRAGMA journal_mode=DELETE")
+        baseline = _workload(lambda: _open_per_call(baseline_path), args.iterations)
+
+        db.DB_PATH = os.path.join(tmp, "pooled", "elyx.db")
+        db.init_db()
+        pooled = _workload(db._conn, args.iterations)
+        stats = db.pool_stats()
+        db.close_connections()
+
+    ops = args.iterations * 3
+    print(f"iterations={args.iterations} ops={ops}")
+    print(f"open-per-call: {baseline:.3f}s  ({baseline / ops * 1e6:.1f} us/op)")
+    print(f"pooled (WAL):  {pooled:.3f}s  ({pooled / ops * 1e6:.1f} us/op)")
+    print(f"speedup: {baseline / pooled:.1f}x")
+    print(f"pool stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
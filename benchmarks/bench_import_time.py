@@ -0,0 +1,49 @@
+"""Import-time profile of the backend (``python -X importtime``), for tracking startup regressions.
+
+Prints the total import time of the module, its slowest imports by cumulative time and the
+packages that cost the most self time. ``--max-ms`` exits non-zero when the import is slower than
+the budget; ``--json`` prints the raw report.
+
+Usage:
+    python -m benchmarks.bench_import_time [--module backend.main] [--top 15] [--max-ms 800] [--json]
+"""
+
+import argparse
+import json
+import sys
+
+from backend.startup import import_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3, help="best of N (first run also warms the disk cache)")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the import takes longer")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    reports = [import_profile(args.module, top=args.top) for _ in range(max(1, args.runs))]
+    failed = next((r for r in reports if not r["ok"]), None)
+    if failed:
+        print(f"import of {args.module} failed: {failed['error']}")
+        sys.exit(2)
+    report = min(reports, key=lambda r: r["import_ms"])
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{args.module}: {report['import_ms']:.1f} ms import, {report['modules']} modules (best of {len(reports)})")
+        print("slowest imports (cumulative):")
+        for r in report["slowest"]:
+            print(f"  {r['cumulative_us'] / 1000:>9.1f} ms  {'  ' * r['depth']}{r['module']}")
+        print("packages (self time):")
+        for p in report["packages"]:
+            print(f"  {p['self_us'] / 1000:>9.1f} ms  {p['package']}")
+    if args.max_ms is not None and report["import_ms"] > args.max_ms:
+        print(f"import budget exceeded: {report['import_ms']:.1f} ms > {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Routing latency/accuracy report: local FastRouter vs the LLM router.
+
+Reference labels are the LLM decisions stored in ``routing_log``. When there are none yet (fresh
+database, no API key), the episodes.xml messages that address an agent by name are used instead,
+evaluated leave-one-out so the fast router never sees the message it is scored on. ``--live``
+asks the LLM router to label every episodes.xml member message first (needs OPENROUTER_API_KEY).
+
+Usage:
+    python -m benchmarks.bench_routing [--threshold 0.6] [--live]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from agents.fast_router import LOG_EXAMPLES, FastRouter, Example, episode_examples, logged_examples, seed_examples
+
+
+def _pct(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _live_labels(path: str) -> List[Example]:
+    import xml.etree.ElementTree as ET
+
+    from agents.llm_router import LLMRouter
+
+    router = LLMRouter()
+    router.use_fast = False
+    examples = []
+    for message in ET.parse(path).getroot().iter("message"):
+        if message.get("sender") == "Rohan" and message.text:
+            agents = router.route(message.text)
+            if agents:
+                examples.append((message.text, agents))
+    return examples
+
+
+def evaluate(examples: List[Example], threshold: float, leave_one_out: bool) -> Dict:
+    seeds = seed_examples()
+    shared = None if leave_one_out else FastRouter().train(seeds + examples)
+    latencies: List[float] = []
+    rows: List[Tuple[bool, bool]] = []  # (covered, correct)
+    for i, (text, labels) in enumerate(examples):
+        fast = shared or FastRouter().train(seeds + examples[:i] + examples[i + 1:])
+        start = time.perf_counter()
+        agents, confidence = fast.route(text)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        rows.append((confidence >= threshold, agents[0] in labels))
+    covered = [correct for is_covered, correct in rows if is_covered]
+    return {
+        "examples": len(rows),
+        "fast_p50_us": round(_pct(latencies, 0.5), 1),
+        "fast_p95_us": round(_pct(latencies, 0.95), 1),
+        "fast_accuracy": round(sum(c for _, c in rows) / len(rows), 3) if rows else 0.0,
+        "coverage": round(len(covered) / len(rows), 3) if rows else 0.0,
+        "accuracy_when_confident": round(sum(covered) / len(covered), 3) if covered else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--episodes", default="episodes.xml")
+    parser.add_argument("--live", action="store_true", help="label episodes.xml with the LLM router first")
+    args = parser.parse_args()
+
+    from data.db import init_db, routing_log_list
+
+    init_db()
+    if args.live:
+        _live_labels(args.episodes)
+    examples = logged_examples(limit=LOG_EXAMPLES)
+    leave_one_out = False
+    source = "routing_log (LLM decisions)"
+    if not examples:
+        examples = episode_examples(args.episodes)
+        leave_one_out = True
+        source = "episodes.xml addressed messages (leave-one-out)"
+    report = evaluate(examples, args.threshold, leave_one_out)
+
+    llm_ms = [r["latency_ms"] for r in routing_log_list(source="llm", limit=LOG_EXAMPLES) if r["latency_ms"]]
+    print(f"reference: {source}")
+    print(f"examples: {report['examples']}  threshold: {args.threshold}")
+    print(f"fast path    p50 {report['fast_p50_us']:>10.1f} us   p95 {report['fast_p95_us']:>10.1f} us")
+    if llm_ms:
+        llm_p50 = statistics.median(llm_ms)
+        print(f"llm path     p50 {llm_p50 * 1000:>10.1f} us   p95 {_pct(llm_ms, 0.95) * 1000:>10.1f} us  (n={len(llm_ms)})")
+        blended = report["coverage"] * report["fast_p50_us"] / 1000 + (1 - report["coverage"]) * llm_p50
+        print(f"hybrid expected mean ~{blended:.1f} ms per message")
+    else:
+        print("llm path     no logged LLM decisions yet (run with --live and OPENROUTER_API_KEY set)")
+    print(f"fast accuracy (all): {report['fast_accuracy']:.1%}")
+    print(f"coverage above threshold: {report['coverage']:.1%}, accuracy there: {report['accuracy_when_confident']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,240 +1,830 @@
+import base64
+import json
 import os
+import re
 import sqlite3
-from typing import List, Dict, Optional
+import threading
+import weakref
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+
+from data.keywords import classify, hit_categories
+from data.near_dup import band_keys, jaccard, tokens
 
 
 DB_PATH = os.getenv("ELYX_DB_PATH", os.path.join("data", "elyx.db"))
 
+# Per-connection tuning, applied once when a connection is opened
+DB_BUSY_TIMEOUT_MS = int(os.getenv("ELYX_DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.getenv("ELYX_DB_CACHE_SIZE_KB", "65536"))
+DB_MMAP_SIZE = int(os.getenv("ELYX_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+
+class _ThreadToken:
+    """Kept in the owning thread's local storage only, so it is collected when that thread exits."""
+
+
+class ConnectionManager:
+    """Hands out one long-lived SQLite connection per thread (and per process).
+
+    Connections are opened lazily, tuned once (WAL, synchronous=NORMAL, cache/mmap sizing,
+    busy timeout) and then reused for every query issued from the same thread, so the
+    statement cache stays warm and no query pays for a fresh open. A connection is closed when
+    its thread exits, so short-lived worker threads do not leave connections behind.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "reused": 0, "closed": 0}
+        self._open: Dict[int, sqlite3.Connection] = {}
+
+    def _configure(self, con: sqlite3.Connection):
+        con.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+        con.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        con.execute("PRAGMA temp_store=MEMORY")
+
+    def get(self, path: str) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        # Reopen after a fork (uvicorn workers) or when DB_PATH was repointed
+        if con is not None and self._local.key == (os.getpid(), path):
+            with self._lock:
+                self._stats["reused"] += 1
+            return con
+        if con is not None:
+            self.close_current()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        con = sqlite3.connect(path, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self._configure(con)
+        with self._lock:
+            self._stats["opened"] += 1
+            self._open[id(con)] = con
+        self._local.con = con
+        self._local.key = (os.getpid(), path)
+        self._local.token = token = _ThreadToken()
+        # Runs when the thread's locals are dropped at exit, or from close_current()
+        self._local.release = weakref.finalize(token, self._release, con)
+        return con
+
+    def _release(self, con: sqlite3.Connection):
+        with self._lock:
+            if self._open.get(id(con)) is not con:
+                return  # already closed by close_all()
+            del self._open[id(con)]
+            self._stats["closed"] += 1
+        try:
+            con.close()
+        except Exception:
+            pass
+
+    def close_current(self):
+        if getattr(self._local, "con", None) is None:
+            return
+        self._local.con = None
+        self._local.release()
+
+    def close_all(self):
+        """Close every connection handed out by this manager (e.g. on shutdown or reset)."""
+        with self._lock:
+            cons = list(self._open.values())
+            self._open.clear()
+            self._stats["closed"] += len(cons)
+        self._local = threading.local()
+        for con in cons:
+            try:
+                con.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "open": len(self._open), "path": DB_PATH}
+
+
+_manager = ConnectionManager()
+
 
 def _conn():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    return _manager.get(DB_PATH)
 
 
-def init_db():
-    with _conn() as con:
-        cur = con.cursor()
+def pool_stats() -> Dict:
+    """Connection manager counters: connections opened/reused/closed and currently open."""
+    return _manager.stats()
+
+
+def db_write_count() -> int:
+    """Rows changed so far on this thread's connection; diff two readings to count a task's writes."""
+    return _conn().total_changes
+
+
+def close_connections():
+    _manager.close_all()
+
+
+def _migrate_001_base_schema(cur: sqlite3.Cursor):
+    """Base tables; also patches columns onto databases created before versioning existed."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS suggestions (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            agent TEXT,
+            title TEXT,
+            details TEXT,
+            category TEXT,
+            status TEXT,
+            created_at TEXT,
+            conversation_id TEXT,
+            message_index INTEGER,
+            message_timestamp TEXT,
+            source TEXT,
+            origin TEXT,
+            source_message TEXT,
+            context_json TEXT
+        );
+        """
+    )
+    # Ensure columns exist for upgrades
+    cols = {r[1] for r in cur.execute("PRAGMA table_info(suggestions)").fetchall()}
+    def ensure(col: str, ddl: str):
+        if col not in cols:
+            cur.execute(f"ALTER TABLE suggestions ADD COLUMN {ddl}")
+    ensure("conversation_id", "conversation_id TEXT")
+    ensure("message_index", "message_index INTEGER")
+    ensure("message_timestamp", "message_timestamp TEXT")
+    ensure("source", "source TEXT")
+    ensure("origin", "origin TEXT")
+    ensure("source_message", "source_message TEXT")
+    ensure("context_json", "context_json TEXT")
+
+    # User profiles
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            user_id TEXT PRIMARY KEY,
+            profile_json TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        );
+        """
+    )
+    # Issues table
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS issues (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            title TEXT,
+            details TEXT,
+            category TEXT,
+            severity TEXT,
+            conversation_id TEXT,
+            message_index INTEGER,
+            message_timestamp TEXT,
+            created_at TEXT
+        );
+        """
+    )
+    # Ensure columns exist for upgrades (older DBs may miss these)
+    issue_cols = {r[1] for r in cur.execute("PRAGMA table_info(issues)").fetchall()}
+    def ensure_issue(col: str, ddl: str):
+        if col not in issue_cols:
+            cur.execute(f"ALTER TABLE issues ADD COLUMN {ddl}")
+    ensure_issue("status", "status TEXT")
+    ensure_issue("progress_percent", "progress_percent INTEGER")
+    ensure_issue("last_reviewed_at", "last_reviewed_at TEXT")
+    ensure_issue("priority", "priority TEXT")
+    ensure_issue("time_window", "time_window TEXT")
+    ensure_issue("resolve_trigger_reference", "resolve_trigger_reference TEXT")
+    ensure_issue("triggered_by", "triggered_by TEXT")
+    # Episodes and related tables
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS episodes (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            title TEXT,
+            trigger_type TEXT,
+            trigger_description TEXT,
+            trigger_timestamp TEXT,
+            status TEXT,
+            priority INTEGER,
+            member_state_before TEXT,
+            member_state_after TEXT,
+            confidence REAL,
+            created_at TEXT
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS episode_friction (
+            id TEXT PRIMARY KEY,
+            episode_id TEXT,
+            category TEXT,
+            description TEXT,
+            severity INTEGER,
+            resolution_action TEXT
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS episode_interventions (
+            id TEXT PRIMARY KEY,
+            episode_id TEXT,
+            action TEXT,
+            responsible_agent TEXT,
+            timestamp TEXT,
+            outcome TEXT
+        );
+        """
+    )
+    # Decisions and evidence
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS decisions (
+            id TEXT PRIMARY KEY,
+            type TEXT,
+            content TEXT,
+            timestamp TEXT,
+            responsible_agent TEXT,
+            rationale TEXT
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS decision_evidence (
+            id TEXT PRIMARY KEY,
+            decision_id TEXT,
+            evidence_type TEXT,
+            source TEXT,
+            data_json TEXT,
+            timestamp TEXT
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS decision_messages (
+            id TEXT PRIMARY KEY,
+            decision_id TEXT,
+            message_id TEXT,
+            message_index INTEGER,
+            message_timestamp TEXT
+        );
+        """
+    )
+    # Experiments
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS experiments (
+            id TEXT PRIMARY KEY,
+            template TEXT,
+            hypothesis TEXT,
+            protocol_json TEXT,
+            duration TEXT,
+            member_id TEXT,
+            status TEXT,
+            outcome TEXT,
+            success INTEGER,
+            created_at TEXT
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS experiment_measurements (
+            id TEXT PRIMARY KEY,
+            experiment_id TEXT,
+            name TEXT,
+            value REAL,
+            ts TEXT,
+            raw_json TEXT
+        );
+        """
+    )
+
+
+def _migrate_002_secondary_indexes(cur: sqlite3.Cursor):
+    """Indexes backing the list, lookup and open-issue queries below."""
+    statements = [
+        # List endpoints: ORDER BY created_at DESC (optionally per member)
+        "CREATE INDEX IF NOT EXISTS idx_suggestions_created ON suggestions(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_suggestions_user_created ON suggestions(user_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_created ON issues(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_user_created ON issues(user_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_episodes_created ON episodes(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_episodes_user_created ON episodes(user_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions(timestamp, id)",
+        "CREATE INDEX IF NOT EXISTS idx_experiments_created ON experiments(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_experiments_member_created ON experiments(member_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_experiments_status ON experiments(status, success)",
+        # Open issues scanned by issues_close_by_text (partial index matches its WHERE clause)
+        "CREATE INDEX IF NOT EXISTS idx_issues_open ON issues(user_id, created_at) "
+        "WHERE status IS NULL OR status!='resolved'",
+        # Child-table lookups by parent id
+        "CREATE INDEX IF NOT EXISTS idx_episode_friction_episode ON episode_friction(episode_id)",
+        "CREATE INDEX IF NOT EXISTS idx_episode_interventions_episode ON episode_interventions(episode_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_decision_evidence_decision ON decision_evidence(decision_id)",
+        "CREATE INDEX IF NOT EXISTS idx_decision_messages_decision ON decision_messages(decision_id)",
+        "CREATE INDEX IF NOT EXISTS idx_experiment_measurements_experiment ON experiment_measurements(experiment_id, ts)",
+    ]
+    for sql in statements:
+        cur.execute(sql)
+
+
+def _migrate_003_messages(cur: sqlite3.Cursor):
+    """Append-only conversation log replacing the rewrite-whole-file JSON history."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            conversation_id TEXT NOT NULL,
+            message_index INTEGER NOT NULL,
+            sender TEXT,
+            message TEXT,
+            timestamp TEXT,
+            context_json TEXT,
+            UNIQUE (conversation_id, message_index)
+        );
+        """
+    )
+
+
+def _migrate_004_issues_fts(cur: sqlite3.Cursor):
+    """Full-text index over issue title/details/category, kept in sync by triggers."""
+    try:
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS suggestions (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                agent TEXT,
-                title TEXT,
-                details TEXT,
-                category TEXT,
-                status TEXT,
-                created_at TEXT,
-                conversation_id TEXT,
-                message_index INTEGER,
-                message_timestamp TEXT,
-                source TEXT,
-                origin TEXT,
-                source_message TEXT,
-                context_json TEXT
+            CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+                title, details, category,
+                content='issues', content_rowid='rowid', tokenize='porter unicode61'
             );
             """
         )
-        # Ensure columns exist for upgrades
-        cols = {r[1] for r in cur.execute("PRAGMA table_info(suggestions)").fetchall()}
-        def ensure(col: str, ddl: str):
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: issues_close_by_text falls back to scanning open issues
+        return
+    # Individual statements (not executescript, which would commit the migration transaction)
+    triggers = [
+        """
+        CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN
+            INSERT INTO issues_fts(rowid, title, details, category)
+            VALUES (new.rowid, new.title, new.details, new.category);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN
+            INSERT INTO issues_fts(issues_fts, rowid, title, details, category)
+            VALUES ('delete', old.rowid, old.title, old.details, old.category);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, details, category ON issues BEGIN
+            INSERT INTO issues_fts(issues_fts, rowid, title, details, category)
+            VALUES ('delete', old.rowid, old.title, old.details, old.category);
+            INSERT INTO issues_fts(rowid, title, details, category)
+            VALUES (new.rowid, new.title, new.details, new.category);
+        END
+        """,
+    ]
+    for sql in triggers:
+        cur.execute(sql)
+    cur.execute("INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')")
+
+
+def _migrate_005_jobs(cur: sqlite3.Cursor):
+    """Durable queue for background enrichment jobs (see backend/enrichment.py)."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload_json TEXT,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            last_error TEXT,
+            conversation_id TEXT,
+            message_index INTEGER,
+            run_after TEXT,
+            lease_until TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs(status, run_after)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_message ON jobs(conversation_id, message_index)")
+
+
+def _migrate_006_llm_cache(cur: sqlite3.Cursor):
+    """Disk tier of the LLM response cache (see agents/llm_cache.py). Times are epoch seconds."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL,
+            last_used_at REAL NOT NULL
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)")
+
+
+def _migrate_007_routing_log(cur: sqlite3.Cursor):
+    """Routing decisions (LLM and fast path), training data for agents/fast_router.py."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS routing_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message TEXT NOT NULL,
+            agents_json TEXT,
+            source TEXT NOT NULL,
+            confidence REAL,
+            latency_ms REAL,
+            created_at TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_routing_log_source ON routing_log(source, id)")
+
+
+def _migrate_008_near_duplicates(cur: sqlite3.Cursor):
+    """Mention tracking on issues/suggestions plus the LSH band index used to merge near-duplicates."""
+    for table in ("issues", "suggestions"):
+        cols = {r[1] for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+        for col, ddl in (
+            ("mention_count", "mention_count INTEGER NOT NULL DEFAULT 1"),
+            ("last_mentioned_at", "last_mentioned_at TEXT"),
+            ("last_conversation_id", "last_conversation_id TEXT"),
+            ("last_message_index", "last_message_index INTEGER"),
+            ("last_message_timestamp", "last_message_timestamp TEXT"),
+        ):
             if col not in cols:
-                cur.execute(f"ALTER TABLE suggestions ADD COLUMN {ddl}")
-        ensure("conversation_id", "conversation_id TEXT")
-        ensure("message_index", "message_index INTEGER")
-        ensure("message_timestamp", "message_timestamp TEXT")
-        ensure("source", "source TEXT")
-        ensure("origin", "origin TEXT")
-        ensure("source_message", "source_message TEXT")
-        ensure("context_json", "context_json TEXT")
-        con.commit()
+                cur.execute(f"ALTER TABLE {table} ADD COLUMN {ddl}")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS near_dup_bands (
+            kind TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            band_key INTEGER NOT NULL,
+            item_id TEXT NOT NULL
+        );
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_near_dup_bands_lookup ON near_dup_bands(kind, user_id, category, band_key)"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_near_dup_bands_item ON near_dup_bands(kind, item_id)")
+    # Index the items that can still absorb new mentions
+    for kind in _NEAR_DUP_OPEN:
+        rows = cur.execute(
+            f"SELECT id, user_id, category, title, details FROM {kind} WHERE {_NEAR_DUP_OPEN[kind].format(p='')}"
+        ).fetchall()
+        for item_id, user_id, category, title, details in rows:
+            _near_dup_index(cur, kind, item_id, user_id, category, tokens(title, details))
 
-        # User profiles
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS user_profiles (
-                user_id TEXT PRIMARY KEY,
-                profile_json TEXT,
-                created_at TEXT,
-                updated_at TEXT
-            );
-            """
-        )
-        con.commit()
-        # Issues table
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS issues (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                title TEXT,
-                details TEXT,
-                category TEXT,
-                severity TEXT,
-                conversation_id TEXT,
-                message_index INTEGER,
-                message_timestamp TEXT,
-                created_at TEXT
-            );
-            """
-        )
-        # Ensure columns exist for upgrades (older DBs may miss these)
-        issue_cols = {r[1] for r in cur.execute("PRAGMA table_info(issues)").fetchall()}
-        def ensure_issue(col: str, ddl: str):
-            if col not in issue_cols:
-                cur.execute(f"ALTER TABLE issues ADD COLUMN {ddl}")
-        ensure_issue("status", "status TEXT")
-        ensure_issue("progress_percent", "progress_percent INTEGER")
-        ensure_issue("last_reviewed_at", "last_reviewed_at TEXT")
-        ensure_issue("priority", "priority TEXT")
-        ensure_issue("time_window", "time_window TEXT")
-        ensure_issue("resolve_trigger_reference", "resolve_trigger_reference TEXT")
-        ensure_issue("triggered_by", "triggered_by TEXT")
-        con.commit()
-        # Episodes and related tables
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS episodes (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                title TEXT,
-                trigger_type TEXT,
-                trigger_description TEXT,
-                trigger_timestamp TEXT,
-                status TEXT,
-                priority INTEGER,
-                member_state_before TEXT,
-                member_state_after TEXT,
-                confidence REAL,
-                created_at TEXT
-            );
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS episode_friction (
-                id TEXT PRIMARY KEY,
-                episode_id TEXT,
-                category TEXT,
-                description TEXT,
-                severity INTEGER,
-                resolution_action TEXT
-            );
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS episode_interventions (
-                id TEXT PRIMARY KEY,
-                episode_id TEXT,
-                action TEXT,
-                responsible_agent TEXT,
-                timestamp TEXT,
-                outcome TEXT
-            );
-            """
-        )
-        # Decisions and evidence
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS decisions (
-                id TEXT PRIMARY KEY,
-                type TEXT,
-                content TEXT,
-                timestamp TEXT,
-                responsible_agent TEXT,
-                rationale TEXT
-            );
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS decision_evidence (
-                id TEXT PRIMARY KEY,
-                decision_id TEXT,
-                evidence_type TEXT,
-                source TEXT,
-                data_json TEXT,
-                timestamp TEXT
-            );
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS decision_messages (
-                id TEXT PRIMARY KEY,
-                decision_id TEXT,
-                message_id TEXT,
-                message_index INTEGER,
-                message_timestamp TEXT
-            );
-            """
-        )
-        # Experiments
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS experiments (
-                id TEXT PRIMARY KEY,
-                template TEXT,
-                hypothesis TEXT,
-                protocol_json TEXT,
-                duration TEXT,
-                member_id TEXT,
-                status TEXT,
-                outcome TEXT,
-                success INTEGER,
-                created_at TEXT
-            );
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS experiment_measurements (
-                id TEXT PRIMARY KEY,
-                experiment_id TEXT,
-                name TEXT,
-                value REAL,
-                ts TEXT,
-                raw_json TEXT
-            );
-            """
-        )
-        con.commit()
+
+# Owner of conversations created before members were partitioned (the single demo member)
+LEGACY_USER_ID = "rohan"
+
+
+def _migrate_009_conversations(cur: sqlite3.Cursor):
+    """Conversations owned by members, plus member-scoped indexes for the per-member read paths."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            created_at TEXT,
+            updated_at TEXT,
+            message_count INTEGER NOT NULL DEFAULT 0
+        );
+        """
+    )
+    statements = [
+        "CREATE INDEX IF NOT EXISTS idx_conversations_user_updated ON conversations(user_id, updated_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_suggestions_user_status ON suggestions(user_id, status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_user_status ON issues(user_id, status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_episodes_user_status ON episodes(user_id, status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_experiments_member_status ON experiments(member_id, status, created_at, id)",
+    ]
+    for sql in statements:
+        cur.execute(sql)
+    # Existing logs all belonged to the one demo member
+    cur.execute(
+        """
+        INSERT OR IGNORE INTO conversations (id, user_id, created_at, updated_at, message_count)
+        SELECT conversation_id, ?, MIN(timestamp), MAX(timestamp), MAX(message_index) + 1
+        FROM messages GROUP BY conversation_id
+        """,
+        (LEGACY_USER_ID,),
+    )
+
+
+def _migrate_010_message_ids(cur: sqlite3.Cursor):
+    """Stable message ids, so issues, suggestions and decisions can point at a message across resets."""
+    cols = {r[1] for r in cur.execute("PRAGMA table_info(messages)").fetchall()}
+    if "message_id" not in cols:
+        cur.execute("ALTER TABLE messages ADD COLUMN message_id TEXT")
+    cur.execute("UPDATE messages SET message_id = lower(hex(randomblob(8))) WHERE message_id IS NULL")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_message_id ON messages(message_id)")
+    for table in ("issues", "suggestions"):
+        cols = {r[1] for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+        if "message_id" not in cols:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN message_id TEXT")
+
+
+def _migrate_011_member_default_conversations(cur: sqlite3.Cursor):
+    """Member default conversations move from ``<member>`` to ``<member>:default``.
+
+    A bare member id could be claimed by any client before that member's first message.
+    """
+    renames = cur.execute(
+        "SELECT id, id || ':default' FROM conversations WHERE id = user_id AND user_id != ? "
+        "AND id || ':default' NOT IN (SELECT id FROM conversations)",
+        (LEGACY_USER_ID,),
+    ).fetchall()
+    for old, new in renames:
+        cur.execute("UPDATE conversations SET id=? WHERE id=?", (new, old))
+        for table in ("messages", "jobs", "issues", "suggestions"):
+            cur.execute(f"UPDATE {table} SET conversation_id=? WHERE conversation_id=?", (new, old))
+        for table in ("issues", "suggestions"):
+            cur.execute(f"UPDATE {table} SET last_conversation_id=? WHERE last_conversation_id=?", (new, old))
+
+
+# Ordered, append-only: never edit an applied migration, add a new one instead.
+MIGRATIONS = [
+    (1, "base_schema", _migrate_001_base_schema),
+    (2, "secondary_indexes", _migrate_002_secondary_indexes),
+    (3, "messages", _migrate_003_messages),
+    (4, "issues_fts", _migrate_004_issues_fts),
+    (5, "jobs", _migrate_005_jobs),
+    (6, "llm_cache", _migrate_006_llm_cache),
+    (7, "routing_log", _migrate_007_routing_log),
+    (8, "near_duplicates", _migrate_008_near_duplicates),
+    (9, "conversations", _migrate_009_conversations),
+    (10, "message_ids", _migrate_010_message_ids),
+    (11, "member_default_conversations", _migrate_011_member_default_conversations),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(con: Optional[sqlite3.Connection] = None) -> int:
+    con = con or _conn()
+    row = con.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='schema_version'"
+    ).fetchone()
+    if not row:
+        return 0
+    return con.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def init_db() -> int:
+    """Apply pending migrations and return the resulting schema version.
+
+    Once the database is current this is a single read of schema_version.
+    """
+    con = _conn()
+    current = schema_version(con)
+    if current >= SCHEMA_VERSION:
+        return current
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, name TEXT, applied_at TEXT)"
+    )
+    con.commit()
+    for version, name, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        # BEGIN IMMEDIATE serializes concurrent starters (several uvicorn workers)
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(con) >= version:
+                con.rollback()
+                continue
+            cur = con.cursor()
+            migrate(cur)
+            cur.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, datetime('now'))",
+                (version, name),
+            )
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        current = version
+    con.execute("PRAGMA optimize")
+    return current
 
 
-def suggestions_list() -> List[Dict]:
+def encode_cursor(item: Dict, order_col: str = "created_at") -> str:
+    """Opaque keyset cursor pointing just past ``item`` in a ``order_col DESC, id DESC`` listing."""
+    raw = json.dumps([item.get(order_col), item.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as exc:  # noqa: BLE001
+        raise ValueError(f"invalid cursor: {cursor!r}") from exc
+    if not isinstance(item_id, str):
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return value, item_id
+
+
+def next_cursor(items: List[Dict], limit: Optional[int], order_col: str = "created_at") -> Optional[str]:
+    """Cursor for the page after ``items``, or None when this was the last page."""
+    if not limit or len(items) < limit:
+        return None
+    return encode_cursor(items[-1], order_col)
+
+
+def _list_page(
+    table: str,
+    order_col: str,
+    filters: Optional[Dict] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    where: Optional[str] = None,
+) -> List[Dict]:
+    """Newest-first listing with equality filters and keyset pagination on (order_col, id).
+
+    Rows with a NULL ``order_col`` sort last, matching SQLite's ``DESC`` ordering.
+    """
+    clauses: List[str] = [where] if where else []
+    params: List = []
+    for col, value in (filters or {}).items():
+        if value is not None:
+            clauses.append(f"{col}=?")
+            params.append(value)
+    if cursor:
+        value, item_id = decode_cursor(cursor)
+        if value is None:
+            clauses.append(f"({order_col} IS NULL AND id<?)")
+            params.append(item_id)
+        else:
+            clauses.append(f"({order_col}<? OR {order_col} IS NULL OR ({order_col}=? AND id<?))")
+            params.extend([value, value, item_id])
+    sql = f"SELECT * FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order_col} DESC, id DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
     with _conn() as con:
         con.row_factory = sqlite3.Row
-        rows = con.execute("SELECT * FROM suggestions ORDER BY created_at DESC").fetchall()
+        rows = con.execute(sql, params).fetchall()
         return [dict(r) for r in rows]
 
 
-def suggestions_add_many(items: List[Dict]):
-    if not items:
-        return
+def suggestions_list(
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
+    return _list_page(
+        "suggestions",
+        "created_at",
+        {"user_id": user_id, "status": status, "category": category},
+        limit,
+        cursor,
+    )
+
+
+# Minimum word-set Jaccard similarity for an incoming item to count as another mention of an open one
+DEDUP_MIN_JACCARD = float(os.getenv("ELYX_DEDUP_MIN_JACCARD", "0.5"))
+
+# Items that still absorb repeat mentions (resolved/dismissed ones never do, a new row is created)
+_NEAR_DUP_OPEN = {
+    "issues": "({p}status IS NULL OR {p}status != 'resolved')",
+    "suggestions": "({p}status IS NULL OR {p}status NOT IN ('dismissed', 'completed'))",
+}
+
+
+def _near_dup_index(cur: sqlite3.Cursor, kind: str, item_id: str, user_id, category, words) -> None:
+    cur.executemany(
+        "INSERT INTO near_dup_bands (kind, user_id, category, band_key, item_id) VALUES (?, ?, ?, ?, ?)",
+        [(kind, user_id or "", (category or "").lower(), key, item_id) for key in band_keys(words)],
+    )
+
+
+def _near_dup_reindex(cur: sqlite3.Cursor, kind: str, item_id: str) -> None:
+    """Replace an item's bands after its title, details or category changed."""
+    cur.execute("DELETE FROM near_dup_bands WHERE kind=? AND item_id=?", (kind, item_id))
+    row = cur.execute(f"SELECT user_id, category, title, details FROM {kind} WHERE id=?", (item_id,)).fetchone()
+    if row is not None:
+        _near_dup_index(cur, kind, item_id, row[0], row[1], tokens(row[2], row[3]))
+
+
+def _near_dup_match(cur: sqlite3.Cursor, kind: str, item: Dict, words) -> Optional[sqlite3.Row]:
+    """Most similar open item of the same user and category sharing an LSH band with ``words``."""
+    keys = band_keys(words)
+    if not keys:
+        return None
+    candidates = cur.execute(
+        f"""
+        SELECT DISTINCT t.* FROM near_dup_bands b JOIN {kind} t ON t.id = b.item_id
+        WHERE b.kind = ? AND b.user_id = ? AND b.category = ?
+          AND b.band_key IN ({",".join("?" * len(keys))}) AND {_NEAR_DUP_OPEN[kind].format(p="t.")}
+        """,
+        [kind, item.get("user_id") or "", (item.get("category") or "").lower(), *keys],
+    ).fetchall()
+    best, best_score = None, DEDUP_MIN_JACCARD
+    for row in candidates:
+        score = jaccard(words, tokens(row["title"], row["details"]))
+        if score >= best_score:
+            best, best_score = row, score
+    return best
+
+
+def _add_many_deduped(kind: str, insert_sql: str, items: List[Dict], dedupe: bool) -> List[str]:
+    """Insert ``items`` into ``kind``, folding near-duplicates of open items into a mention count.
+
+    Returns the stored id for every item: its own id when a row was inserted (or already existed,
+    so retried jobs are idempotent), otherwise the id of the open item it was merged into.
+    """
+    stored: List[str] = []
     with _conn() as con:
+        con.row_factory = sqlite3.Row
         cur = con.cursor()
-        cur.executemany(
-            """
-            INSERT OR IGNORE INTO suggestions (
-                id, user_id, agent, title, details, category, status, created_at,
-                conversation_id, message_index, message_timestamp, source, origin, source_message, context_json
-            )
-            VALUES (
-                :id, :user_id, :agent, :title, :details, :category, :status, :created_at,
-                :conversation_id, :message_index, :message_timestamp, :source, :origin, :source_message, :context_json
+        for item in items:
+            if cur.execute(f"SELECT 1 FROM {kind} WHERE id=?", (item["id"],)).fetchone():
+                stored.append(item["id"])
+                continue
+            words = tokens(item.get("title"), item.get("details"))
+            match = _near_dup_match(cur, kind, item, words) if dedupe else None
+            if match is None:
+                cur.execute(insert_sql, item)
+                _near_dup_index(cur, kind, item["id"], item.get("user_id"), item.get("category"), words)
+                stored.append(item["id"])
+                continue
+            last_ref = (
+                match["last_conversation_id"] or match["conversation_id"],
+                match["last_message_index"] if match["last_message_index"] is not None else match["message_index"],
             )
-            """,
-            items,
-        )
+            if item.get("message_index") is None or last_ref != (item.get("conversation_id"), item.get("message_index")):
+                cur.execute(
+                    f"""
+                    UPDATE {kind} SET mention_count = mention_count + 1, last_mentioned_at = ?,
+                        last_conversation_id = ?, last_message_index = ?, last_message_timestamp = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        item.get("created_at") or datetime.now().isoformat(),
+                        item.get("conversation_id"),
+                        item.get("message_index"),
+                        item.get("message_timestamp"),
+                        match["id"],
+                    ),
+                )
+            stored.append(match["id"])
         con.commit()
+    return stored
 
 
-def issues_add_many(items: List[Dict]):
+def suggestions_add_many(items: List[Dict], dedupe: bool = True) -> List[str]:
     if not items:
-        return
+        return []
+    return _add_many_deduped(
+        "suggestions",
+        """
+        INSERT OR IGNORE INTO suggestions (
+            id, user_id, agent, title, details, category, status, created_at,
+            conversation_id, message_index, message_timestamp, message_id, source, origin, source_message, context_json
+        )
+        VALUES (
+            :id, :user_id, :agent, :title, :details, :category, :status, :created_at,
+            :conversation_id, :message_index, :message_timestamp, :message_id, :source, :origin, :source_message,
+            :context_json
+        )
+        """,
+        [{"message_id": None, **it} for it in items],
+        dedupe,
+    )
+
+
+def issues_add_many(items: List[Dict], dedupe: bool = True) -> List[str]:
+    if not items:
+        return []
     # Normalize items to ensure new fields exist
-    from datetime import datetime
     now_iso = datetime.now().isoformat()
     normalized: List[Dict] = []
     for it in items:
@@ -255,35 +845,43 @@ def issues_add_many(items: List[Dict]):
             "conversation_id": it.get("conversation_id"),
             "message_index": it.get("message_index"),
             "message_timestamp": it.get("message_timestamp"),
+            "message_id": it.get("message_id"),
             "created_at": it.get("created_at", now_iso),
         }
         normalized.append(norm)
-    with _conn() as con:
-        cur = con.cursor()
-        cur.executemany(
-            """
-            INSERT OR IGNORE INTO issues (
-                id, user_id, title, details, category, severity, status, progress_percent, last_reviewed_at,
-                priority, time_window, resolve_trigger_reference, triggered_by,
-                conversation_id, message_index, message_timestamp, created_at
-            ) VALUES (
-                :id, :user_id, :title, :details, :category, :severity, :status, :progress_percent, :last_reviewed_at,
-                :priority, :time_window, :resolve_trigger_reference, :triggered_by,
-                :conversation_id, :message_index, :message_timestamp, :created_at
-            )
-            """,
-            normalized,
+    return _add_many_deduped(
+        "issues",
+        """
+        INSERT OR IGNORE INTO issues (
+            id, user_id, title, details, category, severity, status, progress_percent, last_reviewed_at,
+            priority, time_window, resolve_trigger_reference, triggered_by,
+            conversation_id, message_index, message_timestamp, message_id, created_at
+        ) VALUES (
+            :id, :user_id, :title, :details, :category, :severity, :status, :progress_percent, :last_reviewed_at,
+            :priority, :time_window, :resolve_trigger_reference, :triggered_by,
+            :conversation_id, :message_index, :message_timestamp, :message_id, :created_at
         )
-        con.commit()
+        """,
+        normalized,
+        dedupe,
+    )
 
 
-def issues_list() -> List[Dict]:
-    with _conn() as con:
-        con.row_factory = sqlite3.Row
-        rows = con.execute(
-            "SELECT * FROM issues ORDER BY created_at DESC"
-        ).fetchall()
-        return [dict(r) for r in rows]
+def issues_list(
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
+    return _list_page(
+        "issues",
+        "created_at",
+        {"user_id": user_id, "status": status, "category": category, "priority": priority},
+        limit,
+        cursor,
+    )
 
 
 def issues_update_progress(item_id: str, status: str, progress_percent: int) -> bool:
@@ -320,55 +918,75 @@ def issues_update(item_id: str, fields: Dict) -> bool:
             f"UPDATE issues SET {sets}, last_reviewed_at=datetime('now') WHERE id=?",
             (*values, item_id),
         )
+        updated = cur.rowcount > 0
+        if updated and updates.keys() & {"title", "details", "category"}:
+            _near_dup_reindex(cur, "issues", item_id)
         con.commit()
-        return cur.rowcount > 0
+        return updated
+
+
+# Weight of an issue's BM25 relevance (-bm25, higher is better) in the close-by-text score; 0 ignores it
+ISSUE_MATCH_BM25_WEIGHT = float(os.getenv("ELYX_ISSUE_MATCH_BM25_WEIGHT", "0.5"))
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _issues_fts_available(con: sqlite3.Connection) -> bool:
+    return con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='issues_fts'"
+    ).fetchone() is not None
+
+
+def _open_issue_candidates(
+    con: sqlite3.Connection, lower: str, hinted: List[str], user_id: Optional[str] = None
+) -> List[sqlite3.Row]:
+    """Open issues that share a word with the message or sit in a hinted category, best BM25 first.
+
+    Only the issues the FTS index matches are rescored by the caller: an issue whose words appear
+    in the message only as substrings of other words (and outside the hinted categories) is not a
+    candidate. Every match is returned, with its ``rank``; without FTS5 every open issue is
+    returned with no rank. With ``user_id`` only that member's issues are matched; the FTS5-less
+    scan then reads the member's open issues through the partial ``idx_issues_open`` index, so its
+    cost follows one member's backlog rather than the whole table's.
+    """
+    member_sql, member_args = (" AND {p}user_id=?", (user_id,)) if user_id is not None else ("", ())
+    if not _issues_fts_available(con):
+        return con.execute(
+            "SELECT id, title, details, category, NULL AS rank FROM issues "
+            f"WHERE (status IS NULL OR status!='resolved'){member_sql.format(p='')} ORDER BY created_at DESC",
+            member_args,
+        ).fetchall()
+    words = sorted({w for w in _WORD_RE.findall(lower) if len(w) > 3})
+    terms = [f'"{w}"' for w in words] + [f'category : "{c}"' for c in hinted]
+    if not terms:
+        return []
+    return con.execute(
+        f"""
+        SELECT i.id, i.title, i.details, i.category, bm25(issues_fts) AS rank
+        FROM issues_fts JOIN issues i ON i.rowid = issues_fts.rowid
+        WHERE issues_fts MATCH ? AND (i.status IS NULL OR i.status!='resolved'){member_sql.format(p="i.")}
+        ORDER BY rank
+        """,
+        (" OR ".join(terms), *member_args),
+    ).fetchall()
 
 
-def issues_close_by_text(text: str, reference: str | None = None, triggered_by: str | None = None) -> int:
+def issues_close_by_text(
+    text: str, reference: str | None = None, triggered_by: str | None = None, user_id: str | None = None
+) -> int:
     """Mark issues as resolved if their title/details are contradicted by a resolution text.
 
     Heuristic: if text contains phrases like "feels fine now", "no more", "resolved", and the issue title words appear,
-    set status='resolved', progress_percent=100.
+    set status='resolved', progress_percent=100. With ``user_id`` only that member's issues are considered.
     """
     lower = text.lower()
-    # Broader improvement phrases
-    improvement_markers = [
-        "feels fine",
-        "feel fine",
-        "feels alright",
-        "feel alright",
-        "feels okay",
-        "feel okay",
-        "feels good",
-        "feel good",
-        "feels better",
-        "feel better",
-        "no more",
-        "no longer",
-        "resolved",
-        "better now",
-        "getting better",
-        "improved",
-        "improving",
-        "okay now",
-        "alright now",
-        "good now",
-        "back to normal",
-        "gone",
-        "pain reduced",
-        "less pain",
-        "subsided",
-        "cleared up",
-        "all good",
-        "much better",
-    ]
-    if not any(k in lower for k in improvement_markers):
+    # Improvement phrases and category hints come from the shared keyword tables (one scan)
+    if "issue.improvement" not in classify(text):
         return 0
+    hinted = hit_categories(text, "issue.hint.")
     with _conn() as con:
         con.row_factory = sqlite3.Row
-        rows = con.execute(
-            "SELECT id, title, details, category FROM issues WHERE status IS NULL OR status!='resolved'"
-        ).fetchall()
+        rows = _open_issue_candidates(con, lower, hinted, user_id)
         to_close = []
         for r in rows:
             title = (r["title"] or "").lower()
@@ -378,14 +996,11 @@ def issues_close_by_text(text: str, reference: str | None = None, triggered_by:
             tokens = [t for t in (title + " " + details).split() if len(t) > 3]
             score = sum(1 for t in tokens if t in lower)
             # category hinting
-            cat_hints = {
-                "physio": ["back", "knee", "shoulder", "leg", "mobility", "pain"],
-                "medical": ["headache", "migraine", "fever", "viral", "stomach", "glucose"],
-                "performance": ["sleep", "hrv", "recovery", "fatigue"],
-                "nutrition": ["stomach", "bloating", "meal"],
-            }
-            if category in cat_hints and any(h in lower for h in cat_hints[category]):
+            if category in hinted:
                 score += 2
+            # BM25 relevance (stemmed, rarer words count more); bm25() is negative, lower is better
+            if r["rank"] is not None:
+                score += ISSUE_MATCH_BM25_WEIGHT * -r["rank"]
             if score >= 1:
                 to_close.append(r["id"])
         if not to_close:
@@ -423,11 +1038,20 @@ def issues_update_priority_time(item_id: str, priority: str, time_window: str) -
 
 
 # Episodes CRUD
-def episodes_list() -> List[Dict]:
-    with _conn() as con:
-        con.row_factory = sqlite3.Row
-        rows = con.execute("SELECT * FROM episodes ORDER BY created_at DESC").fetchall()
-        return [dict(r) for r in rows]
+def episodes_list(
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
+    return _list_page(
+        "episodes",
+        "created_at",
+        {"user_id": user_id, "status": status, "priority": priority},
+        limit,
+        cursor,
+    )
 
 
 def episodes_add(item: Dict):
@@ -521,11 +1145,9 @@ def decisions_add(item: Dict, evidence: List[Dict], messages: List[Dict]):
         con.commit()
 
 
-def decisions_list() -> List[Dict]:
-    with _conn() as con:
-        con.row_factory = sqlite3.Row
-        rows = con.execute("SELECT * FROM decisions ORDER BY timestamp DESC").fetchall()
-        return [dict(r) for r in rows]
+def decisions_list(limit: Optional[int] = None, cursor: Optional[str] = None) -> List[Dict]:
+    # Decisions carry no member/status columns; paginate on their own timestamp
+    return _list_page("decisions", "timestamp", None, limit, cursor)
 
 
 def decisions_get_with_why(decision_id: str) -> Dict:
@@ -560,11 +1182,20 @@ def experiments_add(item: Dict):
         con.commit()
 
 
-def experiments_list() -> List[Dict]:
-    with _conn() as con:
-        con.row_factory = sqlite3.Row
-        rows = con.execute("SELECT * FROM experiments ORDER BY created_at DESC").fetchall()
-        return [dict(r) for r in rows]
+def experiments_list(
+    user_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
+    # Experiments store the member as member_id
+    return _list_page(
+        "experiments",
+        "created_at",
+        {"member_id": user_id, "status": status},
+        limit,
+        cursor,
+    )
 
 
 def experiments_add_measurement(item: Dict):
@@ -625,3 +1256,388 @@ def user_profile_set(user_id: str, profile: Dict) -> bool:
         con.commit()
         return cur.rowcount > 0
 
+
+# Conversation messages (append-only log)
+def _message_row(row: sqlite3.Row) -> Dict:
+    context = None
+    if row["context_json"]:
+        try:
+            context = json.loads(row["context_json"])
+        except Exception:
+            context = None
+    return {
+        "sender": row["sender"],
+        "message": row["message"],
+        "timestamp": row["timestamp"],
+        "context": context,
+        "message_index": row["message_index"],
+        "id": row["message_id"],
+    }
+
+
+class MessageConflict(Exception):
+    """An append expected a different next message index: someone else appended first."""
+
+    def __init__(self, conversation_id: str, expected: int, actual: int):
+        super().__init__(f"conversation {conversation_id!r} is at message {actual}, expected {expected}")
+        self.conversation_id = conversation_id
+        self.expected = expected
+        self.actual = actual
+
+
+def new_message_id() -> str:
+    return os.urandom(8).hex()
+
+
+def _insert_messages(con: sqlite3.Connection, conversation_id: str, items: List[Dict], start: int) -> List[int]:
+    """Insert ``items`` at ``start``, ``start + 1``, ...; items without an ``id`` get a new one (in place)."""
+    for it in items:
+        if not it.get("id"):
+            it["id"] = new_message_id()
+    rows = [
+        (
+            it["id"],
+            conversation_id,
+            start + offset,
+            it.get("sender"),
+            it.get("message"),
+            it.get("timestamp"),
+            None if it.get("context") is None else json.dumps(it.get("context")),
+        )
+        for offset, it in enumerate(items)
+    ]
+    con.executemany(
+        """
+        INSERT INTO messages (message_id, conversation_id, message_index, sender, message, timestamp, context_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return [start + offset for offset in range(len(items))]
+
+
+def _touch_conversation(con: sqlite3.Connection, conversation_id: str, user_id: Optional[str], count: int):
+    now_iso = datetime.now().isoformat()
+    con.execute(
+        """
+        INSERT INTO conversations (id, user_id, created_at, updated_at, message_count) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET updated_at=excluded.updated_at, message_count=excluded.message_count
+        """,
+        (conversation_id, user_id or LEGACY_USER_ID, now_iso, now_iso, count),
+    )
+
+
+def messages_append(
+    conversation_id: str,
+    items: List[Dict],
+    user_id: Optional[str] = None,
+    expected_index: Optional[int] = None,
+) -> List[int]:
+    """Append messages to a conversation and return their message indexes.
+
+    Cost is independent of conversation length: one indexed MAX lookup plus the inserts. The
+    write transaction is taken up front (``BEGIN IMMEDIATE``), so appends from other threads or
+    processes queue behind it and every message gets the next index exactly once. With
+    ``expected_index`` the append is a compare-and-set: it raises ``MessageConflict`` instead of
+    writing if the conversation has moved on. Each item gets its stable ``id`` set in place. The
+    conversation is registered to ``user_id`` on its first message.
+    """
+    if not items:
+        return []
+    with _conn() as con:
+        con.execute("BEGIN IMMEDIATE")
+        start = con.execute(
+            "SELECT COALESCE(MAX(message_index), -1) + 1 FROM messages WHERE conversation_id=?",
+            (conversation_id,),
+        ).fetchone()[0]
+        if expected_index is not None and expected_index != start:
+            raise MessageConflict(conversation_id, expected_index, start)
+        indexes = _insert_messages(con, conversation_id, items, start)
+        _touch_conversation(con, conversation_id, user_id, start + len(items))
+        return indexes
+
+
+def messages_list(conversation_id: str) -> List[Dict]:
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        rows = con.execute(
+            "SELECT * FROM messages WHERE conversation_id=? ORDER BY message_index ASC",
+            (conversation_id,),
+        ).fetchall()
+        return [_message_row(r) for r in rows]
+
+
+def messages_tail(conversation_id: str, limit: int) -> List[Dict]:
+    """Last ``limit`` messages of a conversation, oldest first."""
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        rows = con.execute(
+            "SELECT * FROM messages WHERE conversation_id=? ORDER BY message_index DESC LIMIT ?",
+            (conversation_id, int(limit)),
+        ).fetchall()
+        return [_message_row(r) for r in reversed(rows)]
+
+
+def message_get(message_id: str) -> Optional[Dict]:
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        row = con.execute("SELECT * FROM messages WHERE message_id=?", (message_id,)).fetchone()
+        if row is None:
+            return None
+        return {**_message_row(row), "conversation_id": row["conversation_id"]}
+
+
+def messages_count(conversation_id: str) -> int:
+    with _conn() as con:
+        return con.execute(
+            "SELECT COALESCE(MAX(message_index), -1) + 1 FROM messages WHERE conversation_id=?",
+            (conversation_id,),
+        ).fetchone()[0]
+
+
+def messages_replace(conversation_id: str, items: List[Dict], user_id: Optional[str] = None):
+    """Replace a conversation wholesale (resets and bulk imports; not the per-turn path)."""
+    with _conn() as con:
+        con.execute("BEGIN IMMEDIATE")
+        con.execute("DELETE FROM messages WHERE conversation_id=?", (conversation_id,))
+        _insert_messages(con, conversation_id, items, 0)
+        _touch_conversation(con, conversation_id, user_id, len(items))
+
+
+def messages_truncate(conversation_id: str, keep: int, user_id: Optional[str] = None) -> int:
+    """Drop every message from index ``keep`` on; returns how many were removed."""
+    with _conn() as con:
+        con.execute("BEGIN IMMEDIATE")
+        cur = con.execute(
+            "DELETE FROM messages WHERE conversation_id=? AND message_index>=?", (conversation_id, int(keep))
+        )
+        if cur.rowcount:
+            _touch_conversation(con, conversation_id, user_id, int(keep))
+        return cur.rowcount
+
+
+def conversations_list(
+    user_id: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> List[Dict]:
+    """A member's conversations, most recently active first."""
+    return _list_page("conversations", "updated_at", {"user_id": user_id}, limit, cursor)
+
+
+def conversation_get(conversation_id: str) -> Optional[Dict]:
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        row = con.execute("SELECT * FROM conversations WHERE id=?", (conversation_id,)).fetchone()
+        return dict(row) if row else None
+
+
+# Background jobs
+def _job_row(row: sqlite3.Row) -> Dict:
+    data = dict(row)
+    data["payload"] = json.loads(data.pop("payload_json") or "null")
+    return data
+
+
+def jobs_enqueue(item: Dict) -> str:
+    now = datetime.now().isoformat()
+    with _conn() as con:
+        con.execute(
+            """
+            INSERT INTO jobs (
+                id, kind, payload_json, status, attempts, max_attempts, conversation_id, message_index,
+                run_after, created_at, updated_at
+            ) VALUES (?, ?, ?, 'queued', 0, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                item["id"],
+                item["kind"],
+                json.dumps(item.get("payload")),
+                item.get("max_attempts", 3),
+                item.get("conversation_id"),
+                item.get("message_index"),
+                now,
+                now,
+                now,
+            ),
+        )
+        return item["id"]
+
+
+def jobs_claim(lease_seconds: float = 300) -> Optional[Dict]:
+    """Claim the oldest runnable job: queued and due, or running with an expired lease.
+
+    The lease lets another worker (or process) pick a job back up if its runner died mid-way.
+    """
+    now = datetime.now()
+    now_iso = now.isoformat()
+    lease_until = (now + timedelta(seconds=lease_seconds)).isoformat()
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        con.execute("BEGIN IMMEDIATE")
+        row = con.execute(
+            """
+            SELECT * FROM jobs
+            WHERE (status='queued' AND run_after<=?) OR (status='running' AND lease_until<?)
+            ORDER BY run_after
+            LIMIT 1
+            """,
+            (now_iso, now_iso),
+        ).fetchone()
+        if row is None:
+            return None
+        con.execute(
+            "UPDATE jobs SET status='running', attempts=attempts+1, lease_until=?, updated_at=? WHERE id=?",
+            (lease_until, now_iso, row["id"]),
+        )
+        job = _job_row(row)
+        job.update(status="running", attempts=job["attempts"] + 1, lease_until=lease_until)
+        return job
+
+
+def jobs_complete(job_id: str):
+    with _conn() as con:
+        con.execute(
+            "UPDATE jobs SET status='done', last_error=NULL, lease_until=NULL, updated_at=? WHERE id=?",
+            (datetime.now().isoformat(), job_id),
+        )
+
+
+def jobs_fail(job_id: str, error: str, retry_in: Optional[float] = None):
+    """Record a failure; requeue after ``retry_in`` seconds, or mark failed when None."""
+    now = datetime.now()
+    with _conn() as con:
+        if retry_in is None:
+            con.execute(
+                "UPDATE jobs SET status='failed', last_error=?, lease_until=NULL, updated_at=? WHERE id=?",
+                (error[:1000], now.isoformat(), job_id),
+            )
+        else:
+            con.execute(
+                """
+                UPDATE jobs SET status='queued', last_error=?, lease_until=NULL, run_after=?, updated_at=?
+                WHERE id=?
+                """,
+                (error[:1000], (now + timedelta(seconds=retry_in)).isoformat(), now.isoformat(), job_id),
+            )
+
+
+def jobs_list(
+    conversation_id: Optional[str] = None,
+    message_index: Optional[int] = None,
+    status: Optional[str] = None,
+) -> List[Dict]:
+    clauses: List[str] = []
+    params: List = []
+    for col, value in (("conversation_id", conversation_id), ("message_index", message_index), ("status", status)):
+        if value is not None:
+            clauses.append(f"{col}=?")
+            params.append(value)
+    sql = "SELECT * FROM jobs"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY created_at"
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        return [_job_row(r) for r in con.execute(sql, params).fetchall()]
+
+
+# LLM response cache (disk tier)
+def llm_cache_get(key: str, now: float) -> Optional[Tuple[str, Optional[float]]]:
+    """Return ``(response, expires_at)`` for ``key`` unless expired (an expired row is deleted).
+
+    A hit does not write; callers record last use in batches with ``llm_cache_touch``.
+    """
+    with _conn() as con:
+        row = con.execute("SELECT response, expires_at FROM llm_cache WHERE key=?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= now:
+            con.execute("DELETE FROM llm_cache WHERE key=?", (key,))
+            return None
+        return row[0], row[1]
+
+
+def llm_cache_touch(used: Dict[str, float]):
+    """Set last_used_at for many keys (``{key: used_at}``) in one transaction."""
+    if not used:
+        return
+    with _conn() as con:
+        con.executemany(
+            "UPDATE llm_cache SET last_used_at=? WHERE key=? AND last_used_at<?",
+            [(used_at, key, used_at) for key, used_at in used.items()],
+        )
+
+
+def llm_cache_put(key: str, model: Optional[str], response: str, expires_at: Optional[float], now: float):
+    with _conn() as con:
+        con.execute(
+            """
+            INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, expires_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key, model, response, now, expires_at, now),
+        )
+
+
+def llm_cache_evict(max_entries: int, now: float) -> int:
+    """Drop expired rows, then the least recently used rows beyond ``max_entries``. Returns rows removed."""
+    with _conn() as con:
+        removed = con.execute(
+            "DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at<=?", (now,)
+        ).rowcount
+        removed += con.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,),
+        ).rowcount
+        return removed
+
+
+def llm_cache_count() -> int:
+    with _conn() as con:
+        return con.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+def llm_cache_clear():
+    with _conn() as con:
+        con.execute("DELETE FROM llm_cache")
+
+
+# Routing log
+# Newest routing decisions kept; older rows are pruned as new ones are logged
+ROUTING_LOG_MAX_ROWS = max(1, int(os.getenv("ELYX_ROUTING_LOG_MAX_ROWS", "50000")))
+
+
+def routing_log_add(message: str, agents: List[str], source: str, confidence: Optional[float], latency_ms: float):
+    """Log one routing decision; only the newest ROUTING_LOG_MAX_ROWS decisions are kept."""
+    with _conn() as con:
+        cur = con.execute(
+            """
+            INSERT INTO routing_log (message, agents_json, source, confidence, latency_ms, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (message, json.dumps(agents), source, confidence, latency_ms, datetime.now().isoformat()),
+        )
+        # ids only grow, so this is one primary-key range delete (a single seek when nothing is due)
+        con.execute("DELETE FROM routing_log WHERE id<=?", (cur.lastrowid - ROUTING_LOG_MAX_ROWS,))
+
+
+def routing_log_list(source: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+    """Most recent decisions first; each row carries ``agents`` decoded from agents_json."""
+    sql = "SELECT * FROM routing_log"
+    params: List = []
+    if source is not None:
+        sql += " WHERE source=?"
+        params.append(source)
+    sql += " ORDER BY id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with _conn() as con:
+        con.row_factory = sqlite3.Row
+        rows = [dict(r) for r in con.execute(sql, params).fetchall()]
+    for r in rows:
+        r["agents"] = json.loads(r.pop("agents_json") or "[]")
+    return rows
@@ -0,0 +1,130 @@
+"""Keyword tables for the heuristic classifiers, compiled once into a single matcher.
+
+Every table is a namespaced category (``"urgency.critical"``, ``"route.Carla"``, ...) mapped to its
+keywords. ``classify(text)`` scans a message once and returns every category hit, so urgency,
+routing, issue fallbacks, issue closing, experiment templates and triage fallbacks all share one
+pass (cached per message). Keywords match on word boundaries, with an optional plural/verb suffix
+("meal" matches "meals", "back" no longer matches "feedback").
+
+Pure text matching with no project imports, kept under ``data`` so the data layer
+(``issues_close_by_text``) can use it without depending on ``agents``.
+"""
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+# Suffixes a keyword may carry and still count as the same word
+_INFLECTIONS = r"(?:s|es|ed|ing)?"
+_WORD = "a-z0-9"
+
+
+class KeywordMatcher:
+    """Single-regex keyword matcher returning every category hit in one scan.
+
+    All keywords are folded into one alternation (longest first) anchored at word starts through a
+    lookahead, so overlapping keywords that start at different words are all reported ("less pain"
+    and "pain"). Keywords that are word-prefixes of a longer keyword ("blood" of "blood pressure")
+    are credited whenever the longer one matches.
+    """
+
+    def __init__(self, tables: Mapping[str, Iterable[str]], inflections: bool = True):
+        self.categories_of: Dict[str, Set[str]] = {}
+        for category, keywords in tables.items():
+            for kw in keywords:
+                self.categories_of.setdefault(kw.lower(), set()).add(category)
+        keywords = sorted(self.categories_of, key=len, reverse=True)
+        # Keyword -> shorter keywords it implies (same start, ends on a word boundary inside it)
+        self._implied: Dict[str, List[str]] = {
+            kw: [
+                other
+                for other in keywords
+                if other != kw and kw.startswith(other) and not kw[len(other)].isalnum()
+            ]
+            for kw in keywords
+        }
+        alternation = "|".join(re.escape(k) for k in keywords)
+        suffix = _INFLECTIONS if inflections else ""
+        self._pattern = re.compile(rf"(?<![{_WORD}])(?=({alternation}){suffix}(?![{_WORD}]))")
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Map each hit category to the keywords that hit it, in order of first appearance."""
+        hits: Dict[str, List[str]] = {}
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            for kw in [keyword, *self._implied[keyword]]:
+                for category in self.categories_of[kw]:
+                    found = hits.setdefault(category, [])
+                    if kw not in found:
+                        found.append(kw)
+        return hits
+
+
+KEYWORD_TABLES: Dict[str, List[str]] = {
+    # UrgencyDetector
+    "urgency.critical": [
+        "emergency", "urgent", "critical", "severe pain", "chest pain",
+        "difficulty breathing", "can't breathe", "hospital", "911",
+    ],
+    "urgency.high": [
+        "pain", "painful", "worried", "concerned", "problem", "issue", "help needed",
+        "not feeling well", "sick", "fever", "bleeding", "frustrated", "dissatisfied",
+    ],
+    "urgency.medium": [
+        "question", "confused", "unsure", "clarification", "when should",
+        "disappointed", "need help",
+    ],
+    # AgentOrchestrator.route_message
+    "route.Ruby": ["schedule", "appointment", "coordinate", "book", "confirm"],
+    "route.Dr. Warren": ["lab", "blood", "test", "result", "medical", "doctor", "medication", "diagnosis"],
+    "route.Advik": ["whoop", "oura", "hrv", "sleep", "recovery", "exercise", "workout", "performance"],
+    "route.Carla": ["food", "meal", "cgm", "glucose", "nutrition", "supplement", "diet", "eating"],
+    "route.Rachel": ["pain", "painful", "injury", "movement", "strength", "mobility", "physio", "exercise", "workout"],
+    "route.Neel": ["dissatisfied", "complaint", "frustrated", "escalate", "disappointed", "strategic", "goals"],
+    # Member says a problem has cleared up (issue fallback skips it, open issues get closed)
+    "issue.improvement": [
+        "feels fine", "feel fine", "feels alright", "feel alright", "feels okay", "feel okay",
+        "feels good", "feel good", "feels better", "feel better", "no more", "no longer",
+        "resolved", "better now", "getting better", "improved", "improving", "okay now",
+        "alright now", "good now", "back to normal", "gone", "pain reduced", "less pain",
+        "subsided", "cleared up", "all good", "much better",
+    ],
+    # backend.enrichment.fallback_issues
+    "issue.category.performance": ["sleep", "hrv", "recovery", "whoop", "oura", "tired", "fatigue"],
+    "issue.category.medical": ["glucose", "cgm", "sugar", "insulin", "bp", "blood pressure"],
+    "issue.category.nutrition": ["food", "diet", "meal", "protein", "carb", "nutrition"],
+    "issue.category.physio": ["pain", "painful", "injury", "mobility", "shoulder", "back", "knee"],
+    "issue.severity.high": ["severe", "cannot", "can't", "emergency", "chest", "bleeding"],
+    # data.db.issues_close_by_text: words hinting which open issue category is being resolved
+    "issue.hint.physio": ["back", "knee", "shoulder", "leg", "mobility", "pain", "painful"],
+    "issue.hint.medical": ["headache", "migraine", "fever", "viral", "stomach", "glucose"],
+    "issue.hint.performance": ["sleep", "hrv", "recovery", "fatigue"],
+    "issue.hint.nutrition": ["stomach", "bloating", "meal"],
+    # ExperimentEngine._select_template
+    "experiment.sleep": ["sleep", "insomnia", "tired", "fatigue", "rest"],
+    "experiment.supplement": ["supplement", "magnesium"],
+    "experiment.digestion": ["bloating", "digestion", "stomach", "food", "meal"],
+    "experiment.cgm": ["glucose", "cgm", "blood sugar"],
+    "experiment.exercise": ["exercise", "workout", "performance", "hrv", "recovery"],
+    "experiment.metabolic": ["glucose", "blood sugar", "metabolic", "cgm"],
+    # IssuePrioritizer keyword fallback
+    "triage.fracture": ["fracture", "broken bone"],
+    "triage.viral": ["viral", "fever", "flu"],
+    "triage.headache": ["headache", "migraine"],
+    "triage.stomach": ["stomach", "abdominal", "ache"],
+}
+
+MATCHER = KeywordMatcher(KEYWORD_TABLES)
+
+
+@lru_cache(maxsize=1024)
+def classify(text: str) -> Mapping[str, Tuple[str, ...]]:
+    """Every keyword category ``text`` hits (read-only, cached so call sites share one scan)."""
+    return MappingProxyType({c: tuple(kws) for c, kws in MATCHER.scan(text).items()})
+
+
+def hit_categories(text: str, prefix: str) -> List[str]:
+    """Hit categories under ``prefix`` (e.g. ``"issue.hint."``), prefix stripped, in table order."""
+    hits = classify(text)
+    return [c[len(prefix):] for c in KEYWORD_TABLES if c.startswith(prefix) and c in hits]
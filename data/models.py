@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
 
@@ -30,3 +30,12 @@ class JourneyState:
     nutrition_plan: Dict
 
 
+
+
+@dataclass
+class MemberProfile:
+    member_id: str
+    name: str
+    travel_every: int = 4  # weeks between business trips (0: never travels)
+    conditions: List[str] = field(default_factory=list)
+    adherence: float = 0.6  # typical share of the plan the member follows
@@ -1,30 +1,122 @@
 import json
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from data.db import (
+    LEGACY_USER_ID,
+    conversation_get,
+    conversations_list,
+    init_db,
+    messages_append,
+    messages_count,
+    messages_list,
+    messages_replace,
+    messages_tail,
+    messages_truncate,
+)
+
+
+DEFAULT_CONVERSATION_ID = "default"
+
+
+def default_conversation(member: str) -> str:
+    """A member's default conversation id; the legacy member keeps the original ``default`` log.
+
+    Namespaced by member, so no client can claim another member's default conversation first.
+    """
+    return DEFAULT_CONVERSATION_ID if member == LEGACY_USER_ID else f"{member}:{DEFAULT_CONVERSATION_ID}"
+
+
+def _write_json_atomic(filename: str, data) -> None:
+    """Write to a temp file next to ``filename`` and rename it over: readers never see half a file."""
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
 
 
 class PersistenceManager:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
+        init_db()
+        self.import_legacy_history()
 
-    def save_conversation_history(self, history: List[Dict]):
-        filename = os.path.join(self.data_dir, "conversation_history.json")
-        with open(filename, "w") as f:
-            json.dump(history, f, indent=2)
+    # Conversation history lives in the SQLite messages log; each turn is an append
+    def append_conversation_messages(
+        self, messages: List[Dict], conversation_id: str = DEFAULT_CONVERSATION_ID, user_id: Optional[str] = None
+    ) -> List[int]:
+        return messages_append(conversation_id, messages, user_id)
+
+    def append_conversation_message(
+        self,
+        message: Dict,
+        conversation_id: str = DEFAULT_CONVERSATION_ID,
+        user_id: Optional[str] = None,
+        expected_index: Optional[int] = None,
+    ) -> int:
+        """Append one message (its stable ``id`` is set in place); see ``messages_append`` for ``expected_index``."""
+        return messages_append(conversation_id, [message], user_id, expected_index)[0]
+
+    def tail_conversation_history(self, limit: int, conversation_id: str = DEFAULT_CONVERSATION_ID) -> List[Dict]:
+        return messages_tail(conversation_id, limit)
+
+    def conversation_length(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> int:
+        return messages_count(conversation_id)
+
+    def save_conversation_history(
+        self, history: List[Dict], conversation_id: str = DEFAULT_CONVERSATION_ID, user_id: Optional[str] = None
+    ):
+        """Replace the whole conversation. Prefer append_conversation_messages for new turns."""
+        messages_replace(conversation_id, history, user_id)
+
+    def truncate_conversation(
+        self, keep: int, conversation_id: str = DEFAULT_CONVERSATION_ID, user_id: Optional[str] = None
+    ) -> int:
+        """Roll the conversation back to its first ``keep`` messages."""
+        return messages_truncate(conversation_id, keep, user_id)
 
-    def load_conversation_history(self) -> List[Dict]:
+    def load_conversation_history(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> List[Dict]:
+        return messages_list(conversation_id)
+
+    # Conversations are owned by one member
+    def list_conversations(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> List[Dict]:
+        return conversations_list(user_id, limit, cursor)
+
+    def conversation_owner(self, conversation_id: str) -> Optional[str]:
+        row = conversation_get(conversation_id)
+        return row["user_id"] if row else None
+
+    def import_legacy_history(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> Optional[int]:
+        """One-shot import of a pre-existing conversation_history.json into the messages log.
+
+        The file is renamed to ``conversation_history.json.imported`` afterwards so the import
+        never runs twice. Returns the number of imported messages, or None if there was nothing to do.
+        """
         filename = os.path.join(self.data_dir, "conversation_history.json")
+        if not os.path.exists(filename):
+            return None
         try:
             with open(filename, "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return []
+                history = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(history, list):
+            return None
+        if messages_count(conversation_id) == 0:
+            messages_replace(conversation_id, history)
+            imported = len(history)
+        else:
+            imported = 0
+        os.replace(filename, filename + ".imported")
+        return imported
 
     def save_journey_state(self, state: Dict):
-        filename = os.path.join(self.data_dir, "journey_state.json")
-        with open(filename, "w") as f:
-            json.dump(state, f, indent=2)
+        _write_json_atomic(os.path.join(self.data_dir, "journey_state.json"), state)
 
     def load_journey_state(self) -> Dict:
         filename = os.path.join(self.data_dir, "journey_state.json")
@@ -35,8 +127,24 @@ class PersistenceManager:
             return {"current_week": 1, "total_weeks": 34}
 
     def save_weekly_report(self, week: int, report: Dict):
-        filename = os.path.join(self.data_dir, f"week_{week:02d}_report.json")
-        with open(filename, "w") as f:
-            json.dump(report, f, indent=2)
+        _write_json_atomic(os.path.join(self.data_dir, f"week_{week:02d}_report.json"), report)
 
+    # Simulation checkpoints (see JourneyOrchestrator.run_full_journey)
+    def _checkpoint_file(self, name: str) -> str:
+        return os.path.join(self.data_dir, f"{name}.checkpoint.json")
 
+    def save_checkpoint(self, name: str, state: Dict):
+        _write_json_atomic(self._checkpoint_file(name), state)
+
+    def load_checkpoint(self, name: str) -> Optional[Dict]:
+        try:
+            with open(self._checkpoint_file(name), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def clear_checkpoint(self, name: str):
+        try:
+            os.remove(self._checkpoint_file(name))
+        except FileNotFoundError:
+            pass
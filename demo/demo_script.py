@@ -27,6 +27,7 @@ def run_demo():
         print(f"✅ Adherence: {report['adherence_rate']:.1%}")
         print(f"🩺 Agent Actions: {report['agent_actions']}")
         time.sleep(1)
+    orchestrator.flush()
 
     print("\n🎉 Demo completed!")
 
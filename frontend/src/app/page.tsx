@@ -132,6 +132,21 @@ export default function ElyxDashboard() {
 	const messagesEndRef = useRef<HTMLDivElement>(null);
 	const backendBase = "http://localhost:8787";
 
+	// List endpoints return one page at a time; follow X-Next-Cursor until every item is loaded
+	async function fetchAllPages<T>(path: string): Promise<T[]> {
+		const items: T[] = [];
+		let cursor: string | null = null;
+		do {
+			const params = new URLSearchParams({ limit: "500" });
+			if (cursor) params.set("cursor", cursor);
+			const res = await fetch(`${backendBase}${path}?${params}`);
+			if (!res.ok) throw new Error(`${path} failed: ${res.status}`);
+			items.push(...((await res.json()) as T[]));
+			cursor = res.headers.get("X-Next-Cursor");
+		} while (cursor);
+		return items;
+	}
+
 	// Scroll to bottom of messages
 	const scrollToBottom = () => {
 		messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -144,38 +159,33 @@ export default function ElyxDashboard() {
 	// Load all data
 	const refreshAll = async () => {
 		try {
-			const [messagesRes, suggestionsRes, issuesRes, episodesRes, decisionsRes, experimentsRes] = await Promise.all([
+			const [messagesRes, suggestionsRes, issuesRes, episodesRes, decisionsRes, experimentsRes] = await Promise.allSettled([
 				fetch(`${backendBase}/messages`),
-				fetch(`${backendBase}/suggestions`),
-				fetch(`${backendBase}/issues`),
-				fetch(`${backendBase}/episodes`),
-				fetch(`${backendBase}/decisions`),
-				fetch(`${backendBase}/experiments`)
+				fetchAllPages<Suggestion>("/suggestions"),
+				fetchAllPages<Issue>("/issues"),
+				fetchAllPages<Episode>("/episodes"),
+				fetchAllPages<Decision>("/decisions"),
+				fetchAllPages<Experiment>("/experiments")
 			]);
 
-			if (messagesRes.ok) {
-				const data = await messagesRes.json();
+			if (messagesRes.status === "fulfilled" && messagesRes.value.ok) {
+				const data = await messagesRes.value.json();
 				setMessages(data as Message[]);
 			}
-			if (suggestionsRes.ok) {
-				const data = await suggestionsRes.json();
-				setSuggestions(data as Suggestion[]);
+			if (suggestionsRes.status === "fulfilled") {
+				setSuggestions(suggestionsRes.value);
 			}
-			if (issuesRes.ok) {
-				const data = await issuesRes.json();
-				setIssues(data as Issue[]);
+			if (issuesRes.status === "fulfilled") {
+				setIssues(issuesRes.value);
 			}
-			if (episodesRes.ok) {
-				const data = await episodesRes.json();
-				setEpisodes(data as Episode[]);
+			if (episodesRes.status === "fulfilled") {
+				setEpisodes(episodesRes.value);
 			}
-			if (decisionsRes.ok) {
-				const data = await decisionsRes.json();
-				setDecisions(data as Decision[]);
+			if (decisionsRes.status === "fulfilled") {
+				setDecisions(decisionsRes.value);
 			}
-			if (experimentsRes.ok) {
-				const data = await experimentsRes.json();
-				setExperiments(data as Experiment[]);
+			if (experimentsRes.status === "fulfilled") {
+				setExperiments(experimentsRes.value);
 			}
 		} catch (error) {
 			console.error('Error loading data:', error);
@@ -294,11 +304,7 @@ export default function ElyxDashboard() {
 			
 			if (response.ok) {
 				// Refresh suggestions to get updated status
-				const suggestionsRes = await fetch(`${backendBase}/suggestions`);
-				if (suggestionsRes.ok) {
-					const data = await suggestionsRes.json();
-					setSuggestions(data as Suggestion[]);
-				}
+				setSuggestions(await fetchAllPages<Suggestion>("/suggestions"));
 			}
 		} catch (error) {
 			console.error("Error updating suggestion status:", error);
@@ -1,145 +1,30 @@
+import argparse
 import json
 import os
-from simulation.complete_journey import CompleteJourney
+from simulation.complete_journey import CompleteJourney, SIM_MODE, SIM_WORKERS
 
 def main():
-    # Set a dummy API key for simulation purposes
-    os.environ["OPENAI_API_KEY"] = "dummy_key"
     """
     Main function to run the complete journey simulation.
     """
-    print("🎬 Starting Complete Journey Simulation...")
+    parser = argparse.ArgumentParser(description="Replay the member journey from an episodes XML file.")
+    parser.add_argument("--xml", default="episodes.xml", help="episodes file (default: episodes.xml)")
+    parser.add_argument("--months", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=SIM_WORKERS, help="episodes simulated concurrently")
+    parser.add_argument("--mode", choices=("thread", "process"), default=SIM_MODE)
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs (any worker count)")
+    args = parser.parse_args()
 
-    # A chronological list of main messages from the user
-    rohan_messages = """
-Episode 1: Onboarding (Month 1, Week 1-2)
-Duration: 4 days
-Context: Initial setup, team introductions, baseline data collection
-User Messages (Rohan Patel):
-Day 1:
-"Ruby, I'm starting with Elyx today. I've attached my recent medical records and supplement list. My main concerns are family history of heart disease and managing stress from my sales role. I travel 2-3 times per month internationally. Need efficient, data-driven approach."
-"I currently use a Garmin watch for runs but looking to upgrade to better sleep and HRV tracking. What do you recommend? Also, when can I speak with the medical team about my cholesterol levels from last month's test?"
-"Sarah, my assistant, will coordinate scheduling. She has access to my calendar. I prefer morning calls before 10 AM Singapore time when I'm not traveling."
-Day 2:
-"Received the Whoop device. Setting it up now. Quick question - how long before I get meaningful data? I have a board presentation next week and want to optimize my preparation."
-"Dr. Warren, I saw your note about comprehensive testing. I'm fine with blood work but want to understand the timeline and what specific markers we're tracking for cardiovascular risk."
-Day 4:
-"First few nights of Whoop data are interesting. Recovery scores around 45-55%. Is this normal for someone with my stress levels? Sleep efficiency showing 78-82%."
-"Advik, the heart rate zones seem off compared to my Garmin. During my 30-minute run this morning, Whoop showed strain of 15.2. Does this correlate with the high intensity minutes I was concerned about?"
-Episode 2: Sleep Deprivation + Late Night Coffee + Sugar Spike (Month 2, Week 3)
-Duration: 3 days
-Context: High work stress, poor sleep habits, concerning metabolic patterns
-Day 1:
-"Team, having a rough week. Been staying up until 1-2 AM preparing for quarterly reviews. Whoop recovery has been red (20-35%) for three consecutive days. Feeling the impact on cognitive performance."
-"I've been drinking coffee around 9 PM after my evening workout to stay alert for late work sessions. I know this isn't ideal but deadlines are brutal right now."
-"CGM showing some weird patterns - glucose spiking to 160+ around 11 PM even though I haven't eaten since 7 PM. Is the late coffee causing this? My sleep latency has increased to 45+ minutes."
-Day 2:
-"Another terrible night. HRV dropped to 28ms (usually around 45ms). Sleep stages show only 45 minutes of deep sleep. Woke up 8 times according to the data."
-"Advik, the correlation is clear - when I have coffee after 8 PM, my glucose stays elevated until after midnight and sleep quality crashes. But I need the caffeine to function. What are my options?"
-"Resting heart rate has increased from my usual 58 bpm to 68 bpm. Is this just stress or should Dr. Warren be concerned?"
-Day 3:
-"Tried your suggestion of green tea instead of coffee last night. Glucose spike was smaller (peaked at 125 mg/dL vs 165 mg/dL), but still took longer to come down compared to normal evening patterns."
-"Recovery score improved to 58% but still not great. Sleep efficiency up to 81% though. Willing to experiment more with evening routine if you have specific protocols."
-Episode 3: Jetlag from USA Travel (Month 3, Week 2)
-Duration: 4 days
-Context: Business trip to USA, circadian disruption, travel stress
-Day 1 (Travel Day):
-"Flying to San Francisco tonight for client meetings. 17-hour journey with layover. Following the travel protocol Ruby sent - eating last meal at 3 PM Singapore time."
-"CGM showing stable patterns today (80-120 mg/dL range). Want to track how jetlag affects glucose control and sleep architecture over the next week."
-Day 2 (Arrival):
-"Landed in SF 6 hours ago. Following the light exposure protocol - got 20 minutes of morning sun without sunglasses. Feeling surprisingly functional compared to usual jetlag."
-"First night's sleep data is interesting. Only 4.2 hours total sleep but HRV maintained at 41ms. Usually it crashes below 30ms after long flights. The meal timing adjustment might be working."
-"Glucose patterns are erratic - dawn phenomenon kicked in at 4 AM local time (still on Singapore rhythm). Peaked at 145 mg/dL vs my usual 110 mg/dL morning reading."
-Day 4 (Mid-trip):
-"Day 3 in SF. Sleep is improving - got 6.5 hours last night with recovery score of 65%. But glucose control is still off. Post-meal spikes are 20-30 mg/dL higher than normal."
-"Had client dinner last night at 8 PM (9 AM Singapore time). CGM showed glucose didn't come back to baseline until 2 AM. Is this just circadian disruption or should I adjust food choices during travel?"
-"HRV stabilizing around 38-42ms. Not my best but better than previous trips without the protocol."
-Episode 4: Stomach Ache (Month 4, Week 1)
-Duration: 3 days
-Context: Digestive issues, potential food sensitivity, impact on overall metrics
-Day 1:
-"Woke up with significant stomach discomfort and nausea. Hadn't felt this way in months. Trying to correlate with yesterday's meals from my food log."
-"CGM showing unusual pattern - glucose dropped to 68 mg/dL around 3 AM (woke me up), then spiked to 155 mg/dL after I had some crackers. Usually very stable overnight."
-"Whoop data shows sleep was fragmented - 12 wake-ups, only 28 minutes deep sleep. HRV down to 31ms. Could be stress response to whatever's causing the stomach issues."
-Day 2:
-"Stomach pain persisting. Managed to eat light breakfast (oatmeal) but glucose response was exaggerated - peaked at 175 mg/dL vs usual 125 mg/dL for same meal."
-"Carla, looking at my recent food logs - could this be related to the new fiber supplement you recommended? Started it 4 days ago. Also had sushi twice this week, wondering about food safety."
-"Strain score is low today (only 6.2) because I can barely manage light walking. Recovery showing yellow at 55% despite trying to rest."
-Day 3:
-"Feeling 70% better today. Kept to BRAT diet and probiotics. Glucose patterns normalizing - fasting reading back to 85 mg/dL, post-meal spikes more reasonable."
-"Sleep improved significantly - 7.2 hours with recovery score of 78%. HRV bounced back to 44ms. Amazing how quickly metrics recover when the underlying issue resolves."
-"Should I see a GI specialist or was this likely just a 48-hour bug? Want to avoid missing any underlying issues given my focus on metabolic health."
-Episode 5: High Stress Period (Month 5, Week 3)
-Duration: 3 days
-Context: Major work deadline, elevated cortisol, impact across all health metrics
-Day 1:
-"Entering crunch week for our biggest client acquisition of the year. Stress levels through the roof. Whoop showing strain scores of 18-19 daily even with minimal exercise."
-"HRV has been declining steadily - from my usual 45ms baseline to 32ms over the past week. Resting heart rate elevated to 72 bpm. Sleep efficiency dropped to 74%."
-"CGM patterns are concerning. Dawn phenomenon much more pronounced - glucose climbing from 85 to 135 mg/dL without eating. Stress hormones definitely affecting metabolic control."
-Day 2:
-"Had a panic attack yesterday during client presentation - heart rate spiked to 165 bpm for 20 minutes while sitting. Whoop classified it as high strain even though I wasn't exercising."
-"Dr. Warren, should I be concerned about the cardiovascular impact? Blood pressure readings at home showing 145/95 vs my usual 125/80. Is this just acute stress response?"
-"Glucose volatility increasing. Post-meal spikes 30-40 mg/dL higher than normal, and taking longer to come down. Even protein-only meals causing slight elevation."
-Day 3:
-"Presentation went well, deal is likely to close. Stress beginning to subside but metrics still concerning. Recovery score only 42% despite 7+ hours in bed."
-"Tried the breathing exercises Dr. Evans recommended. 10-minute session dropped my heart rate from 78 to 62 bpm - impressive real-time effect visible on Whoop."
-"Advik, can you analyze the correlation between my stress markers and glucose control? Want data to present to Dr. Warren about whether I need medication adjustment."
-Episode 6: High Blood Pressure Episode (Month 6, Week 2)
-Duration: 3 days
-Context: Sustained hypertension, medication considerations, lifestyle interventions
-Day 1:
-"Home BP readings concerning me. Three measurements this morning: 155/98, 148/94, 152/96. Usually run 125-130/75-85. No obvious triggers - slept well, low stress day."
-"Whoop data doesn't show acute stress. HRV at 43ms (normal), recovery 72%. But resting heart rate has crept up to 68 bpm over past two weeks vs usual 58-62 bpm."
-"Dr. Warren, family history of hypertension on father's side. He was on medication by age 50. Am I heading down same path? CGM patterns normal today - fasting 88, post-meal peaks <130."
-Day 2:
-"BP still elevated. Morning readings: 149/92, 144/89, 147/93. Feeling slight headache and fatigue. This isn't normal for me."
-"Correlating with recent data - travel stress from last week, two client dinners with wine, less exercise due to schedule. Could accumulated factors be hitting cardiovascular system?"
-"Advik, can you analyze my HRV trends over past month? Looking for patterns that might predict these BP elevations before they happen."
-Day 3:
-"Implemented your suggestions - extra 30-min walk, reduced sodium, meditation before bed. Morning BP improved: 138/87, 135/85, 139/88. Moving in right direction."
-"Sleep quality better last night - recovery score 81%, HRV up to 47ms. Interesting correlation between better sleep and lower morning BP readings."
-"Dr. Warren, if this doesn't resolve in next few days, should we discuss medication? Want to be proactive given family history, but also explore all lifestyle options first."
-Episode 7: Back Ache & Mattress Issues (Month 7, Week 4)
-Duration: 3 days
-Context: Sleep disruption from physical discomfort, equipment optimization
-Day 1:
-"Woke up with severe lower back pain. Can barely bend over. Sleep data shows I was restless all night - 15 wake-ups, only 35 minutes deep sleep."
-"HRV crashed to 28ms, recovery score 31%. Pain definitely triggering stress response. Glucose slightly elevated this morning (102 mg/dL vs usual 85-90 fasting)."
-"Rachel, this might be related to my mattress. It's 8 years old, and I've been waking up stiff for past few weeks. Could poor sleep surface be affecting recovery metrics?"
-Day 2:
-"Pain persisting. Took ibuprofen which helped mobility but concerned about effects on my health optimization. Sleep position tracking shows I'm changing positions every 20-30 minutes."
-"Strain score low (8.1) because I can barely do normal activities. Heart rate variability improving slightly (32ms) but still well below baseline."
-"Looking at sleep stage data - REM sleep down 40% compared to 30-day average. Deep sleep only 18% of total sleep vs usual 22-25%. Pain definitely disrupting architecture."
-Day 3:
-"Ordered the mattress system Ruby researched. Meanwhile, tried sleeping on the floor last night - surprisingly helped. Got 6.8 hours with recovery score of 68%."
-"Back pain down 60%. Glucose control normalizing - fasting reading 89 mg/dL, HRV up to 39ms. Amazing how quickly metrics respond to better sleep quality."
-"Rachel, want to understand ergonomics of my home office setup too. If mattress was the issue, wondering what else in my environment could be optimized for recovery."
-Episode 8: High Sugar + Diet Plan Request (Month 8, Week 2)
-Duration: 4 days
-Context: Concerning glucose patterns, proactive nutrition optimization, restaurant recommendations
-Day 1:
-"CGM showing concerning patterns this week. Fasting glucose trending higher - 105-115 mg/dL vs my usual 85-95 range. Post-meal spikes reaching 180+ mg/dL."
-"Had business lunch yesterday - glucose peaked at 192 mg/dL after pasta dish. Took 4+ hours to return to baseline. This used to resolve in 2 hours max."
-"Dr. Warren, is this progression toward diabetes? HbA1c was 5.8% three months ago. Family history of type 2 on mother's side. Feeling concerned about metabolic health."
-Day 2:
-"Tried the protein-first strategy Carla suggested. Had chicken salad before bread at lunch. Peak glucose 155 mg/dL vs 185 mg/dL when I eat carbs first. Clear difference."
-"Sleep and HRV normal (recovery 75%, HRV 44ms) so not stress-related. This seems to be pure dietary response changes. Need systematic approach to meal planning."
-"Carla, can you design a specific protocol for my upcoming Singapore meetings? Need restaurant recommendations that align with glucose optimization goals."
-Day 3:
-"Following your meal timing recommendations. Glucose much more stable - staying in 80-140 mg/dL range throughout day. Time-in-range improved from 68% to 89%."
-"Need help with dinner tonight - client meeting at Marina Bay Sands. What restaurants there can accommodate low-glycemic meal preferences? Important deal, can't be too restrictive."
-"Ruby, can you research menus and call ahead? Looking for grilled protein, vegetables, minimal processed carbs. Willing to pay premium for customization."
-Day 4:
-"Dinner was successful - restaurant accommodated perfectly. Glucose peaked at 125 mg/dL after modified fish course. Client didn't even notice the dietary adjustments."
-"One week of optimized eating and glucose control is dramatically better. Average glucose down from 135 to 108 mg/dL. Feeling more energy, better cognitive clarity."
-"Carla, this protocol works. Can we systematize this approach for my travel schedule? Need portable strategies that work across different cuisines and time zones."
-    """.split('\\n')
+    # Set a dummy API key for simulation purposes
+    os.environ["OPENAI_API_KEY"] = "dummy_key"
+
+    print("🎬 Starting Complete Journey Simulation...")
 
-    # Initialize the CompleteJourney with the user's messages
-    complete_journey = CompleteJourney(messages=rohan_messages, num_months=8)
+    # The chronological episodes of the member's messages, streamed from the file during the run
+    complete_journey = CompleteJourney(xml_content=args.xml, num_months=args.months, seed=args.seed)
 
     # Run the simulation
-    results = complete_journey.run()
+    results = complete_journey.run(workers=args.workers, mode=args.mode)
 
     # Print the results in a structured format
     print("\n\n--- Simulation Results ---")
@@ -149,7 +34,7 @@ Day 4:
     print("\n--- Journey Data ---")
     print(json.dumps(results["journey_data"], indent=2))
 
-    print("\n🎉 Simulation Finished!")
+    print(f"\n🎉 Simulation Finished! (seed {results['seed']})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,120 @@
+"""Cohort simulation: N synthetic members driven through their weekly journeys concurrently.
+
+``generate_members`` draws varied profiles (travel cadence, conditions, adherence) from a seed.
+``run_cohort`` simulates every member week by week (weeks of one member stay sequential, members
+run on a thread pool) and reports throughput for capacity planning: members/sec, LLM calls/sec
+(HTTP round trips, so 0 in mock mode; use ``simulation.llm_stub`` for a local model), DB
+writes/sec (rows changed on the workers' connections) and p50/p99 per-week latency.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from agents.group_chat import GroupChatSystem
+from agents.http_client import get_http_client
+from agents.llm_router import LLMRouter
+from data.db import db_write_count
+from data.models import MemberProfile
+from simulation.journey_orchestrator import CONDITION_MESSAGES, JourneyOrchestrator
+
+FIRST_NAMES = ("Amara", "Ben", "Chen", "Divya", "Elena", "Farid", "Grace", "Hiro", "Isla", "Jonas", "Kofi", "Lena")
+# Weeks between trips; 0 never travels
+TRAVEL_CADENCES = (0, 2, 3, 4, 6, 8)
+
+
+def generate_members(n: int, seed: int = 0) -> List[MemberProfile]:
+    rng = random.Random(seed)
+    conditions = sorted(CONDITION_MESSAGES)
+    return [
+        MemberProfile(
+            member_id=f"member-{i:05d}",
+            name=f"{rng.choice(FIRST_NAMES)} {i}",
+            travel_every=rng.choice(TRAVEL_CADENCES),
+            conditions=rng.sample(conditions, rng.randint(0, 3)),
+            adherence=round(rng.uniform(0.3, 0.95), 2),
+        )
+        for i in range(n)
+    ]
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_cohort(
+    members: List[MemberProfile],
+    weeks: int = 34,
+    workers: int = 8,
+    seed: int = 0,
+    persist: bool = True,
+    chat_factory: Optional[Callable[[], GroupChatSystem]] = None,
+) -> Dict:
+    """Simulate ``weeks`` weeks for every member and return throughput and latency figures."""
+    if chat_factory is None:
+        # One router for the whole cohort, trained before the clock starts
+        router = LLMRouter().warm()
+        chat_factory = lambda: GroupChatSystem(use_crewai=False, router=router)  # noqa: E731
+    lock = threading.Lock()
+    week_ms: List[float] = []
+    totals = {"db_writes": 0, "messages": 0, "errors": 0}
+
+    def run_member(index: int, member: MemberProfile):
+        chat_system = chat_factory()
+        orchestrator = JourneyOrchestrator(
+            chat_system=chat_system, rng=random.Random(f"{seed}:{index}"), persist=persist, member=member
+        )
+        writes_before = db_write_count() if persist else 0
+        failed = 0
+        for week in range(1, weeks + 1):
+            start = time.perf_counter()
+            try:
+                report = orchestrator.simulate_week(week)
+            except Exception:  # noqa: BLE001
+                # The first failure of each member is logged; the rest are only counted
+                if not failed:
+                    logging.exception("cohort member %s failed in week %s", member.member_id, week)
+                failed += 1
+                with lock:
+                    totals["errors"] += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                week_ms.append(elapsed)
+                totals["messages"] += report["conversations_count"]
+        orchestrator.flush()
+        if persist:
+            writes = db_write_count() - writes_before
+            with lock:
+                totals["db_writes"] += writes
+
+    llm_before = get_http_client().stats()["requests"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cohort") as pool:
+        for future in [pool.submit(run_member, n, m) for n, m in enumerate(members)]:
+            future.result()
+    wall = time.perf_counter() - start
+    llm_calls = get_http_client().stats()["requests"] - llm_before
+
+    ordered = sorted(week_ms)
+    return {
+        "members": len(members),
+        "weeks": weeks,
+        "workers": workers,
+        "wall_s": round(wall, 3),
+        "member_weeks": len(ordered),
+        "messages": totals["messages"],
+        "errors": totals["errors"],
+        "llm_calls": llm_calls,
+        "db_writes": totals["db_writes"],
+        "members_per_s": round(len(members) / wall, 3) if wall else 0.0,
+        "llm_calls_per_s": round(llm_calls / wall, 2) if wall else 0.0,
+        "db_writes_per_s": round(totals["db_writes"] / wall, 2) if wall else 0.0,
+        "week_p50_ms": round(_percentile(ordered, 0.50), 2),
+        "week_p99_ms": round(_percentile(ordered, 0.99), 2),
+    }
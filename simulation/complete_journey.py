@@ -1,47 +1,169 @@
-from typing import Dict, List
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+from agents.crewai_orchestrator import CrewOrchestrator
+from agents.elyx_agents import AgentRegistry
+from agents.group_chat import GroupChatSystem
+from agents.llm_router import LLMRouter
+from data.persistence import PersistenceManager
 from simulation.journey_orchestrator import JourneyOrchestrator
 from simulation.decision_tree_planner import DecisionTreePlanner
-from simulation.xml_parser import XMLEpisodeParser
+from simulation.xml_parser import XMLEpisodeParser, XMLSource
+
+# Default number of episodes simulated at once (episodes are independent scenarios)
+SIM_WORKERS = int(os.getenv("ELYX_SIM_WORKERS", "1"))
+# "thread" (LLM calls are I/O bound) or "process"
+SIM_MODE = os.getenv("ELYX_SIM_MODE", "thread")
+SIM_MODES = ("thread", "process")
+# Episodes parsed ahead of the pool per worker; bounds memory on long journey files
+SIM_PREFETCH = int(os.getenv("ELYX_SIM_PREFETCH", "2"))
+
+
+def episode_rng(seed: int, index: int) -> random.Random:
+    """The RNG stream of one episode: depends only on the run seed and the episode's position."""
+    return random.Random(f"{seed}:{index}")
+
+
+_shared_lock = threading.Lock()
+_shared: Dict[str, object] = {}
+
+
+def _shared_part(name: str, build: Callable[[], object]):
+    """One instance per process, built by the first episode that needs it."""
+    with _shared_lock:
+        part = _shared.get(name)
+        if part is None:
+            part = _shared[name] = build()
+    return part
+
+
+def episode_chat(use_crewai: bool = True) -> GroupChatSystem:
+    """A chat for one episode: its own agents (so its own memory) over this process's shared,
+    warmed CrewOrchestrator or LLMRouter, which hold no per-conversation state."""
+    if use_crewai:
+        return GroupChatSystem(crew_orchestrator=_shared_part("crew", CrewOrchestrator), agents=AgentRegistry())
+    router = _shared_part("router", lambda: LLMRouter().warm())
+    return GroupChatSystem(use_crewai=False, router=router, agents=AgentRegistry())
+
+
+def run_episode(
+    index: int,
+    episode: Dict,
+    seed: int,
+    chat_factory: Optional[Callable[[], GroupChatSystem]] = None,
+) -> Dict:
+    """Simulate one episode with its own chat state and RNG stream.
+
+    Module level so a process pool can pickle it. Nothing is persisted here; the caller merges
+    episodes back in order and saves once. Without ``chat_factory`` the chat is ``episode_chat()``.
+    """
+    chat_system = chat_factory() if chat_factory is not None else episode_chat()
+    orchestrator = JourneyOrchestrator(chat_system=chat_system, rng=episode_rng(seed, index), persist=False)
+    planner = DecisionTreePlanner()
+    journey_data = []
+
+    print(f"--- Starting Episode: {episode['name']} ---")
+    for message in episode['messages']:
+        # This is a simplified simulation of the back-and-forth conversation
+        # A more complex implementation would handle the interactive flow
+        user_message = message['text']
+        print(f"--- Rohan says: '{user_message}' ---")
+
+        weekly_report = orchestrator.simulate_week(1, user_message) # a mock week
+
+        next_action = planner.get_next_action(weekly_report)
+        if next_action:
+            weekly_report["suggested_action"] = next_action
+            print(f"🧠 Planner suggestion: {next_action}")
+
+        journey_data.append(weekly_report)
+
+    print(f"--- Finished Episode: {episode['name']} ---")
+    return {
+        "conversation_history": chat_system.get_conversation_history(),
+        "journey_data": journey_data,
+    }
+
 
 class CompleteJourney:
-    def __init__(self, xml_content: str, num_months: int = 8):
+    def __init__(
+        self,
+        xml_content: XMLSource,
+        num_months: int = 8,
+        seed: Optional[int] = None,
+        chat_factory: Optional[Callable[[], GroupChatSystem]] = None,
+        persist: bool = True,
+    ):
         self.num_weeks = num_months * 4
-        self.orchestrator = JourneyOrchestrator()
-        self.planner = DecisionTreePlanner()
+        # Read lazily by run(): the XML text, a path or a binary file object
         self.parser = XMLEpisodeParser(xml_content)
-        self.episodes = self.parser.parse_episodes()
+        self.seed = seed if seed is not None else random.randrange(2**31)
+        self.chat_factory = chat_factory
+        self.persistence = PersistenceManager() if persist else None
 
-    def run(self) -> Dict:
-        """
-        Runs the complete journey simulation using the episodes from episodes.xml.
-        """
-        print(f"🚀 Starting Complete Journey Simulation for {self.num_weeks} weeks...")
+    @property
+    def episodes(self) -> List[Dict]:
+        """Every episode, parsed up front. ``run`` streams them instead."""
+        return self.parser.parse_episodes()
 
-        journey_data = []
+    def _results(self, workers: int, mode: str) -> Iterator[Dict]:
+        """Episode results in episode order, simulating episodes as they are parsed.
 
-        for episode in self.episodes:
-            print(f"--- Starting Episode: {episode['name']} ---")
-            for message in episode['messages']:
-                # This is a simplified simulation of the back-and-forth conversation
-                # A more complex implementation would handle the interactive flow
-                user_message = message['text']
-                print(f"--- Rohan says: '{user_message}' ---")
+        At most ``workers * SIM_PREFETCH`` episodes are parsed but not yet merged at any time.
+        """
+        args = ((n, episode, self.seed, self.chat_factory) for n, episode in enumerate(self.parser.iter_episodes()))
+        if workers == 1:
+            for a in args:
+                yield run_episode(*a)
+            return
+        pool_cls = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+        window = workers * max(1, SIM_PREFETCH)
+        with pool_cls(max_workers=workers) as pool:
+            # Submitted in order and collected in order: the merge is deterministic
+            pending: deque = deque()
+            for a in args:
+                pending.append(pool.submit(run_episode, *a))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
 
-                weekly_report = self.orchestrator.simulate_week(1, user_message) # a mock week
+    def run(self, workers: Optional[int] = None, mode: Optional[str] = None) -> Dict:
+        """
+        Runs the complete journey simulation using the episodes from episodes.xml.
 
-                next_action = self.planner.get_next_action(weekly_report)
-                if next_action:
-                    weekly_report["suggested_action"] = next_action
-                    print(f"🧠 Planner suggestion: {next_action}")
+        Episodes are read from the XML incrementally and simulated as they arrive, so the whole
+        file is never parsed into memory first.
 
-                journey_data.append(weekly_report)
+        With ``workers > 1`` episodes run concurrently on a thread (default) or process pool. Each
+        episode gets its own chat state and a seeded RNG stream, and results are merged back in
+        episode order, so a given seed produces the same journey data for any worker count.
+        """
+        workers = max(1, workers or SIM_WORKERS)
+        mode = mode or SIM_MODE
+        if mode not in SIM_MODES:
+            raise ValueError(f"unknown simulation mode: {mode!r}")
+        print(f"🚀 Starting Complete Journey Simulation for {self.num_weeks} weeks "
+              f"(workers={workers}, mode={mode}, seed={self.seed})...")
 
-            print(f"--- Finished Episode: {episode['name']} ---")
+        conversation_history: List[Dict] = []
+        journey_data: List[Dict] = []
+        for result in self._results(workers, mode):
+            conversation_history.extend(result["conversation_history"])
+            journey_data.extend(result["journey_data"])
 
+        if self.persistence is not None and journey_data:
+            self.persistence.save_weekly_report(journey_data[-1]["week"], journey_data[-1])
+            self.persistence.save_conversation_history(conversation_history)
 
         print("🎉 Complete Journey Simulation finished!")
 
         return {
-            "conversation_history": self.orchestrator.chat_system.get_conversation_history(),
+            "conversation_history": conversation_history,
             "journey_data": journey_data,
+            "seed": self.seed,
         }
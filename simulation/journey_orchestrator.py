@@ -1,15 +1,71 @@
+import os
 import random
+import time
+from datetime import datetime
 from typing import Dict, List, Optional
 
-from data.persistence import PersistenceManager
+from data.models import MemberProfile
+from data.persistence import DEFAULT_CONVERSATION_ID, PersistenceManager, default_conversation
 from agents.group_chat import GroupChatSystem
 
+# Messages a member with each condition sends when it flares up (cohort simulations)
+CONDITION_MESSAGES = {
+    "prediabetes": "My CGM showed glucose above 180 after lunch again. What should I change?",
+    "hypertension": "Home blood pressure readings are around 150/95 this week. Should I be worried?",
+    "back_pain": "Lower back pain is back and my sleep is suffering. Any exercises I can do?",
+    "poor_sleep": "Sleep has been terrible, recovery score under 40% for days. What can I try?",
+    "high_cholesterol": "Can we review my LDL numbers and what to change in my diet?",
+}
+CONDITION_FLARE_RATE = 0.15
+
+# Simulated weeks are buffered and written every K weeks or T seconds, whichever comes first
+FLUSH_EVERY_WEEKS = int(os.getenv("ELYX_JOURNEY_FLUSH_WEEKS", "4"))
+FLUSH_EVERY_SECONDS = float(os.getenv("ELYX_JOURNEY_FLUSH_SECONDS", "30"))
+CHECKPOINT_VERSION = 1
+
 
 class JourneyOrchestrator:
-    def __init__(self):
-        self.persistence = PersistenceManager()
-        self.chat_system = GroupChatSystem()
-        self.current_state = self.persistence.load_journey_state()
+    def __init__(
+        self,
+        chat_system: Optional[GroupChatSystem] = None,
+        rng: Optional[random.Random] = None,
+        persist: bool = True,
+        member: Optional[MemberProfile] = None,
+        persistence: Optional[PersistenceManager] = None,
+        flush_every_weeks: Optional[int] = None,
+        flush_every_seconds: Optional[float] = None,
+    ):
+        """``rng`` makes events/messages/metrics reproducible; with ``persist=False`` nothing is
+        written (parallel episode runs persist once, after merging). With a ``member`` profile the
+        journey follows that member's travel cadence, conditions and adherence instead of Rohan's,
+        and its weeks are appended to the member's own conversation.
+
+        Weekly reports and new messages are buffered and written by ``flush()`` every
+        ``flush_every_weeks`` weeks or ``flush_every_seconds`` seconds; call ``flush()`` after
+        driving ``simulate_week`` directly."""
+        self.member = member
+        self.sender = member.name if member is not None else "Rohan"
+        self.persistence = persistence or (PersistenceManager() if persist else None)
+        self.chat_system = chat_system if chat_system is not None else GroupChatSystem()
+        # A private stream by default: restore() must never reseed the process-wide random module
+        self.rng = rng if rng is not None else random.Random()
+        if self.persistence is not None:
+            self.current_state = self.persistence.load_journey_state()
+        else:
+            self.current_state = {"current_week": 1, "total_weeks": 34}
+        self.flush_every_weeks = max(1, flush_every_weeks or FLUSH_EVERY_WEEKS)
+        self.flush_every_seconds = FLUSH_EVERY_SECONDS if flush_every_seconds is None else flush_every_seconds
+        self.conversation_id = default_conversation(self.member.member_id) if self.member is not None else DEFAULT_CONVERSATION_ID
+        self.checkpoint_name: Optional[str] = None  # set by run_full_journey
+        self.last_week = 0
+        self._pending_reports: Dict[int, Dict] = {}
+        self._pending_messages: List[Dict] = []
+        self._pending_weeks = 0
+        self._last_flush = time.monotonic()
+        # Rohan's journey starts the default conversation afresh; members' weeks are appended
+        self._replace_conversation = self.member is None
+        # After restore(), a member's conversation is first rolled back to this many messages
+        self._truncate_at: Optional[int] = None
 
     def simulate_week(self, week: int, user_message: Optional[str] = None) -> Dict:
         print(f"=== Simulating Week {week} ===")
@@ -24,18 +80,112 @@ class JourneyOrchestrator:
         weekly_conversations: List[Dict] = []
         for message in user_messages:
             context = {"week": week, "events": events}
-            conversation = self.chat_system.send_message("Rohan", message, context)
+            if self.member is not None:
+                context["member_id"] = self.member.member_id
+            conversation = self.chat_system.send_message(self.sender, message, context)
             if conversation:
                 weekly_conversations.extend(conversation)
 
         report = self.generate_weekly_report(week, events, weekly_conversations)
 
-        self.persistence.save_weekly_report(week, report)
-        self.persistence.save_conversation_history(self.chat_system.conversation_history)
+        self.last_week = week
+        self._pending_reports[week] = report
+        self._pending_messages.extend(weekly_conversations)
+        self._pending_weeks += 1
+        if (
+            self._pending_weeks >= self.flush_every_weeks
+            or time.monotonic() - self._last_flush >= self.flush_every_seconds
+        ):
+            self.flush()
 
         return report
 
+    def flush(self):
+        """Write buffered reports and messages, then the journey state and checkpoint (if enabled)."""
+        if self.persistence is not None:
+            member_id = self.member.member_id if self.member is not None else None
+            if self._truncate_at is not None:
+                self.persistence.truncate_conversation(self._truncate_at, self.conversation_id, member_id)
+                self._truncate_at = None
+            if self._replace_conversation:
+                self.persistence.save_conversation_history(
+                    list(self.chat_system.conversation_history), self.conversation_id, member_id
+                )
+                self._replace_conversation = False
+            elif self._pending_messages:
+                self.persistence.append_conversation_messages(self._pending_messages, self.conversation_id, member_id)
+            if self.member is None:
+                for week, report in sorted(self._pending_reports.items()):
+                    self.persistence.save_weekly_report(week, report)
+            if self.checkpoint_name is not None and self.last_week:
+                self.current_state = {**self.current_state, "current_week": self.last_week + 1}
+                # journey_state.json is Rohan's; a member's position lives in its own checkpoint
+                if self.member is None:
+                    self.persistence.save_journey_state(self.current_state)
+                self.persistence.save_checkpoint(self.checkpoint_name, self.checkpoint())
+        self._pending_reports.clear()
+        self._pending_messages = []
+        self._pending_weeks = 0
+        self._last_flush = time.monotonic()
+
+    def _memory_member(self) -> str:
+        # The key GroupChatSystem files this journey's turns under in each agent's memory
+        return self.member.member_id if self.member is not None else self.sender.lower()
+
+    def _agent_memories(self) -> Dict:
+        agents = getattr(self.chat_system, "agents", None)
+        if agents is None:
+            return {}
+        names = agents.built() if hasattr(agents, "built") else list(agents)
+        return {name: agents[name].memory for name in names}
+
+    def checkpoint(self) -> Dict:
+        """Everything needed to continue after ``last_week``: RNG state, chat state (history and
+        the agents' memory of this journey), position, and how many messages were persisted."""
+        version, internal, gauss_next = self.rng.getstate()
+        agent_memory = {}
+        for name, memory in self._agent_memories().items():
+            data = memory.export(self._memory_member())
+            if data is not None:
+                agent_memory[name] = data
+        persisted = self.persistence.conversation_length(self.conversation_id) if self.persistence is not None else None
+        return {
+            "version": CHECKPOINT_VERSION,
+            "week": self.last_week,
+            "total_weeks": self.current_state.get("total_weeks", 34),
+            "member_id": self.member.member_id if self.member is not None else None,
+            "rng_state": [version, list(internal), gauss_next],
+            "conversation_history": list(self.chat_system.conversation_history),
+            "agent_memory": agent_memory,
+            "persisted_messages": persisted,
+            "saved_at": datetime.now().isoformat(),
+        }
+
+    def restore(self, state: Dict) -> int:
+        """Continue from a ``checkpoint()``; returns the last completed week."""
+        version, internal, gauss_next = state["rng_state"]
+        self.rng.setstate((version, tuple(internal), gauss_next))
+        self.chat_system.conversation_history = list(state["conversation_history"])
+        member = self._memory_member()
+        for memory in self._agent_memories().values():
+            memory.forget(member)
+        for name, data in state.get("agent_memory", {}).items():
+            self.chat_system.agents[name].memory.load(member, data)
+        self.last_week = int(state["week"])
+        self._pending_reports.clear()
+        self._pending_messages = []
+        self._pending_weeks = 0
+        # Messages flushed after the checkpoint was taken are dropped again. Rohan's conversation
+        # is rewritten from the checkpoint's history; a member's keeps what preceded the journey
+        if self.member is None:
+            self._replace_conversation = True
+        else:
+            self._truncate_at = state.get("persisted_messages")
+        return self.last_week
+
     def generate_weekly_events(self, week: int) -> List[str]:
+        if self.member is not None:
+            return self._member_events(week)
         events: List[str] = []
         if week == 1:
             events.append("onboarding_complete")
@@ -50,9 +200,24 @@ class JourneyOrchestrator:
             events.append("exercise_plan_update")
         return events
 
+    def _member_events(self, week: int) -> List[str]:
+        events: List[str] = []
+        if week == 1:
+            events.append("onboarding_complete")
+        if week in [12, 24, 34]:
+            events.append("quarterly_diagnostic_test")
+        if self.member.travel_every and week % self.member.travel_every == 0:
+            events.append("business_travel")
+        for condition in self.member.conditions:
+            if self.rng.random() < CONDITION_FLARE_RATE:
+                events.append(f"{condition}_flare")
+        return events
+
     def generate_user_messages(self, week: int, events: List[str]) -> List[str]:
+        if self.member is not None:
+            return self._member_messages(events)
         messages: List[str] = []
-        num_messages = random.randint(3, 5)
+        num_messages = self.rng.randint(3, 5)
         for _ in range(num_messages):
             if "leg_injury_reported" in events:
                 messages.append("I twisted my leg at the hotel gym - it's painful and swollen. What should I do?")
@@ -68,11 +233,37 @@ class JourneyOrchestrator:
                     "Can stress really impact my A1C levels?",
                     "What supplements should I consider for better metabolic health?",
                 ]
-                messages.append(random.choice(curiosity_messages))
+                messages.append(self.rng.choice(curiosity_messages))
         return messages
 
+    def _member_messages(self, events: List[str]) -> List[str]:
+        messages: List[str] = []
+        for event in events:
+            condition = event[: -len("_flare")] if event.endswith("_flare") else None
+            if condition in CONDITION_MESSAGES:
+                messages.append(CONDITION_MESSAGES[condition])
+            elif event == "business_travel":
+                messages.append("I'm traveling for work next week. How should I adjust my plan?")
+            elif event == "quarterly_diagnostic_test":
+                messages.append("Just got my test results back. Can we review them together?")
+        if not messages:
+            messages.append(self._checkin_message())
+        return messages
+
+    def _checkin_message(self) -> str:
+        return self.rng.choice(
+            [
+                "Quick check-in: anything I should focus on this week?",
+                "Is it worth adding a second strength session?",
+                "What's a good high-protein breakfast when I'm short on time?",
+            ]
+        )
+
     def generate_weekly_report(self, week: int, events: List[str], conversations: List[Dict]) -> Dict:
-        adherence = random.choice([0.3, 0.5, 0.7, 0.8])
+        if self.member is not None:
+            adherence = round(min(1.0, max(0.0, self.rng.gauss(self.member.adherence, 0.1))), 2)
+        else:
+            adherence = self.rng.choice([0.3, 0.5, 0.7, 0.8])
         blood_sugar_improvement = max(0, (week - 1) * 2)
         return {
             "week": week,
@@ -85,8 +276,8 @@ class JourneyOrchestrator:
                 "weight": 75 - (week * 0.1) if week > 4 else 75,
             },
             "agent_actions": {
-                "doctor_hours": random.randint(8, 15),
-                "coach_hours": random.randint(10, 20),
+                "doctor_hours": self.rng.randint(8, 15),
+                "coach_hours": self.rng.randint(10, 20),
             },
             "recommendations": self.extract_recommendations(conversations),
         }
@@ -94,14 +285,24 @@ class JourneyOrchestrator:
     def extract_recommendations(self, conversations: List[Dict]) -> List[str]:
         recommendations: List[str] = []
         for conv in conversations:
-            if conv.get("sender") != "Rohan" and "recommend" in conv.get("message", "").lower():
+            if conv.get("sender") != self.sender and "recommend" in conv.get("message", "").lower():
                 recommendations.append(f"{conv['sender']}: {conv['message'][:100]}...")
         return recommendations
 
-    def run_full_journey(self):
-        for week in range(1, 35):
+    def run_full_journey(self, resume: bool = False, total_weeks: Optional[int] = None):
+        """Simulate every week, checkpointing at each flush; ``resume`` continues from the last checkpoint."""
+        total_weeks = total_weeks or self.current_state.get("total_weeks", 34)
+        self.checkpoint_name = "journey" if self.member is None else f"journey_{self.member.member_id}"
+        start = 1
+        if resume and self.persistence is not None:
+            state = self.persistence.load_checkpoint(self.checkpoint_name)
+            if state is not None and state.get("version") == CHECKPOINT_VERSION:
+                start = self.restore(state) + 1
+                print(f"Resuming journey from week {start}")
+        for week in range(start, total_weeks + 1):
             report = self.simulate_week(week)
             print(f"Week {week} completed - Adherence: {report['adherence_rate']:.1%}")
+        self.flush()
         print("8-month journey simulation completed!")
 
 
@@ -0,0 +1,73 @@
+"""Local OpenAI-compatible chat completions stub for load tests.
+
+Point ``OPENROUTER_BASE_URL`` at ``stub.url`` and every LLM call in the app takes the real HTTP
+path (connection pool, rate limiter, model pool) but gets a canned reply after ``latency_ms``.
+Router prompts (system prompt listing ``Agents:``) get a JSON routing answer; anything else gets
+a short plain-text reply.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "LLMStub"
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        messages = body.get("messages") or []
+        system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+        last_user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+        if "Agents:" in system:
+            content = json.dumps({"agents": ["Ruby"], "reason": "stub"})
+        else:
+            content = f"Stub reply. I recommend we follow up on: {last_user[:80]}"
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        with self.server.lock:
+            self.server.requests += 1
+        payload = json.dumps(
+            {
+                "id": "stub",
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class LLMStub(ThreadingHTTPServer):
+    """``with LLMStub(latency_ms=50) as stub:`` serves on a free localhost port until exit."""
+
+    daemon_threads = True
+
+    def __init__(self, latency_ms: float = 0.0, port: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/chat/completions"
+
+    def __enter__(self) -> "LLMStub":
+        self._thread = threading.Thread(target=self.serve_forever, name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
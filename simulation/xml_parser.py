@@ -1,31 +1,104 @@
+import io
+import os
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any
+from typing import Any, Dict, IO, Iterator, List, Tuple, Union
+
+# The XML itself (str/bytes), a path to the file, or a binary file object
+XMLSource = Union[str, bytes, "os.PathLike[str]", IO[bytes]]
+
 
 class XMLEpisodeParser:
-    def __init__(self, xml_content: str):
+    """Reads the episodes of a journey XML document.
+
+    ``iter_episodes`` and ``iter_messages`` stream the source with ``iterparse`` and clear each
+    element once it has been handed out, so a long journey file is never held in memory at once.
+    """
+
+    def __init__(self, xml_content: XMLSource):
         self.xml_content = xml_content
 
+    def _open(self) -> Tuple[IO[bytes], bool]:
+        """The source as a binary stream, and whether it was opened here (and must be closed)."""
+        src = self.xml_content
+        if isinstance(src, bytes):
+            return io.BytesIO(src), True
+        if isinstance(src, str) and src.lstrip("\ufeff \t\r\n").startswith("<"):
+            return io.BytesIO(src.encode("utf-8")), True
+        if isinstance(src, (str, os.PathLike)):
+            return open(src, "rb"), True
+        return src, False
+
+    def _iterparse(self) -> Iterator[Tuple[str, ET.Element, int]]:
+        """``(event, element, depth)`` with the document root at depth 0."""
+        stream, owned = self._open()
+        depth = -1
+        try:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                yield event, elem, depth
+                if event == "end":
+                    depth -= 1
+        finally:
+            if owned:
+                stream.close()
+
+    def iter_episodes(self) -> Iterator[Dict[str, Any]]:
+        """Yields each episode as soon as its closing tag has been read."""
+        root = None
+        for event, elem, depth in self._iterparse():
+            if depth == 0:
+                root = elem
+            if event != "end" or depth != 1 or elem.tag != "episode":
+                continue
+            yield {
+                "name": elem.get('name'),
+                "duration": elem.get('duration'),
+                "context": elem.findtext('context'),
+                "messages": [
+                    {"sender": m.get('sender'), "day": m.get('day'), "text": m.text}
+                    for m in elem.iterfind('.//message')
+                ],
+            }
+            # Done with it: drop the subtree so the root never accumulates episodes
+            elem.clear()
+            root.remove(elem)
+
+    def iter_messages(self) -> Iterator[Dict[str, Any]]:
+        """Yields each message (tagged with its episode's name) as soon as it has been read,
+        without waiting for the rest of the episode."""
+        root = None
+        episode = None
+        for event, elem, depth in self._iterparse():
+            if depth == 0:
+                root = elem
+            elif depth == 1 and elem.tag == "episode":
+                if event == "start":
+                    episode = elem
+                else:
+                    elem.clear()
+                    root.remove(elem)
+                    episode = None
+            elif event == "end" and episode is not None and elem.tag == "message":
+                yield {
+                    "episode": episode.get('name'),
+                    "sender": elem.get('sender'),
+                    "day": elem.get('day'),
+                    "text": elem.text,
+                }
+                elem.clear()
+
+    def count_episodes(self) -> int:
+        """Reads the whole source once without keeping it, raising ``ParseError`` if it is not
+        well-formed. A file object is rewound afterwards so its episodes can still be read."""
+        start = None if isinstance(self.xml_content, (str, bytes, os.PathLike)) else self.xml_content.tell()
+        count = sum(1 for _ in self.iter_episodes())
+        if start is not None:
+            self.xml_content.seek(start)
+        return count
+
     def parse_episodes(self) -> List[Dict[str, Any]]:
         """
         Parses the XML content and returns a list of episodes.
         """
-        root = ET.fromstring(self.xml_content)
-
-        episodes = []
-        for episode_elem in root.findall('episode'):
-            episode = {
-                "name": episode_elem.get('name'),
-                "duration": episode_elem.get('duration'),
-                "context": episode_elem.find('context').text,
-                "messages": []
-            }
-            for msg_elem in episode_elem.findall('.//message'):
-                message = {
-                    "sender": msg_elem.get('sender'),
-                    "day": msg_elem.get('day'),
-                    "text": msg_elem.text
-                }
-                episode["messages"].append(message)
-            episodes.append(episode)
-
-        return episodes
+        return list(self.iter_episodes())
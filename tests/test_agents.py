@@ -1,5 +1,6 @@
 import os
 import unittest
+from unittest import mock
 
 os.environ.setdefault("USE_MOCK_RESPONSES", "1")
 
@@ -21,6 +22,28 @@ class TestAgents(unittest.TestCase):
         response = self.dr_warren.respond(message)
         self.assertTrue(len(response) > 0)
 
+    def test_stream_matches_full_response(self):
+        message = "Can you book my next blood test?"
+        streamed = "".join(self.ruby.respond_stream(message))
+        self.assertEqual(streamed, self.ruby.respond(message))
+
+    def test_stream_parses_openrouter_sse(self):
+        lines = [
+            ": OPENROUTER PROCESSING",
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "Hello"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": " Rohan"}}]}',
+            "data: [DONE]",
+        ]
+        response = mock.Mock(status_code=200)
+        response.iter_lines.return_value = iter(lines)
+        with mock.patch.object(self.ruby, "_should_use_mock", return_value=False), mock.patch.object(
+            self.ruby, "_post", return_value=response
+        ):
+            deltas = list(self.ruby.stream_openrouter([{"role": "user", "content": "hi"}], use_cache=False))
+        self.assertEqual(deltas, ["Hello", " Rohan"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from data import db
+from data.persistence import default_conversation
+from simulation.cohort import generate_members, run_cohort
+
+
+class TestCohort(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_profiles_are_seeded_and_varied(self):
+        members = generate_members(30, seed=3)
+        self.assertEqual(members, generate_members(30, seed=3))
+        self.assertEqual(len({m.member_id for m in members}), 30)
+        self.assertGreater(len({m.travel_every for m in members}), 2)
+        self.assertGreater(len({tuple(m.conditions) for m in members}), 2)
+
+    def test_members_run_concurrently_into_their_own_conversations(self):
+        members = generate_members(4, seed=1)
+        with mock.patch.dict(os.environ, {"USE_MOCK_RESPONSES": "1"}), redirect_stdout(StringIO()):
+            report = run_cohort(members, weeks=3, workers=4)
+        self.assertEqual(report["member_weeks"], 12)
+        self.assertEqual(report["errors"], 0)
+        self.assertGreater(report["db_writes"], 0)
+        self.assertGreaterEqual(report["week_p99_ms"], report["week_p50_ms"])
+        owned = {c["id"]: c for c in db.conversations_list()}
+        for m in members:
+            self.assertEqual(owned[default_conversation(m.member_id)]["user_id"], m.member_id)
+        self.assertEqual(sum(c["message_count"] for c in owned.values()), report["messages"])
+
+    def test_first_failure_of_each_member_is_logged(self):
+        class BrokenChat:
+            conversation_history = []
+
+            def send_message(self, sender, message, context=None):
+                raise RuntimeError("model unavailable")
+
+        members = generate_members(2, seed=1)
+        with self.assertLogs(level="ERROR") as logs, redirect_stdout(StringIO()):
+            report = run_cohort(members, weeks=3, workers=2, persist=False, chat_factory=BrokenChat)
+        self.assertEqual(report["errors"], 6)
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("model unavailable", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
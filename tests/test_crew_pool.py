@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from agents import crewai_orchestrator as co
+from agents.crewai_orchestrator import CrewPool
+from agents.model_pool import ModelPool
+
+
+class _FakeCrew:
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self.busy = False
+
+
+class TestCrewPool(unittest.TestCase):
+    def test_crews_are_reused(self):
+        pool = CrewPool(_FakeCrew, size=2)
+        with pool.borrow("Carla") as first:
+            pass
+        with pool.borrow("Carla") as second:
+            pass
+        self.assertIs(first, second)
+        with pool.borrow("Carla", "backup") as other:
+            self.assertEqual(other.model, "backup")
+        stats = pool.stats()
+        self.assertEqual(stats["built"], 2)
+        self.assertEqual(stats["reused"], 1)
+
+    def test_warm_builds_one_per_role(self):
+        pool = CrewPool(_FakeCrew)
+        pool.warm(["Ruby", "Carla"])
+        pool.warm(["Ruby"])
+        self.assertEqual(pool.stats()["built"], 2)
+        with pool.borrow("Ruby"):
+            pass
+        self.assertEqual(pool.stats()["reused"], 1)
+
+    def test_never_lends_a_crew_twice_and_caps_size(self):
+        pool = CrewPool(_FakeCrew, size=2)
+        overlaps = []
+
+        def work():
+            with pool.borrow("Rachel") as crew:
+                overlaps.append(crew.busy)
+                crew.busy = True
+                time.sleep(0.02)
+                crew.busy = False
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(overlaps, [False] * 8)
+        stats = pool.stats()
+        self.assertEqual(stats["built"], 2)
+        self.assertGreater(stats["waited"], 0)
+
+    def test_failed_crew_is_dropped(self):
+        pool = CrewPool(_FakeCrew, size=1)
+        with self.assertRaises(RuntimeError):
+            with pool.borrow("Neel") as crew:
+                raise RuntimeError("kickoff failed")
+        with pool.borrow("Neel") as fresh:
+            self.assertIsNot(fresh, crew)
+        self.assertEqual(pool.stats()["dropped"], 1)
+
+
+class _FakeTemplateCrew:
+    """Crew stand-in that keeps kickoff state on its task, like CrewAI: the description is
+    interpolated in place and the output is stored on the task."""
+
+    copies = 0
+
+    def __init__(self, agents, tasks):
+        self.agents = agents
+        self.tasks = tasks
+
+    def copy(self):
+        _FakeTemplateCrew.copies += 1
+        return _FakeTemplateCrew(self.agents, self.tasks)
+
+    def kickoff(self, inputs):
+        task = self.tasks[0]
+        stale = f" (after {task.output})" if task.output is not None else ""
+        task.description = task.description.format(**inputs)
+        task.output = task.description
+        return f"{self.agents[0]['llm']['model']}: {task.description}{stale}"
+
+
+class TestCrewOrchestratorPool(unittest.TestCase):
+    def test_warm_crews_are_the_ones_ask_borrows(self):
+        fakes = {
+            "Agent": lambda **kw: kw,
+            "Task": lambda **kw: SimpleNamespace(output=None, **kw),
+            "Crew": _FakeTemplateCrew,
+            "ChatOpenAI": lambda **kw: kw,
+            "_crewai_loaded": True,
+        }
+        pool = ModelPool(fallbacks=["backup/model"], hedge=False)
+        with mock.patch.multiple(co, **fakes), mock.patch.object(co, "get_model_pool", return_value=pool), \
+                mock.patch.dict("os.environ", {"OPENROUTER_MODEL": "primary/model", "ELYX_CREW_WARM": "1"}):
+            orch = co.CrewOrchestrator()
+            warmed = orch.crews.stats()
+            self.assertEqual(warmed["built"], 2 * len(co.ROLE_TO_PROMPT))
+            first = orch.ask("Carla", "glucose after dinner")
+            second = orch.ask("Carla", "and after lunch?")
+        stats = orch.crews.stats()
+        self.assertEqual(stats["built"], warmed["built"])
+        self.assertEqual(stats["reused"], 2)
+        # The pooled crew itself ran both turns and nothing from the first leaked into the second
+        self.assertEqual(_FakeTemplateCrew.copies, 0)
+        self.assertEqual(first, "primary/model: glucose after dinner")
+        self.assertEqual(second, "primary/model: and after lunch?")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from data import db
+
+
+class TestDb(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_connection_reused_within_thread(self):
+        before = db.pool_stats()
+        db.issues_list()
+        db.suggestions_list()
+        after = db.pool_stats()
+        self.assertEqual(after["opened"], before["opened"])
+        self.assertGreaterEqual(after["reused"], before["reused"] + 2)
+
+    def test_connection_is_tuned(self):
+        con = db._conn()
+        self.assertEqual(con.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(con.execute("PRAGMA synchronous").fetchone()[0], 1)
+
+    def test_threads_get_own_connection(self):
+        seen = []
+        t = threading.Thread(target=lambda: seen.append((db._conn(), db.pool_stats()["open"])))
+        t.start()
+        t.join()
+        self.assertIsNot(seen[0][0], db._conn())
+        self.assertGreaterEqual(seen[0][1], 2)
+
+    def test_connections_close_when_their_thread_exits(self):
+        db._conn()
+        before = db.pool_stats()
+        threads = [threading.Thread(target=db.issues_list) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        after = db.pool_stats()
+        self.assertEqual(after["opened"], before["opened"] + 20)
+        self.assertEqual(after["open"], before["open"])
+        self.assertEqual(after["closed"], before["closed"] + 20)
+
+    def test_init_db_is_idempotent_and_versioned(self):
+        self.assertEqual(db.schema_version(), db.SCHEMA_VERSION)
+        self.assertEqual(db.init_db(), db.SCHEMA_VERSION)
+        rows = db._conn().execute("SELECT COUNT(*) FROM schema_version").fetchone()[0]
+        self.assertEqual(rows, len(db.MIGRATIONS))
+
+    def test_legacy_database_is_upgraded(self):
+        db.close_connections()
+        db.DB_PATH = os.path.join(self._tmp.name, "legacy.db")
+        con = db._conn()
+        con.execute(
+            "CREATE TABLE issues (id TEXT PRIMARY KEY, user_id TEXT, title TEXT, details TEXT, category TEXT, "
+            "created_at TEXT)"
+        )
+        con.commit()
+        db.init_db()
+        cols = {r[1] for r in con.execute("PRAGMA table_info(issues)").fetchall()}
+        self.assertIn("status", cols)
+        self.assertIn("priority", cols)
+
+    def test_hot_lookups_use_indexes(self):
+        con = db._conn()
+        plan = " ".join(
+            str(r[3])
+            for r in con.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM decision_evidence WHERE decision_id=?", ("x",)
+            ).fetchall()
+        )
+        self.assertIn("idx_decision_evidence_decision", plan)
+        plan = " ".join(
+            str(r[3])
+            for r in con.execute("EXPLAIN QUERY PLAN SELECT * FROM issues ORDER BY created_at DESC").fetchall()
+        )
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_keyset_pagination_with_filters(self):
+        db.issues_add_many(
+            [
+                {
+                    "id": f"i{n:02d}",
+                    "user_id": "rohan" if n % 2 else "other",
+                    "title": f"issue {n}",
+                    "category": "physio",
+                    "created_at": f"2025-01-{n % 5 + 1:02d}T00:00:00",
+                }
+                for n in range(20)
+            ]
+        )
+        seen = []
+        cursor = None
+        while True:
+            page = db.issues_list(user_id="rohan", limit=3, cursor=cursor)
+            seen.extend(page)
+            cursor = db.next_cursor(page, 3)
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 10)
+        self.assertEqual(len({it["id"] for it in seen}), 10)
+        self.assertTrue(all(it["user_id"] == "rohan" for it in seen))
+        keys = [(it["created_at"], it["id"]) for it in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_invalid_cursor_rejected(self):
+        with self.assertRaises(ValueError):
+            db.suggestions_list(limit=10, cursor="not-a-cursor")
+
+    def test_close_by_text_uses_fts_candidates(self):
+        db.issues_add_many(
+            [
+                {"id": "knee", "title": "Knee swelling after run", "details": "", "category": "other"},
+                {"id": "gut", "title": "Bloating at dinner", "details": "", "category": "other"},
+                {"id": "back", "title": "Stiff in the morning", "details": "", "category": "physio"},
+            ]
+        )
+        closed = db.issues_close_by_text("The swelling is gone and feels fine now", reference="r1")
+        self.assertEqual(closed, 1)
+        status = {it["id"]: it["status"] for it in db.issues_list()}
+        self.assertEqual(status, {"knee": "resolved", "gut": "open", "back": "open"})
+        # Category hint: any physio issue is a candidate when the message mentions pain
+        self.assertEqual(db.issues_close_by_text("pain feels better"), 1)
+        # Edits are reflected in the index
+        db.issues_update("gut", {"title": "Reflux at dinner"})
+        self.assertEqual(db.issues_close_by_text("bloating resolved"), 0)
+        self.assertEqual(db.issues_close_by_text("reflux resolved"), 1)
+
+    def test_close_by_text_scores_bm25_and_reads_every_match(self):
+        filler = [
+            {"id": f"f{n}", "title": f"Sleep log {n}", "details": "", "category": "other"} for n in range(20)
+        ]
+        db.issues_add_many(
+            [{"id": "run", "title": "Knees ache when running", "details": "", "category": "other"}, *filler],
+            dedupe=False,
+        )
+        # No word of the title appears in the message; only the stemmed BM25 match ("runs" ~ "running")
+        old_weight = db.ISSUE_MATCH_BM25_WEIGHT
+        db.ISSUE_MATCH_BM25_WEIGHT = 0
+        try:
+            self.assertEqual(db.issues_close_by_text("runs feel fine now"), 0)
+        finally:
+            db.ISSUE_MATCH_BM25_WEIGHT = old_weight
+        self.assertEqual(db.issues_close_by_text("runs feel fine now"), 1)
+        # Every matching issue is rescored, however many there are
+        db.issues_add_many(
+            [{"id": f"k{n}", "title": f"Knee swelling {n}", "details": "", "category": "other"} for n in range(250)],
+            dedupe=False,
+        )
+        self.assertEqual(db.issues_close_by_text("The knee swelling is gone now"), 250)
+
+    def test_routing_log_keeps_newest_rows(self):
+        with mock.patch.object(db, "ROUTING_LOG_MAX_ROWS", 3):
+            for n in range(5):
+                db.routing_log_add(f"message {n}", ["Ruby"], "llm", 0.9, 1.0)
+        self.assertEqual([r["message"] for r in db.routing_log_list()], ["message 4", "message 3", "message 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
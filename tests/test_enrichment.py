@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from data import db
+from backend.enrichment import EnrichmentQueue
+
+
+class TestEnrichmentQueue(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_inline_job_runs_and_completes(self):
+        seen = []
+        queue = EnrichmentQueue(workers=0)
+        queue.register("echo", lambda payload, final: seen.append(payload["n"]))
+        queue.enqueue("echo", {"n": 1}, conversation_id="c1", message_index=3)
+        self.assertEqual(seen, [1])
+        jobs = db.jobs_list("c1", 3)
+        self.assertEqual([j["status"] for j in jobs], ["done"])
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        calls = []
+
+        def flaky(payload, final):
+            calls.append(final)
+            raise RuntimeError("boom")
+
+        queue = EnrichmentQueue(workers=0, max_attempts=2)
+        queue.register("flaky", flaky)
+        job_id = queue.enqueue("flaky", {})
+        job = db.jobs_list(status="queued")[0]
+        self.assertEqual((job["id"], job["attempts"], job["last_error"]), (job_id, 1, "boom"))
+        # Make the retry due now instead of after the backoff
+        with db._conn() as con:
+            con.execute("UPDATE jobs SET run_after=created_at")
+        queue.run_pending()
+        self.assertEqual(calls, [False, True])
+        self.assertEqual(db.jobs_list(status="failed")[0]["attempts"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agents.fast_router import FastRouter, episode_examples, logged_examples
+from agents.llm_router import LLMRouter
+from data import db
+
+
+class TestFastRouter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fast = FastRouter.from_sources(include_log=False)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_episode_messages_addressing_an_agent_are_labelled(self):
+        labels = {tuple(agents) for _, agents in episode_examples()}
+        self.assertIn(("Dr. Warren",), labels)
+        self.assertIn(("Carla",), labels)
+
+    def test_confident_on_clear_messages(self):
+        agents, confidence = self.fast.route("My HRV dropped after travel")
+        self.assertEqual(agents[0], "Advik")
+        self.assertGreater(confidence, 0.6)
+        self.assertAlmostEqual(sum(self.fast.predict("anything").values()), 1.0)
+
+    def test_llm_only_below_threshold_and_decisions_are_logged(self):
+        router = LLMRouter(fast_router=self.fast)
+        with mock.patch.object(router.router, "call_openrouter", return_value='{"agents": ["Carla"]}') as llm, \
+                mock.patch.object(router.router, "_should_use_mock", return_value=False):
+            self.assertEqual(router.route("My HRV dropped after travel"), ["Advik"])
+            llm.assert_not_called()
+            router.fast_threshold = 1.01
+            self.assertEqual(router.route("What should I eat before my flight?"), ["Carla"])
+            llm.assert_called_once()
+        sources = [r["source"] for r in db.routing_log_list()]
+        self.assertEqual(sources, ["llm", "fast"])
+        self.assertEqual(logged_examples(), [("What should I eat before my flight?", ["Carla"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
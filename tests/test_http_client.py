@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from agents.base_agent import BaseAgent
+from agents.http_client import OpenRouterHttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = []
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        _Handler.peers.append(self.client_address[1])
+        body = json.dumps({"choices": [{"message": {"content": "pong"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        _Handler.peers = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = OpenRouterHttpClient(pool_maxsize=4, timeout=5)
+        self.env = mock.patch.dict(
+            os.environ,
+            {
+                "USE_MOCK_RESPONSES": "0",
+                "OPENROUTER_API_KEY": "test",
+                "OPENROUTER_BASE_URL": f"http://127.0.0.1:{self.server.server_port}/chat",
+            },
+        )
+        self.env.start()
+        self.patch = mock.patch("agents.base_agent.get_http_client", return_value=self.client)
+        self.patch.start()
+        self.agent = BaseAgent("Tester", "Test", "You test.")
+        self.agent.cache_ttl = 0
+
+    def tearDown(self):
+        self.patch.stop()
+        self.env.stop()
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_sync_calls_reuse_connection_and_report_timing(self):
+        seen = []
+        self.client.add_timing_hook(seen.append)
+        msgs = [{"role": "user", "content": "ping"}]
+        self.assertEqual(self.agent.call_openrouter(msgs), "pong")
+        self.assertEqual(self.agent.call_openrouter(msgs), "pong")
+        self.assertEqual(len(set(_Handler.peers)), 1)
+        self.assertEqual([(i["agent"], i["status"], i["mode"]) for i in seen], [("Tester", 200, "sync")] * 2)
+        self.assertEqual(self.client.stats()["requests"], 2)
+
+    def test_async_call(self):
+        async def run():
+            try:
+                return await self.agent.acall_openrouter([{"role": "user", "content": "ping"}])
+            finally:
+                await self.client.aclose()
+
+        self.assertEqual(asyncio.run(run()), "pong")
+
+    def test_async_calls_across_event_loops(self):
+        clients = []
+
+        async def run():
+            reply = await self.agent.acall_openrouter([{"role": "user", "content": "ping"}])
+            clients.append(self.client._async_client())
+            return reply
+
+        # No aclose(): the first loop's client is dropped once its loop has closed
+        self.assertEqual(asyncio.run(run()), "pong")
+        self.assertEqual(asyncio.run(run()), "pong")
+        self.assertIsNot(clients[0], clients[1])
+        self.assertEqual(len(self.client._async_clients), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
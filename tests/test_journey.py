@@ -0,0 +1,136 @@
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from agents.base_agent import BaseAgent
+from data import db
+from data.models import MemberProfile
+from data.persistence import PersistenceManager
+from simulation.journey_orchestrator import JourneyOrchestrator
+
+
+class EchoChat:
+    """Replies depend on Ruby's memory of the member, as a real agent's prompt does."""
+
+    def __init__(self, fail_at_week=None):
+        self.conversation_history = []
+        self.fail_at_week = fail_at_week
+        self.agents = {"Ruby": BaseAgent("Ruby", "Test", "You test.")}
+
+    def send_message(self, sender, message, context=None):
+        if context and context.get("week") == self.fail_at_week:
+            raise RuntimeError("worker crashed")
+        member = (context or {}).get("member_id") or sender.lower()
+        memory = self.agents["Ruby"].memory
+        summary, turns = memory.recall(member)
+        reply = f"re: {message} ({len(turns)} turns, summary {len(summary)})"
+        memory.add(member, message, reply)
+        turn = [{"sender": sender, "message": message}, {"sender": "Ruby", "message": reply}]
+        self.conversation_history.extend(turn)
+        return turn
+
+    def get_conversation_history(self):
+        return self.conversation_history
+
+
+class TestJourneyPersistence(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def _orchestrator(self, data_dir, chat=None, every=2, member=None):
+        return JourneyOrchestrator(
+            chat_system=chat or EchoChat(),
+            rng=random.Random(5),
+            member=member,
+            persistence=PersistenceManager(data_dir),
+            flush_every_weeks=every,
+            flush_every_seconds=3600,
+        )
+
+    def test_weeks_are_buffered_until_flush(self):
+        orchestrator = self._orchestrator(self._tmp.name, every=3)
+        with redirect_stdout(StringIO()):
+            orchestrator.simulate_week(1)
+            orchestrator.simulate_week(2)
+            self.assertEqual(db.messages_count("default"), 0)
+            self.assertFalse(os.path.exists(os.path.join(self._tmp.name, "week_01_report.json")))
+            orchestrator.simulate_week(3)
+            flushed = db.messages_count("default")
+            self.assertEqual(flushed, len(orchestrator.chat_system.conversation_history))
+            orchestrator.simulate_week(4)
+            orchestrator.flush()
+        self.assertGreater(db.messages_count("default"), flushed)
+        self.assertTrue(os.path.exists(os.path.join(self._tmp.name, "week_04_report.json")))
+
+    def test_resume_continues_where_the_crash_left_off(self):
+        reference_dir = os.path.join(self._tmp.name, "reference")
+        crash_dir = os.path.join(self._tmp.name, "crash")
+        with redirect_stdout(StringIO()):
+            reference = self._orchestrator(reference_dir)
+            reference.run_full_journey(total_weeks=10)
+            expected = list(reference.chat_system.conversation_history)
+            db.close_connections()
+
+            db.DB_PATH = os.path.join(crash_dir, "elyx.db")
+            with self.assertRaises(RuntimeError):
+                self._orchestrator(crash_dir, EchoChat(fail_at_week=7)).run_full_journey(total_weeks=10)
+            pm = PersistenceManager(crash_dir)
+            self.assertEqual(pm.load_checkpoint("journey")["week"], 6)
+            self.assertEqual(pm.load_journey_state()["current_week"], 7)
+
+            resumed = self._orchestrator(crash_dir)
+            resumed.run_full_journey(resume=True, total_weeks=10)
+        # Message ids are per run; everything else matches the uninterrupted run
+        strip = lambda msgs: [(m["sender"], m["message"]) for m in msgs]  # noqa: E731
+        self.assertEqual(strip(resumed.chat_system.conversation_history), strip(expected))
+        self.assertEqual(strip(db.messages_list("default")), strip(expected))
+        with open(os.path.join(reference_dir, "week_10_report.json")) as a, open(
+            os.path.join(crash_dir, "week_10_report.json")
+        ) as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_member_resume_keeps_earlier_messages_and_journey_state(self):
+        member = MemberProfile(member_id="amara", name="Amara", travel_every=3, conditions=[], adherence=0.8)
+        conversation = "amara:default"
+        earlier = [{"sender": "Amara", "message": "hello before the journey"}]
+        with redirect_stdout(StringIO()):
+            reference = self._orchestrator(self._tmp.name, member=member)
+            reference.run_full_journey(total_weeks=10)
+            expected = [(m["sender"], m["message"]) for m in reference.chat_system.conversation_history]
+            db.close_connections()
+
+            db.DB_PATH = os.path.join(self._tmp.name, "crash", "elyx.db")
+            pm = PersistenceManager(os.path.join(self._tmp.name, "crash"))
+            pm.append_conversation_messages(earlier, conversation, "amara")
+            with self.assertRaises(RuntimeError):
+                self._orchestrator(pm.data_dir, EchoChat(fail_at_week=7), member=member).run_full_journey(total_weeks=10)
+            self._orchestrator(pm.data_dir, member=member).run_full_journey(resume=True, total_weeks=10)
+        self.assertFalse(os.path.exists(os.path.join(pm.data_dir, "journey_state.json")))
+        self.assertEqual(pm.load_checkpoint("journey_amara")["week"], 10)
+        stored = [(m["sender"], m["message"]) for m in db.messages_list(conversation)]
+        self.assertEqual(stored, [("Amara", "hello before the journey")] + expected)
+
+    def test_default_rng_leaves_global_random_alone(self):
+        with redirect_stdout(StringIO()):
+            source = JourneyOrchestrator(chat_system=EchoChat(), persist=False)
+            source.simulate_week(1)
+            state = source.checkpoint()
+        random.seed(11)
+        expected = random.random()
+        random.seed(11)
+        JourneyOrchestrator(chat_system=EchoChat(), persist=False).restore(state)
+        self.assertEqual(random.random(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from agents.elyx_agents import AgentOrchestrator, UrgencyDetector, UrgencyLevel
+from data.keywords import KeywordMatcher, classify, hit_categories
+from backend.enrichment import fallback_issues
+
+
+class TestKeywords(unittest.TestCase):
+    def test_word_boundaries_and_inflections(self):
+        hits = classify("Thanks for the feedback, ongoing backpack trips, three meals a day")
+        self.assertNotIn("issue.category.physio", hits)
+        self.assertNotIn("issue.improvement", hits)
+        self.assertEqual(hits["route.Carla"], ("meal",))
+
+    def test_overlapping_keywords_all_reported(self):
+        matcher = KeywordMatcher({"a": ["blood pressure", "less pain"], "b": ["blood", "pain"]})
+        self.assertEqual(matcher.scan("Blood pressure fine, less pain"), {
+            "a": ["blood pressure", "less pain"],
+            "b": ["blood", "pain"],
+        })
+
+    def test_call_sites(self):
+        self.assertEqual(UrgencyDetector.detect_urgency("Severe chest pain since morning"), UrgencyLevel.CRITICAL)
+        self.assertEqual(UrgencyDetector.detect_urgency("Quick question about travel"), UrgencyLevel.MEDIUM)
+        self.assertEqual(AgentOrchestrator().route_message("Can you book my blood test?"), ["Ruby", "Dr. Warren"])
+        self.assertEqual(AgentOrchestrator().route_message("Loved the feedback"), ["Ruby"])
+        self.assertEqual(hit_categories("My knee and sleep", "issue.hint."), ["physio", "performance"])
+        self.assertEqual(fallback_issues("My back is killing me after the workout")[0]["category"], "physio")
+        self.assertEqual(fallback_issues("The knee pain is gone"), [])
+
+    def test_classify_is_cached(self):
+        classify.cache_clear()
+        classify("sleep is poor")
+        classify("sleep is poor")
+        self.assertEqual(classify.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agents.base_agent import BaseAgent
+from agents.elyx_agents import CarlaAgent
+from agents.llm_cache import LLMResponseCache
+from agents.model_pool import ModelPool
+from data import db
+
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        self.cache = LLMResponseCache(memory_entries=2, disk_entries=100, default_ttl=60, enabled=True)
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_key_depends_on_model_temperature_and_messages(self):
+        msgs = [{"role": "user", "content": "hi"}]
+        key = self.cache.key("m", 0.7, msgs)
+        self.assertEqual(key, self.cache.key("m", 0.7, [{"content": "hi", "role": "user"}]))
+        self.assertNotEqual(key, self.cache.key("m", 0.2, msgs))
+        self.assertNotEqual(key, self.cache.key("other", 0.7, msgs))
+
+    def test_memory_lru_then_disk_tier(self):
+        for k in ("a", "b", "c"):
+            self.cache.put(k, k.upper())
+        self.assertEqual(self.cache.get("a"), "A")  # evicted from memory, served from disk
+        self.assertEqual(self.cache.get("a"), "A")
+        stats = self.cache.stats()
+        self.assertEqual((stats["disk_hits"], stats["memory_hits"]), (1, 1))
+        self.assertEqual(stats["memory_evictions"], 2)
+        # A fresh process only has the disk tier
+        self.assertEqual(LLMResponseCache(default_ttl=60, enabled=True).get("c"), "C")
+
+    def test_ttl_expiry_and_disk_eviction(self):
+        with mock.patch("agents.llm_cache.time.time", return_value=1000.0):
+            self.cache.put("short", "x", ttl=5)
+            self.cache.put("forever", "y", ttl=-1)
+        with mock.patch("agents.llm_cache.time.time", return_value=1010.0):
+            self.assertIsNone(self.cache.get("short"))
+            self.assertEqual(self.cache.get("forever"), "y")
+        for n in range(5):
+            db.llm_cache_put(f"k{n}", None, "v", None, 2000.0 + n)
+        self.assertEqual(db.llm_cache_evict(3, 3000.0), 3)
+        self.assertIsNone(db.llm_cache_get("forever", 3000.0))
+        self.assertIsNotNone(db.llm_cache_get("k4", 3000.0))
+
+    def test_call_openrouter_served_from_cache(self):
+        agent = BaseAgent("Tester", "Test", "You test.")
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"choices": [{"message": {"content": "pong"}}]}
+        msgs = [{"role": "user", "content": "ping"}]
+        with mock.patch("agents.base_agent.get_llm_cache", return_value=self.cache), mock.patch.object(
+            agent, "_should_use_mock", return_value=False
+        ), mock.patch.object(agent, "_post", return_value=response) as post, mock.patch.dict(
+            os.environ, {"OPENROUTER_TEMPERATURE": "0"}
+        ):
+            self.assertEqual(agent.call_openrouter(msgs), "pong")
+            self.assertEqual(agent.call_openrouter(msgs), "pong")
+            self.assertEqual(post.call_count, 1)
+            agent.call_openrouter(msgs, use_cache=False)
+            agent.cache_ttl = 0
+            agent.call_openrouter(msgs)
+            self.assertEqual(post.call_count, 3)
+
+    def test_fallback_reply_is_not_cached_under_the_primary_model(self):
+        agent = BaseAgent("Tester", "Test", "You test.")
+        msgs = [{"role": "user", "content": "ping"}]
+
+        def post(data, stream=False):
+            if data["model"] == "primary/model":
+                raise RuntimeError("primary down")
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"choices": [{"message": {"content": f"from {data['model']}"}}]}
+            return response
+
+        pool = ModelPool(fallbacks=["backup/model"], hedge=False)
+        with mock.patch("agents.base_agent.get_llm_cache", return_value=self.cache), mock.patch(
+            "agents.base_agent.get_model_pool", return_value=pool
+        ), mock.patch.object(agent, "_should_use_mock", return_value=False), mock.patch.object(
+            agent, "_post", side_effect=post
+        ), mock.patch.dict(os.environ, {"OPENROUTER_TEMPERATURE": "0", "OPENROUTER_MODEL": "primary/model"}):
+            self.assertEqual(agent.call_openrouter(msgs), "from backup/model")
+            data = agent._request_body(msgs, None)
+        self.assertIsNone(self.cache.get(self.cache.key("primary/model", data["temperature"], msgs)))
+        self.assertEqual(self.cache.get(self.cache.key("backup/model", data["temperature"], msgs)), "from backup/model")
+
+    def test_sampled_and_persona_replies_are_not_cached_by_default(self):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"choices": [{"message": {"content": "pong"}}]}
+        msgs = [{"role": "user", "content": "ping"}]
+        for agent, temperature in ((BaseAgent("Tester", "Test", "You test."), "0.7"), (CarlaAgent(), "0")):
+            with mock.patch("agents.base_agent.get_llm_cache", return_value=self.cache), mock.patch.object(
+                agent, "_should_use_mock", return_value=False
+            ), mock.patch.object(agent, "_post", return_value=response) as post, mock.patch.dict(
+                os.environ, {"OPENROUTER_TEMPERATURE": temperature}
+            ):
+                agent.call_openrouter(msgs)
+                agent.call_openrouter(msgs)
+                self.assertEqual(post.call_count, 2)
+        self.assertEqual(self.cache.stats()["stores"], 0)
+
+    def test_disk_hits_touch_in_batches(self):
+        cache = LLMResponseCache(memory_entries=0, default_ttl=60, enabled=True, touch_batch=3)
+        for k in ("a", "b", "c"):
+            cache.put(k, k)
+        con = db._conn()
+        before = con.execute("SELECT SUM(last_used_at) FROM llm_cache").fetchone()[0]
+        changes = con.total_changes
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(con.total_changes, changes)
+        cache.get("c")
+        self.assertEqual(cache.stats()["touch_flushes"], 1)
+        self.assertGreaterEqual(con.execute("SELECT SUM(last_used_at) FROM llm_cache").fetchone()[0], before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import unittest
+from unittest import mock
+
+from agents.base_agent import BaseAgent
+from agents.memory import AgentMemory, extractive_summary
+from agents.prompting import count_tokens
+
+
+class TestAgentMemory(unittest.TestCase):
+    def test_buffer_is_bounded_and_compacted(self):
+        memory = AgentMemory("Rachel", turns=3, compact_every=3, summary_tokens=80)
+        for n in range(50):
+            memory.add("rohan", f"Message {n} about my week.", f"Reply {n}. Keep going.")
+        summary, turns = memory.recall("rohan")
+        self.assertEqual([u for u, _ in turns], [f"Message {n} about my week." for n in (47, 48, 49)])
+        self.assertTrue(summary)
+        self.assertLessEqual(count_tokens(summary), 80)
+        stats = memory.stats()
+        self.assertLessEqual(stats["turns"], 5)
+        self.assertEqual(stats["compacted"] + stats["turns"], 50)
+
+    def test_salient_lines_outlive_small_talk(self):
+        turns = [("My knee pain is back after running.", "Ice it and rest.")]
+        turns += [(f"Thanks, chat {n}.", "You're welcome.") for n in range(30)]
+        summary = extractive_summary("", turns, 60, "Rachel")
+        self.assertIn("knee pain", summary)
+        self.assertLessEqual(count_tokens(summary), 60)
+
+    def test_members_are_separate_and_capped(self):
+        memory = AgentMemory(turns=2, max_members=2)
+        memory.add("a", "hi from a", "hello a")
+        memory.add("b", "hi from b", "hello b")
+        memory.add("c", "hi from c", "hello c")
+        self.assertEqual(memory.recall("a"), ("", []))
+        self.assertEqual(memory.recall("c")[1], [("hi from c", "hello c")])
+
+    def test_llm_summarizer_failure_falls_back(self):
+        def broken(summary, turns):
+            raise RuntimeError("model down")
+
+        memory = AgentMemory("Carla", turns=1, compact_every=1, summarizer=broken)
+        memory.add(None, "Glucose spiked after rice.", "Try a walk after meals.")
+        memory.add(None, "Will do.", "Great.")
+        self.assertIn("Glucose spiked", memory.recall(None)[0])
+
+
+class TestAgentPromptMemory(unittest.TestCase):
+    def test_respond_replays_recent_turns(self):
+        with mock.patch.dict(os.environ, {"USE_MOCK_RESPONSES": "1"}):
+            agent = BaseAgent("Carla", "Nutritionist", "You are Carla.")
+            agent.respond("First question", {"member_id": "rohan"})
+            agent.respond("Other member", {"member_id": "amara"})
+            messages = agent._build_messages("Second question", None, "rohan")
+        self.assertEqual(messages[0]["content"], "You are Carla.")
+        self.assertEqual([m["role"] for m in messages[1:]], ["user", "assistant", "user"])
+        self.assertEqual(messages[1]["content"], "First question")
+
+
+if __name__ == "__main__":
+    unittest.main()
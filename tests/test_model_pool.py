@@ -0,0 +1,86 @@
+import asyncio
+import time
+import unittest
+
+from agents.model_pool import ModelPool
+
+
+def _pool(**kw):
+    kw.setdefault("fallbacks", ["backup"])
+    kw.setdefault("hedge_min_ms", 50)
+    kw.setdefault("hedge_max_ms", 100)
+    kw.setdefault("min_calls", 3)
+    kw.setdefault("cooldown", 0.2)
+    pool = ModelPool(hedge=True, **kw)
+    pool.primary = lambda: "primary"  # type: ignore[method-assign]
+    return pool
+
+
+class TestModelPool(unittest.TestCase):
+    def test_hedges_slow_primary(self):
+        pool = _pool()
+
+        def call(model):
+            time.sleep(0.5 if model == "primary" else 0.01)
+            return model
+
+        start = time.monotonic()
+        self.assertEqual(pool.call(call), "backup")
+        self.assertLess(time.monotonic() - start, 0.4)
+        stats = pool.stats()
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 1))
+
+    def test_falls_back_on_error_and_opens_breaker(self):
+        pool = _pool()
+
+        def call(model):
+            if model == "primary":
+                raise RuntimeError("boom")
+            return model
+
+        for _ in range(3):
+            self.assertEqual(pool.call(call), "backup")
+        self.assertEqual(pool.stats()["models"]["primary"]["state"], "open")
+        self.assertEqual(pool.candidates(), ["backup"])
+        # After the cooldown a single probe is let through and closes the breaker on success
+        time.sleep(0.25)
+        self.assertEqual(pool.candidates(), ["primary", "backup"])
+        self.assertEqual(pool.call(lambda model: model), "primary")
+        self.assertEqual(pool.stats()["models"]["primary"]["state"], "closed")
+
+    def test_latency_drives_ordering(self):
+        pool = _pool(hedge_max_ms=10000)
+        for _ in range(3):
+            pool.record("primary", 900, True)
+            pool.record("backup", 100, True)
+        self.assertEqual(pool.candidates(), ["backup", "primary"])
+        self.assertEqual(pool.hedge_delay("primary"), 0.9)
+        self.assertEqual(pool.stats()["models"]["backup"]["histogram"]["<=250"], 3)
+
+    def test_all_fail_raises_last_error(self):
+        pool = _pool()
+
+        def call(model):
+            raise RuntimeError(model)
+
+        with self.assertRaises(RuntimeError):
+            pool.call(call)
+        self.assertEqual(pool.stats()["failures"], 1)
+
+    def test_async_hedge(self):
+        pool = _pool()
+
+        async def call(model):
+            await asyncio.sleep(0.5 if model == "primary" else 0.01)
+            return model
+
+        self.assertEqual(asyncio.run(pool.acall(call)), "backup")
+
+    def test_single_model_is_plain_call(self):
+        pool = _pool(fallbacks=[])
+        self.assertEqual(pool.call(lambda model: model), "primary")
+        self.assertEqual(pool.stats()["hedged"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from data import db
+from data.near_dup import band_keys, jaccard, tokens
+
+
+def _issue(n, title, user="rohan", category="physio", conversation="c1"):
+    return {
+        "id": f"{conversation}-{n}",
+        "user_id": user,
+        "title": title,
+        "details": "",
+        "category": category,
+        "conversation_id": conversation,
+        "message_index": n,
+        "message_timestamp": f"2025-01-{n + 1:02d}T09:00:00",
+    }
+
+
+class TestNearDupSignatures(unittest.TestCase):
+    def test_paraphrases_share_a_band(self):
+        a = tokens("Knee pain after running")
+        b = tokens("knee pain after runs")
+        self.assertGreaterEqual(jaccard(a, b), 0.5)
+        self.assertTrue(set(band_keys(a)) & set(band_keys(b)))
+
+    def test_unrelated_items_are_dissimilar(self):
+        self.assertLess(jaccard(tokens("Knee pain after running"), tokens("Lower back stiffness")), 0.5)
+        self.assertEqual(band_keys(tokens("")), [])
+
+
+class TestNearDupMerge(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_repeat_mentions_collapse_into_one_issue(self):
+        titles = ["Knee pain after running", "knee pain after runs", "Knee pain after my run"]
+        for n in range(10):
+            db.issues_add_many([_issue(n, titles[n % len(titles)])])
+        rows = db.issues_list(user_id="rohan")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], "c1-0")
+        self.assertEqual(rows[0]["mention_count"], 10)
+        self.assertEqual(rows[0]["last_message_index"], 9)
+
+    def test_other_user_category_or_topic_is_not_merged(self):
+        stored = db.issues_add_many(
+            [
+                _issue(0, "Knee pain after running"),
+                _issue(1, "Knee pain after running", user="amara"),
+                _issue(2, "Knee pain after running", category="performance"),
+                _issue(3, "Bloating at dinner"),
+            ]
+        )
+        self.assertEqual(stored, ["c1-0", "c1-1", "c1-2", "c1-3"])
+
+    def test_resolved_issue_does_not_absorb_mentions(self):
+        db.issues_add_many([_issue(0, "Knee pain after running")])
+        db.issues_update_progress("c1-0", "resolved", 100)
+        self.assertEqual(db.issues_add_many([_issue(1, "Knee pain after running")]), ["c1-1"])
+
+    def test_edited_issue_matches_its_new_text(self):
+        db.issues_add_many([_issue(0, "Knee pain after running")])
+        self.assertTrue(db.issues_update("c1-0", {"title": "Shoulder stiffness when lifting"}))
+        # The old wording no longer merges into it; the new wording does
+        self.assertEqual(db.issues_add_many([_issue(1, "Knee pain after running")]), ["c1-1"])
+        self.assertEqual(db.issues_add_many([_issue(2, "Shoulder stiffness when lifting weights")]), ["c1-0"])
+        db.issues_update("c1-0", {"category": "performance"})
+        self.assertEqual(db.issues_add_many([_issue(3, "Shoulder stiffness when lifting")]), ["c1-3"])
+
+    def test_retry_is_idempotent(self):
+        db.issues_add_many([_issue(0, "Knee pain after running")])
+        item = _issue(1, "knee pain after runs")
+        self.assertEqual(db.issues_add_many([item]), ["c1-0"])
+        self.assertEqual(db.issues_add_many([item]), ["c1-0"])
+        self.assertEqual(db.issues_list()[0]["mention_count"], 2)
+
+    def test_suggestions_merge_while_open(self):
+        def suggestion(n, title):
+            return {
+                "id": f"s{n}", "user_id": "rohan", "agent": "Carla", "title": title, "details": None,
+                "category": "nutrition", "status": "proposed", "created_at": f"2025-01-0{n + 1}",
+                "conversation_id": "c1", "message_index": n, "message_timestamp": None, "source": "llm",
+                "origin": "agent_reply", "source_message": None, "context_json": None,
+            }
+
+        self.assertEqual(db.suggestions_add_many([suggestion(0, "Add protein to breakfast")]), ["s0"])
+        self.assertEqual(db.suggestions_add_many([suggestion(1, "Add more protein at breakfast")]), ["s0"])
+        db.suggestions_update_status("s0", "dismissed")
+        self.assertEqual(db.suggestions_add_many([suggestion(2, "Add protein to breakfast")]), ["s2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+
+from data import db
+from data.persistence import PersistenceManager
+
+
+def _append_from_process(path: str, worker: int, count: int):
+    db.DB_PATH = path
+    for n in range(count):
+        db.messages_append("shared", [{"sender": f"w{worker}", "message": f"{worker}-{n}"}])
+    db.close_connections()
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_append_and_tail(self):
+        pm = PersistenceManager(self._tmp.name)
+        idx = pm.append_conversation_messages([{"sender": "Rohan", "message": f"m{i}"} for i in range(5)])
+        self.assertEqual(idx, [0, 1, 2, 3, 4])
+        self.assertEqual(pm.append_conversation_message({"sender": "Ruby", "message": "hi"}), 5)
+        tail = pm.tail_conversation_history(2)
+        self.assertEqual([m["message"] for m in tail], ["m4", "hi"])
+        self.assertEqual(len(pm.load_conversation_history()), 6)
+
+    def test_legacy_json_imported_once(self):
+        legacy = os.path.join(self._tmp.name, "conversation_history.json")
+        with open(legacy, "w") as f:
+            json.dump([{"sender": "Rohan", "message": "old", "context": {"week": 1}}], f)
+        pm = PersistenceManager(self._tmp.name)
+        self.assertFalse(os.path.exists(legacy))
+        self.assertTrue(os.path.exists(legacy + ".imported"))
+        history = pm.load_conversation_history()
+        self.assertEqual(history[0]["message"], "old")
+        self.assertEqual(history[0]["context"], {"week": 1})
+        PersistenceManager(self._tmp.name)
+        self.assertEqual(len(pm.load_conversation_history()), 1)
+
+    def test_concurrent_appends_lose_nothing(self):
+        db.init_db()
+        threads = [
+            threading.Thread(
+                target=lambda w=w: [
+                    db.messages_append("shared", [{"sender": "t", "message": f"t{w}-{n}"}]) for n in range(20)
+                ]
+            )
+            for w in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Separate processes stand in for separate uvicorn workers
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=_append_from_process, args=(db.DB_PATH, w, 10)) for w in range(2)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        history = db.messages_list("shared")
+        self.assertEqual(len(history), 100)
+        self.assertEqual([m["message_index"] for m in history], list(range(100)))
+        self.assertEqual(len({m["id"] for m in history}), 100)
+
+    def test_compare_and_set_and_stable_ids(self):
+        pm = PersistenceManager(self._tmp.name)
+        first = {"sender": "Rohan", "message": "hello"}
+        self.assertEqual(pm.append_conversation_message(first, expected_index=0), 0)
+        with self.assertRaises(db.MessageConflict) as err:
+            pm.append_conversation_message({"sender": "Rohan", "message": "stale"}, expected_index=0)
+        self.assertEqual(err.exception.actual, 1)
+        self.assertEqual(pm.conversation_length(), 1)
+        # Ids survive a wholesale rewrite and resolve back to the message
+        pm.save_conversation_history(pm.load_conversation_history())
+        self.assertEqual(pm.load_conversation_history()[0]["id"], first["id"])
+        self.assertEqual(db.message_get(first["id"])["message"], "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import unittest
+from unittest import mock
+
+from agents.base_agent import BaseAgent
+from agents.issue_extractor import IssueExtractor
+from agents.llm_router import LLMRouter
+from agents.prompting import OMITTED_KEY, count_tokens, render_context, stable_json, trim_context
+
+
+def _big_context():
+    return {
+        "week": 12,
+        "member_id": "rohan",
+        "events": [f"event {n}: travel to Singapore, poor sleep and skipped workouts" for n in range(200)],
+        "profile": {"age": 46, "notes": "likes data " * 300},
+        "evidence": ["lab panel " * 50 for _ in range(20)],
+    }
+
+
+class TestContextTrimming(unittest.TestCase):
+    def test_small_context_is_untouched_and_stable(self):
+        context = {"week": 3, "events": ["flight"]}
+        self.assertEqual(trim_context(context, budget=100), context)
+        self.assertEqual(render_context({"b": 1, "a": 2}), render_context({"a": 2, "b": 1}))
+        self.assertEqual(render_context(None), "{}")
+
+    def test_large_context_fits_budget_by_priority(self):
+        trimmed = trim_context(_big_context(), budget=200)
+        self.assertLessEqual(count_tokens(stable_json(trimmed)), 200)
+        self.assertEqual(trimmed["week"], 12)
+        self.assertEqual(trimmed["member_id"], "rohan")
+        # Lists keep their newest entries and say how many were dropped
+        events = trimmed.get("events")
+        if events is not None:
+            self.assertIn("earlier items omitted", events[0])
+            self.assertTrue(events[-1].startswith("event 199"))
+        self.assertIn("evidence", trimmed[OMITTED_KEY])
+
+    def test_role_budgets_from_env(self):
+        with mock.patch.dict(os.environ, {"ELYX_PROMPT_BUDGETS": "router=60"}):
+            self.assertLessEqual(count_tokens(render_context(_big_context(), "router")), 60)
+
+
+class TestPromptAssembly(unittest.TestCase):
+    def test_system_prefix_is_byte_stable(self):
+        agent = BaseAgent("Carla", "Nutritionist", "You are Carla.")
+        a = agent._build_messages("hi", {"week": 1, "events": ["a"]})
+        b = agent._build_messages("hello", {"events": ["b"] * 500, "week": 2})
+        self.assertEqual(a[0], b[0])
+        self.assertLessEqual(count_tokens(b[1]["content"]), 1510)
+
+        router = LLMRouter(fast_router=None)
+        first = router._build_route_prompt("knee pain", {"week": 1})
+        second = router._build_route_prompt("lab results?", None)
+        self.assertEqual(first[0]["content"].encode(), second[0]["content"].encode())
+        self.assertIn("Agents:", first[0]["content"])
+        self.assertNotIn("Agents:", first[1]["content"])
+
+    def test_extractor_context_is_budgeted(self):
+        msgs = IssueExtractor().build_messages("my knee hurts", _big_context())
+        self.assertLess(count_tokens(msgs[1]["content"]), 560)
+
+
+if __name__ == "__main__":
+    unittest.main()
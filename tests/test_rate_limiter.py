@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from agents.rate_limiter import RateLimitScheduler, TokenBucket
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_token_bucket_wait_time(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        now = bucket.updated
+        self.assertEqual(bucket.wait_time(1, now), 0)
+        bucket.take(2)
+        self.assertAlmostEqual(bucket.wait_time(1, now), 0.1)
+        self.assertEqual(bucket.wait_time(1, now + 0.2), 0)
+
+    def test_requests_admitted_fifo_at_rate(self):
+        # 600 rpm = one request per 0.1s after a burst of 600; shrink the burst to 1
+        limiter = RateLimitScheduler(rpm=600, max_wait=5)
+        limiter._state("m").requests.capacity = 1
+        limiter._state("m").requests.tokens = 1
+        order = []
+        threads = []
+        for n in range(4):
+            t = threading.Thread(target=lambda n=n: (limiter.acquire("m"), order.append(n)))
+            threads.append(t)
+            t.start()
+            time.sleep(0.01)
+        for t in threads:
+            t.join()
+        self.assertEqual(order, [0, 1, 2, 3])
+        stats = limiter.stats()
+        self.assertEqual(stats["admitted"], 4)
+        self.assertGreaterEqual(stats["wait_ms_max"], 250)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_retry_after_blocks_model(self):
+        limiter = RateLimitScheduler(rpm=0, max_wait=5)
+        self.assertTrue(limiter.observe("m", 429, {"Retry-After": "0.2"}))
+        start = time.monotonic()
+        limiter.acquire("m")
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        limiter.acquire("other")  # other models are unaffected
+        self.assertFalse(limiter.observe("m", 200, {}))
+        self.assertEqual(limiter.stats()["throttled"], 1)
+
+    def test_ratelimit_reset_header_and_timeout(self):
+        limiter = RateLimitScheduler(rpm=0, max_wait=0.1)
+        reset_ms = str(int((time.time() + 30) * 1000))
+        limiter.observe("m", 429, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_ms})
+        self.assertGreater(limiter.stats()["models"]["m"]["blocked_for_s"], 25)
+        with self.assertRaises(RuntimeError):
+            limiter.acquire("m")
+        with self.assertRaises(RuntimeError):
+            asyncio.run(limiter.aacquire("m"))
+        self.assertEqual(limiter.stats()["timeouts"], 2)
+
+    def test_backoff_without_headers(self):
+        limiter = RateLimitScheduler(rpm=0, base_backoff=1)
+        limiter.observe("m", 429)
+        limiter.observe("m", 429)
+        self.assertGreater(limiter.stats()["models"]["m"]["blocked_for_s"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
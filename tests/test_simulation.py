@@ -0,0 +1,152 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout
+from functools import partial
+from io import StringIO
+from unittest import mock
+
+from agents.base_agent import BaseAgent
+from data import db
+from simulation.complete_journey import CompleteJourney, episode_chat
+from simulation.xml_parser import XMLEpisodeParser
+
+EPISODES = "<journey>" + "".join(
+    f'<episode name="E{e}" duration="1 day"><context>c{e}</context><messages>'
+    + "".join(f'<message sender="Rohan" day="1">episode {e} message {m}</message>' for m in range(3))
+    + "</messages></episode>"
+    for e in range(4)
+) + "</journey>"
+
+
+class EchoChat:
+    """Stands in for GroupChatSystem: one slow, deterministic reply per message."""
+
+    def __init__(self):
+        self.conversation_history = []
+
+    def send_message(self, sender, message, context=None):
+        time.sleep(0.05)
+        turn = [{"sender": sender, "message": message}, {"sender": "Ruby", "message": f"re: {message}"}]
+        self.conversation_history.extend(turn)
+        return turn
+
+    def get_conversation_history(self):
+        return self.conversation_history
+
+
+def _run(workers, mode="thread", seed=7):
+    journey = CompleteJourney(EPISODES, seed=seed, chat_factory=EchoChat, persist=False)
+    with redirect_stdout(StringIO()):
+        start = time.perf_counter()
+        results = journey.run(workers=workers, mode=mode)
+    return results, time.perf_counter() - start
+
+
+class TestParallelJourney(unittest.TestCase):
+    def test_parallel_run_matches_sequential(self):
+        sequential, seq_s = _run(1)
+        threaded, par_s = _run(4)
+        self.assertEqual(threaded, sequential)
+        self.assertEqual(
+            [m["message"] for m in threaded["conversation_history"][::2]],
+            [f"episode {e} message {m}" for e in range(4) for m in range(3)],
+        )
+        self.assertLess(par_s, seq_s)
+
+    def test_process_pool_and_seeds(self):
+        sequential, _ = _run(1)
+        self.assertEqual(_run(2, mode="process")[0], sequential)
+        other, _ = _run(1, seed=8)
+        self.assertNotEqual(
+            [r["adherence_rate"] for r in other["journey_data"]],
+            [r["adherence_rate"] for r in sequential["journey_data"]],
+        )
+        with self.assertRaises(ValueError):
+            _run(2, mode="fiber")
+
+
+def _prompt_sized_reply(agent, messages):
+    """Mock reply that shows how much conversation memory went into the prompt."""
+    return f"[{agent.name}] {len(messages)} messages: {messages[-1]['content'][:40]}"
+
+
+class TestRealChatJourney(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_episode_memory_is_isolated_and_deterministic(self):
+        factory = partial(episode_chat, use_crewai=False)
+        runs = []
+        with mock.patch.dict(os.environ, {"USE_MOCK_RESPONSES": "1"}), \
+                mock.patch.object(BaseAgent, "_mock_response", _prompt_sized_reply):
+            for workers in (1, 4):
+                journey = CompleteJourney(EPISODES, seed=5, chat_factory=factory, persist=False)
+                with redirect_stdout(StringIO()):
+                    runs.append(journey.run(workers=workers))
+        self.assertEqual(runs[0], runs[1])
+        # Every episode starts from empty agent memory, so its prompts grow the same way
+        sizes = [int(m["message"].split("] ")[1].split()[0]) for m in runs[0]["conversation_history"][1::2]]
+        self.assertEqual(sizes, sizes[:3] * 4)
+        self.assertLess(sizes[0], sizes[2])
+
+
+class CountingReader(io.BytesIO):
+    """Binary stream that records how far it has been read."""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed = self.tell()
+        return data
+
+
+class TestStreamingParser(unittest.TestCase):
+    def test_iter_episodes_reads_incrementally(self):
+        episode = '<episode name="E" duration="1 day"><context>c</context><messages>{}</messages></episode>'
+        body = episode.format("".join(f'<message sender="Rohan" day="1">{"x" * 200}</message>' for _ in range(10)))
+        doc = ("<journey>" + body * 500 + "</journey>").encode()
+        stream = CountingReader(doc)
+        episodes = XMLEpisodeParser(stream).iter_episodes()
+        first = next(episodes)
+        self.assertEqual(len(first["messages"]), 10)
+        self.assertLess(stream.consumed, len(doc) // 4)
+        self.assertEqual(1 + sum(1 for _ in episodes), 500)
+
+        messages = XMLEpisodeParser(CountingReader(doc)).iter_messages()
+        self.assertEqual(next(messages)["episode"], "E")
+        self.assertEqual(1 + sum(1 for _ in messages), 5000)
+
+    def test_sources_agree(self):
+        expected = XMLEpisodeParser(EPISODES).parse_episodes()
+        self.assertEqual([e["name"] for e in expected], ["E0", "E1", "E2", "E3"])
+        self.assertEqual(XMLEpisodeParser(EPISODES.encode()).parse_episodes(), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "episodes.xml")
+            with open(path, "w") as f:
+                f.write(EPISODES)
+            self.assertEqual(XMLEpisodeParser(path).parse_episodes(), expected)
+            journey = CompleteJourney(path, seed=7, chat_factory=EchoChat, persist=False)
+            with redirect_stdout(StringIO()):
+                self.assertEqual(journey.run(workers=2), _run(1)[0])
+
+    def test_count_episodes_checks_and_rewinds(self):
+        upload = io.BytesIO(EPISODES.encode())
+        self.assertEqual(XMLEpisodeParser(upload).count_episodes(), 4)
+        self.assertEqual(len(XMLEpisodeParser(upload).parse_episodes()), 4)
+        with self.assertRaises(ET.ParseError):
+            XMLEpisodeParser(EPISODES[:-5]).count_episodes()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import threading
+import unittest
+
+from agents.elyx_agents import AGENT_CLASSES, AgentOrchestrator, AgentRegistry, get_agent_registry
+from agents.llm_router import LLMRouter
+from backend.startup import Lazy
+
+
+class TestLazy(unittest.TestCase):
+    def test_builds_once_on_first_use(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return threading.Event()
+
+        lazy = Lazy("thing", factory)
+        self.assertFalse(lazy.built)
+        threads = [threading.Thread(target=lazy.get) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertFalse(lazy.is_set())  # attributes are forwarded to the built object
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(lazy.built)
+        self.assertIsNotNone(lazy.build_ms)
+
+
+class TestAgentRegistry(unittest.TestCase):
+    def test_agents_are_built_on_lookup(self):
+        registry = AgentRegistry()
+        self.assertEqual(registry.built(), [])
+        self.assertEqual(list(registry), list(AGENT_CLASSES))
+        carla = registry["Carla"]
+        self.assertIs(registry["Carla"], carla)
+        self.assertEqual(registry.built(), ["Carla"])
+        with self.assertRaises(KeyError):
+            registry["Nobody"]
+
+    def test_orchestrator_and_router_share_agents(self):
+        orchestrator = AgentOrchestrator()
+        router = LLMRouter()
+        self.assertIs(orchestrator.agents, get_agent_registry())
+        self.assertEqual(router.agent_descriptions["Rachel"], orchestrator.agents["Rachel"].system_prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
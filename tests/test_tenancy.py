@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from backend.tenancy import KeyedLocks, default_conversation, resolve_member
+from data import db
+
+
+class TestConversations(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db.DB_PATH
+        db.DB_PATH = os.path.join(self._tmp.name, "elyx.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.close_connections()
+        db.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_conversations_are_owned_and_listed_per_member(self):
+        db.messages_append("amara", [{"sender": "Amara", "message": "hi"}], user_id="amara")
+        db.messages_append("amara", [{"sender": "Ruby", "message": "hello"}], user_id="amara")
+        db.messages_append("default", [{"sender": "Rohan", "message": "hey"}])
+        self.assertEqual(db.conversation_get("amara")["message_count"], 2)
+        self.assertEqual(db.conversation_get("default")["user_id"], db.LEGACY_USER_ID)
+        self.assertEqual([c["id"] for c in db.conversations_list(user_id="amara")], ["amara"])
+
+    def test_close_by_text_only_touches_the_members_issues(self):
+        db.issues_add_many(
+            [
+                {"id": "a", "user_id": "amara", "title": "Knee swelling after run", "category": "other"},
+                {"id": "r", "user_id": "rohan", "title": "Knee swelling after run", "category": "other"},
+            ],
+            dedupe=False,
+        )
+        self.assertEqual(db.issues_close_by_text("The knee swelling is gone now", user_id="amara"), 1)
+        status = {it["id"]: it["status"] for it in db.issues_list()}
+        self.assertEqual(status, {"a": "resolved", "r": "open"})
+
+    def test_member_close_by_text_matches_through_fts(self):
+        db.issues_add_many(
+            [
+                {"id": "a", "user_id": "amara", "title": "Knee swelling after run", "category": "other"},
+                {"id": "g", "user_id": "amara", "title": "Bloating at dinner", "category": "other"},
+                {"id": "r", "user_id": "rohan", "title": "Knee swelling after run", "category": "other"},
+            ],
+            dedupe=False,
+        )
+        con = db._conn()
+        self.assertTrue(db._issues_fts_available(con))
+        rows = db._open_issue_candidates(con, "the knee swelling is gone now", [], user_id="amara")
+        self.assertEqual([r["id"] for r in rows], ["a"])
+        self.assertIsNotNone(rows[0]["rank"])
+        self.assertEqual(db.issues_close_by_text("The knee swelling is gone now", user_id="amara"), 1)
+        status = {it["id"]: it["status"] for it in db.issues_list()}
+        self.assertEqual(status, {"a": "resolved", "g": "open", "r": "open"})
+
+    def test_member_default_conversations_are_renamed(self):
+        # As stored before default conversations were namespaced
+        db.messages_append("amara", [{"sender": "Amara", "message": "hi"}], user_id="amara")
+        db.issues_add_many([{"id": "a", "user_id": "amara", "title": "Knee", "conversation_id": "amara"}])
+        db.messages_append("default", [{"sender": "Rohan", "message": "hey"}])
+        con = db._conn()
+        db._migrate_011_member_default_conversations(con.cursor())
+        con.commit()
+        self.assertIsNone(db.conversation_get("amara"))
+        self.assertEqual(db.conversation_get("amara:default")["user_id"], "amara")
+        self.assertEqual([m["message"] for m in db.messages_list("amara:default")], ["hi"])
+        self.assertEqual(db.issues_list()[0]["conversation_id"], "amara:default")
+        self.assertEqual(db.messages_count("default"), 1)
+
+    def test_member_listing_uses_member_index(self):
+        plan = " ".join(
+            str(r[3])
+            for r in db._conn().execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM suggestions WHERE user_id=? AND status=? "
+                "ORDER BY created_at DESC, id DESC",
+                ("amara", "open"),
+            ).fetchall()
+        )
+        self.assertIn("idx_suggestions_user_status", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class TestTenancy(unittest.TestCase):
+    def test_member_resolution(self):
+        self.assertEqual(resolve_member("Amara", None, None), "amara")
+        self.assertEqual(resolve_member("Amara", "m-7", {"member_id": "x"}), "m-7")
+        self.assertEqual(resolve_member("Ruby", None, {"member_id": "amara"}, {"Ruby"}), "amara")
+        self.assertEqual(resolve_member("Ruby", None, None, {"Ruby"}), db.LEGACY_USER_ID)
+        self.assertEqual(default_conversation(db.LEGACY_USER_ID), "default")
+        self.assertEqual(default_conversation("amara"), "amara:default")
+
+    def test_members_do_not_block_each_other(self):
+        locks = KeyedLocks()
+        order = []
+
+        def turn(member, delay):
+            with locks.hold(member):
+                order.append(f"{member}+")
+                time.sleep(delay)
+                order.append(f"{member}-")
+
+        slow = threading.Thread(target=turn, args=("amara", 0.2))
+        slow.start()
+        time.sleep(0.05)
+        other = threading.Thread(target=turn, args=("rohan", 0))
+        other.start()
+        other.join()
+        # The other member finished while the first one still held its lock
+        self.assertEqual(order, ["amara+", "rohan+", "rohan-"])
+        same = threading.Thread(target=turn, args=("amara", 0))
+        same.start()
+        slow.join()
+        same.join()
+        self.assertEqual(order[3:], ["amara-", "amara+", "amara-"])
+        self.assertEqual(len(locks), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -137,6 +137,10 @@ def start_new_journey():
 
 def continue_journey():
     st.info("Continuing from saved state...")
+    orchestrator = JourneyOrchestrator()
+    with st.spinner("Resuming journey simulation from the last checkpoint..."):
+        orchestrator.run_full_journey(resume=True)
+    st.success("Journey simulation completed!")
 
 
 def reset_chat_history():